@@ -7,25 +7,10 @@ st.set_page_config(
     initial_sidebar_state='collapsed'
 )
 
-# Define the correct paths to your pages
-# If your files are in the root directory, use:
-# page_paths = {
-#     "Data Preprocessing": "/app1.py",
-#     "Exploratory Data Analysis": "/app2.py",
-#     ...
-# }
-# 
-# If your files are in a 'pages' subdirectory, use:
-page_paths = {
-    "Clinical Trials Data Explorer": "pages/1_Clinical Trials Data Explorer.py",
-    "Pivot Handling": "pages/2_Pivot Handling.py",
-    "Adverse Event Clustering": "pages/3_Adverse Event Clustering.py",
-    "Missing Value Analysis": "pages/4_Missing Value Analysis.py",
-    "Outlier Detection & Skewness Correction": "pages/5_Outlier Detection & Skewness Correction.py",
-    "Feature Engineering Pipeline": "pages/7_Feature Engineering Pipeline.py",
-    "Healthcare Data Feature Reduction Journey": "pages/8_Healthcare Data Feature Reduction Journey.py",
-    "ML Models Showcase": "pages/9_ML Models Showcase.py"
-}
+from utils.navigation import PAGES, page_path, page_title
+
+# Page title -> path for st.page_link; the sequence itself lives in utils.navigation
+page_paths = {page_title(filename): page_path(filename) for filename, _ in PAGES}
 
 # Custom CSS for animations and styling
 st.markdown("""
@@ -267,18 +252,19 @@ for i, page in enumerate(pages):
     page_path = page_paths[page['title']]
     
     st.markdown(f"""
-    <div class="card animated" onclick="window.open('{page_path}', '_blank')">
+    <div class="card animated">
         <div class="card-icon">{page['icon']}</div>
         <div class="card-title">{page['title']}</div>
         <div class="card-description">{page['description']}</div>
         <div class="card-overlay">
             <div class="card-overlay-content">
                 <p>Click to explore</p>
-                <button class="card-button" onclick="window.open('{page_path}', '_blank'); event.stopPropagation();">Open {page['title']}</button>
             </div>
         </div>
     </div>
     """, unsafe_allow_html=True)
+    # Switches page inside the running app and keeps the session
+    st.page_link(page_path, label=f"Open {page['title']}", icon="➡️")
 
 st.markdown('</div>', unsafe_allow_html=True)
 
@@ -0,0 +1,61 @@
+"""Benchmark the vectorised multi-valued aggregation against the notebook lambda.
+
+Builds a synthetic long table shaped like ``reported_events`` (many rows per
+trial, a handful of low-cardinality text columns), runs both
+implementations, checks that they agree and prints the timings:
+
+    python benchmarks/bench_aggregation.py [n_rows] [n_trials]
+"""
+import os
+import sys
+import time
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.aggregation import aggregate_frame  # noqa: E402
+
+
+def aggregate_column(series):
+    """The per-group aggregation used in ``1_merge_statistical_analysis.ipynb``."""
+    if pd.api.types.is_numeric_dtype(series):
+        return series.max()
+    else:
+        return "; ".join(series.dropna().unique()) if series.notna().any() else None
+
+
+def synthetic_events(n_rows, n_trials, seed=0):
+    rng = np.random.default_rng(seed)
+    organ_systems = np.array([f"Organ system {i}" for i in range(27)], dtype=object)
+    with_nulls = lambda values: np.where(rng.random(n_rows) < 0.1, None, values)  # noqa: E731
+    return pd.DataFrame({
+        'nct_id': np.array([f"NCT{i:08d}" for i in range(n_trials)], dtype=object)[rng.integers(0, n_trials, n_rows)],
+        'event_type': with_nulls(rng.choice(np.array(['serious', 'other'], dtype=object), n_rows)),
+        'organ_system': with_nulls(rng.choice(organ_systems, n_rows)),
+        'assessment': with_nulls(rng.choice(np.array(['SYSTEMATIC_ASSESSMENT', 'NON_SYSTEMATIC_ASSESSMENT'], dtype=object), n_rows)),
+        'subjects_affected': rng.integers(0, 500, n_rows).astype(float),
+        'subjects_at_risk': rng.integers(0, 1000, n_rows).astype(float),
+    })
+
+
+def main(n_rows=1_000_000, n_trials=50_000):
+    events = synthetic_events(n_rows, n_trials)
+
+    start = time.perf_counter()
+    expected = events.groupby('nct_id').agg({col: aggregate_column for col in events.columns if col != 'nct_id'}).reset_index()
+    lambda_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    actual = aggregate_frame(events, 'nct_id')
+    vectorised_seconds = time.perf_counter() - start
+
+    pd.testing.assert_frame_equal(actual, expected, check_dtype=False)
+    print(f"rows={n_rows:,} trials={n_trials:,}")
+    print(f"groupby-agg lambda : {lambda_seconds:8.2f} s")
+    print(f"aggregate_frame    : {vectorised_seconds:8.2f} s  ({lambda_seconds / vectorised_seconds:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,70 @@
+"""Compare parse time and peak RSS of the raw sources against their columnar copies.
+
+Each measurement runs in a fresh interpreter so peak RSS is not polluted by
+earlier loads. Run from the ``Frontend`` directory:
+
+    python benchmarks/bench_columnar.py [dataset ...]
+
+Set ``CLINICAL_TRIALS_MIRROR`` to benchmark against a local stand-in.
+"""
+import json
+import os
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+DEFAULT_DATASETS = [
+    "facilities_drop.txt",
+    "reported_events_drop.txt",
+    "eligibilities_drop.txt",
+    "final_result5.xlsx",
+    "null_values_dealt.csv",
+]
+
+
+def _peak_rss_mb():
+    import resource
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is reported in bytes on macOS and kilobytes on Linux
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def _child(mode, name):
+    from utils.columnar import load_table, read_source
+    from utils.datasets import fetch
+
+    path = fetch(name)
+    start = time.perf_counter()
+    df = read_source(path) if mode == "source" else load_table(name)
+    elapsed = time.perf_counter() - start
+    print(json.dumps({"seconds": elapsed, "peak_rss_mb": _peak_rss_mb(), "rows": len(df)}))
+
+
+def _measure(mode, name):
+    out = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", mode, name],
+        check=True, capture_output=True, text=True,
+    )
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def main(names):
+    from utils.columnar import materialise
+
+    print(f"{'dataset':<28}{'rows':>10}{'source s':>11}{'columnar s':>12}{'source MB':>11}{'columnar MB':>13}")
+    for name in names:
+        materialise(name)
+        source = _measure("source", name)
+        columnar = _measure("columnar", name)
+        print(f"{name:<28}{source['rows']:>10,}{source['seconds']:>11.2f}{columnar['seconds']:>12.2f}"
+              f"{source['peak_rss_mb']:>11.0f}{columnar['peak_rss_mb']:>13.0f}")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "--child":
+        _child(sys.argv[2], sys.argv[3])
+    else:
+        main(sys.argv[1:] or DEFAULT_DATASETS)
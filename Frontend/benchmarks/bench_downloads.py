@@ -0,0 +1,173 @@
+"""Exercise the fetch layer against a local HTTP stand-in for the dataset host.
+
+Serves random files under the Explorer's dataset names from a local server.
+The server honours Range requests, throttles each connection and can drop a
+connection part-way through a file. The script then checks that:
+
+- concurrent fetches beat sequential ones;
+- dropped connections and pre-existing partial files are resumed rather than
+  restarted;
+- a pinned checksum that does not match is rejected and its partial file
+  discarded.
+
+It prints per-file throughput as it goes:
+
+    python benchmarks/bench_downloads.py [size_mb] [rate_mb_per_s]
+"""
+import hashlib
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils import datasets  # noqa: E402
+
+NAMES = [
+    "usecase3_updated.csv",
+    "drop_withdrawals_drop.txt",
+    "facilities_drop.txt",
+    "reported_events_drop.txt",
+    "eligibilities_drop.txt",
+]
+
+
+def make_handler(root, rate, drop_after):
+    """Handler serving ``root`` with Range support, ``rate`` bytes/s per connection and optional drops."""
+    dropped = set()
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            path = os.path.join(root, os.path.basename(self.path))
+            if not os.path.exists(path):
+                self.send_error(404)
+                return
+            size = os.path.getsize(path)
+            start = 0
+            if self.headers.get("Range"):
+                start = int(self.headers["Range"].split("=")[1].split("-")[0])
+                if start >= size:
+                    self.send_response(416)
+                    self.send_header("Content-Range", f"bytes */{size}")
+                    self.end_headers()
+                    return
+                self.send_response(206)
+                self.send_header("Content-Range", f"bytes {start}-{size - 1}/{size}")
+            else:
+                self.send_response(200)
+            self.send_header("Content-Length", str(size - start))
+            self.end_headers()
+            with lock:
+                drop = drop_after is not None and path not in dropped
+                dropped.add(path)
+            sent = 0
+            with open(path, "rb") as f:
+                f.seek(start)
+                for chunk in iter(lambda: f.read(64 * 1024), b""):
+                    if drop and sent + len(chunk) > drop_after * (size - start):
+                        # Simulate a dropped connection part-way through the first transfer
+                        self.connection.close()
+                        return
+                    self.wfile.write(chunk)
+                    sent += len(chunk)
+                    time.sleep(len(chunk) / rate)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+
+def serve(root, rate, drop_after=None):
+    server = ThreadingHTTPServer(("127.0.0.1", 0), make_handler(root, rate, drop_after))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def use_cache(base_url):
+    cache = tempfile.mkdtemp(prefix="fetch-bench-")
+    os.environ[datasets.CACHE_DIR_ENV] = cache
+    os.environ[datasets.BASE_URL_ENV] = base_url
+    os.environ.pop(datasets.MIRROR_DIR_ENV, None)
+    os.environ.pop(datasets.OFFLINE_ENV, None)
+    return cache
+
+
+def report(stats):
+    rate = (stats["bytes_per_second"] or 0) / 1e6
+    print(f"  {stats['name']:<28} {stats['bytes'] / 1e6:7.1f} MB in {stats['seconds']:5.2f} s "
+          f"({rate:6.1f} MB/s, resumed from {stats['resumed_from'] / 1e6:.1f} MB)")
+
+
+def main(size_mb=8.0, rate_mb=16.0):
+    root = tempfile.mkdtemp(prefix="fetch-origin-")
+    checksums = {}
+    for name in NAMES:
+        data = os.urandom(int(size_mb * 1e6))
+        checksums[name] = hashlib.sha256(data).hexdigest()
+        with open(os.path.join(root, name), "wb") as f:
+            f.write(data)
+    cleanup = [root]
+
+    try:
+        server = serve(root, rate_mb * 1e6)
+        url = f"http://127.0.0.1:{server.server_address[1]}"
+        for workers in (1, len(NAMES)):
+            cleanup.append(use_cache(url))
+            start = time.perf_counter()
+            print(f"workers={workers}")
+            results = datasets.fetch_many(NAMES, workers=workers, progress=report)
+            print(f"  total {time.perf_counter() - start:.2f} s")
+            assert all(datasets.file_sha256(results[n]["path"]) == checksums[n] for n in NAMES)
+        server.shutdown()
+
+        # Every first transfer drops half-way; the retry must resume, not restart
+        server = serve(root, rate_mb * 1e6, drop_after=0.5)
+        cleanup.append(use_cache(f"http://127.0.0.1:{server.server_address[1]}"))
+        print("dropped connections:")
+        results = datasets.fetch_many(NAMES, workers=len(NAMES), progress=report)
+        for name in NAMES:
+            assert datasets.file_sha256(results[name]["path"]) == checksums[name]
+            assert results[name]["bytes"] == int(size_mb * 1e6), "transfer restarted instead of resuming"
+        server.shutdown()
+
+        # A partial file left by an earlier process is continued
+        server = serve(root, rate_mb * 1e6)
+        cleanup.append(use_cache(f"http://127.0.0.1:{server.server_address[1]}"))
+        name = NAMES[0]
+        with open(os.path.join(root, name), "rb") as src, open(datasets._partial_path(name), "wb") as dst:
+            dst.write(src.read(int(size_mb * 1e6) // 3))
+        print("existing partial file:")
+        stats = datasets.fetch_with_stats(name)
+        report(stats)
+        assert stats["resumed_from"] > 0 and stats["bytes"] + stats["resumed_from"] == int(size_mb * 1e6)
+        assert datasets.file_sha256(stats["path"]) == checksums[name]
+
+        # A pinned checksum that does not match is rejected and nothing is kept
+        name = NAMES[1]
+        pinned = datasets.DATASETS[name]["sha256"]
+        datasets.DATASETS[name]["sha256"] = "0" * 64
+        try:
+            datasets.fetch(name)
+        except ValueError as exc:
+            print(f"checksum mismatch rejected: {str(exc)[:60]}...")
+        else:
+            raise AssertionError("checksum mismatch was not detected")
+        finally:
+            datasets.DATASETS[name]["sha256"] = pinned
+        assert not os.path.exists(datasets._partial_path(name)) and datasets.cached_path(name) is None
+        server.shutdown()
+        print("ok")
+    finally:
+        for path in cleanup:
+            shutil.rmtree(path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main(*(float(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,77 @@
+"""Load-test the micro-batching scoring service.
+
+Starts ``utils.serving`` in-process on a free port with a stand-in model and
+scaler, trained on synthetic data shaped like the 112-feature reduced
+splits. It then sends single-trial requests from many client threads and
+prints client-side throughput next to the server's metrics, once per
+latency budget:
+
+    python benchmarks/bench_serving.py [n_requests] [concurrency] [budget_ms ...]
+"""
+import json
+import os
+import sys
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.serving import MicroBatcher, make_server  # noqa: E402
+
+
+def stand_in(n_rows=5_000, n_features=112, seed=0):
+    """A fitted (model, scaler) pair and a frame of stand-in trials."""
+    from sklearn.ensemble import RandomForestClassifier
+    from sklearn.preprocessing import StandardScaler
+
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame(rng.normal(size=(n_rows, n_features)), columns=[f"feature_{i}" for i in range(n_features)])
+    y = (frame['feature_0'] + frame['feature_1'] * frame['feature_2'] + rng.normal(size=n_rows) > 0).astype(int)
+    scaler = StandardScaler().fit(frame)
+    model = RandomForestClassifier(n_estimators=100, max_depth=12, random_state=seed)
+    model.fit(pd.DataFrame(scaler.transform(frame), columns=frame.columns), y)
+    return model, scaler, frame
+
+
+def post(url, payload):
+    request = urllib.request.Request(url, json.dumps(payload).encode(), {'Content-Type': 'application/json'})
+    with urllib.request.urlopen(request) as response:
+        return json.loads(response.read())
+
+
+def run(model, scaler, frame, n_requests, concurrency, budget_ms):
+    batcher = MicroBatcher(model, scaler, budget_ms=budget_ms)
+    server = make_server(batcher, port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}"
+    records = frame.to_dict(orient='records')
+    try:
+        start = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            list(pool.map(lambda i: post(f"{url}/predict", {'features': records[i % len(records)]}), range(n_requests)))
+        elapsed = time.perf_counter() - start
+        with urllib.request.urlopen(f"{url}/metrics") as response:
+            metrics = json.loads(response.read())
+    finally:
+        server.shutdown()
+        server.server_close()
+        batcher.close()
+    print(f"budget {budget_ms:>5.1f} ms: {n_requests / elapsed:>7,.0f} req/s, "
+          f"p50 {metrics['latency_ms_p50']:.2f} ms, p99 {metrics['latency_ms_p99']:.2f} ms, "
+          f"mean batch {metrics['mean_batch_size']:.1f}, max queue {metrics['max_queue_depth']}")
+
+
+def main(n_requests=2_000, concurrency=32, *budgets):
+    model, scaler, frame = stand_in()
+    print(f"{n_requests:,} requests from {concurrency} client threads")
+    for budget_ms in budgets or (0.0, 2.0, 5.0, 20.0):
+        run(model, scaler, frame, n_requests, concurrency, budget_ms)
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]), *(float(arg) for arg in sys.argv[3:]))
@@ -0,0 +1,74 @@
+"""Compare exact column statistics with their sketch estimates.
+
+For every column of each dataset this times the exact path against the
+sketch path:
+
+- exact: ``nunique()``, ``value_counts()`` or ``np.percentile`` over the
+  loaded column;
+- sketch: ``utils.sketches.sketch_column``, built from the columnar copy
+  in chunks on a process pool.
+
+It reports the observed error next to the documented bound. Run from the
+``Frontend`` directory:
+
+    python benchmarks/bench_sketches.py [dataset ...]
+
+Set ``CLINICAL_TRIALS_MIRROR`` to benchmark against a local stand-in.
+"""
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.columnar import load_table, read_table  # noqa: E402
+from utils.sketches import sketch_column  # noqa: E402
+
+DEFAULT_DATASETS = ["reported_events_drop.txt", "facilities_drop.txt"]
+QUANTILES = [0.01, 0.25, 0.5, 0.75, 0.99]
+
+
+def _timed(fn):
+    start = time.perf_counter()
+    result = fn()
+    return result, time.perf_counter() - start
+
+
+def compare(name, column, chunk_rows):
+    series = load_table(name, [column])[column]
+    sketch, sketch_s = _timed(lambda: sketch_column(name, column, chunk_rows=chunk_rows))
+    exact_distinct, exact_s = _timed(series.nunique)
+    estimate, distinct_bound = sketch.distinct_count()
+    line = (f"  {column[:24]:<24} distinct {exact_distinct:>10,} ≈{estimate:>12,.0f} "
+            f"{(estimate - exact_distinct) / max(exact_distinct, 1):+7.2%} (±{distinct_bound:.1%})")
+    if sketch.quantiles is not None:
+        values, seconds = _timed(lambda: np.sort(series.dropna().to_numpy(dtype=np.float64)))
+        exact_s += seconds
+        estimates = sketch.quantiles.quantile(QUANTILES)
+        # With ties, any rank inside the estimate's run of equal values is exact
+        low = np.searchsorted(values, estimates, side='left') / max(len(values), 1)
+        high = np.searchsorted(values, estimates, side='right') / max(len(values), 1)
+        error = np.maximum(np.maximum(low - QUANTILES, QUANTILES - high), 0).max()
+        line += f"  rank error {error:.2%} (±{sketch.quantiles.rank_error:.1%})"
+    else:
+        counts, seconds = _timed(series.value_counts)
+        exact_s += seconds
+        top = sketch.frequent.top(10)
+        # The sketch keys are the raw values, the loaded column may be categorical
+        undercount = max((counts[key] - count for key, count in top.items()), default=0)
+        line += f"  top-10 undercount {undercount:,} (≤{sketch.frequent.error:,})"
+    print(f"{line}  exact {exact_s:.2f} s, sketch {sketch_s:.2f} s")
+
+
+def main(names, chunk_rows=1 << 20):
+    for name in names:
+        table = read_table(name)
+        print(f"{name}: {table.num_rows:,} rows")
+        for column in table.column_names:
+            compare(name, column, chunk_rows)
+
+
+if __name__ == "__main__":
+    main(sys.argv[1:] or DEFAULT_DATASETS)
@@ -0,0 +1,108 @@
+"""Benchmark cold-start cost per page.
+
+For every page in ``utils.navigation.PAGES`` two numbers are measured, each in
+a fresh interpreter so nothing is already imported or cached:
+
+* imports: time to import the page's module-level imports (found with
+  ``ast``), i.e. what every cold run pays before the first widget is drawn;
+* first render: time for Streamlit's ``AppTest`` to execute the page's
+  initial script run (skipped when streamlit is not installed).
+
+    python benchmarks/bench_startup.py [page-substring ...]
+"""
+import ast
+import importlib.util
+import json
+import os
+import subprocess
+import sys
+import time
+
+FRONTEND = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, FRONTEND)
+
+from utils.navigation import MAIN_PAGE, PAGES, page_path  # noqa: E402
+
+
+def module_level_imports(path):
+    """Module names imported at the top level of a script, in order."""
+    with open(path, encoding='utf-8') as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules.extend(alias.name for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module:
+            modules.append(node.module)
+    return list(dict.fromkeys(modules))
+
+
+def time_imports(path):
+    start = time.perf_counter()
+    for module in module_level_imports(path):
+        importlib.import_module(module)
+    return time.perf_counter() - start
+
+
+def time_first_render(filename):
+    from streamlit.testing.v1 import AppTest
+
+    start = time.perf_counter()
+    at = AppTest.from_file(os.path.join(FRONTEND, MAIN_PAGE), default_timeout=600)
+    at.switch_page(page_path(filename)).run()
+    elapsed = time.perf_counter() - start
+    return elapsed, [str(e.value) for e in at.exception]
+
+
+def run_child(mode, filename):
+    """Run one measurement in a fresh interpreter and return its JSON result."""
+    proc = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', mode, filename],
+        cwd=FRONTEND, capture_output=True, text=True,
+    )
+    if proc.returncode != 0:
+        return {'error': proc.stderr.strip().splitlines()[-1] if proc.stderr.strip() else 'failed'}
+    return json.loads(proc.stdout.strip().splitlines()[-1])
+
+
+def child(mode, filename):
+    os.chdir(FRONTEND)
+    if mode == 'imports':
+        result = {'seconds': time_imports(os.path.join(FRONTEND, page_path(filename)))}
+    else:
+        seconds, errors = time_first_render(filename)
+        result = {'seconds': seconds, 'errors': errors}
+    print(json.dumps(result))
+
+
+def main(filters):
+    # First renders need streamlit's AppTest (streamlit.testing.v1)
+    can_render = (importlib.util.find_spec("streamlit") is not None
+                  and importlib.util.find_spec("streamlit.testing.v1") is not None)
+    if not can_render:
+        print("streamlit not installed: first-render timings skipped")
+
+    print(f"{'page':50s} {'imports':>10s} {'first render':>14s}")
+    for filename, _ in PAGES:
+        if filters and not any(f.lower() in filename.lower() for f in filters):
+            continue
+        imports = run_child('imports', filename)
+        imports_text = f"{imports['seconds']:8.2f} s" if 'seconds' in imports else 'error'
+        render_text = '-'
+        if can_render:
+            render = run_child('render', filename)
+            if 'seconds' in render:
+                render_text = f"{render['seconds']:10.2f} s" + (' (raised)' if render['errors'] else '')
+            else:
+                render_text = 'error'
+        print(f"{filename:50s} {imports_text:>10s} {render_text:>14s}")
+        for result in (imports, render if can_render else {}):
+            if result.get('error'):
+                print(f"    {result['error']}")
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ['--child']:
+        child(sys.argv[2], sys.argv[3])
+    else:
+        main(sys.argv[1:])
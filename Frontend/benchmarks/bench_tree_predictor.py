@@ -0,0 +1,58 @@
+"""Benchmark the compiled tree predictor against the model's own predictor.
+
+Loads a pickled model (by default a RandomForest trained on synthetic data
+shaped like the 112-feature reduced splits), checks that the compiled
+predictor reproduces ``predict_proba`` bit for bit and prints the median
+latency of both for batch sizes from 1 to 100k rows:
+
+    python benchmarks/bench_tree_predictor.py [model.pkl [features.csv]]
+"""
+import os
+import pickle
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.tree_predictor import compile_model, latency, validate  # noqa: E402
+
+BATCH_SIZES = (1, 10, 100, 1_000, 10_000, 100_000)
+
+
+def synthetic_model(n_rows=20_000, n_features=112, seed=0):
+    from sklearn.ensemble import RandomForestClassifier
+
+    rng = np.random.default_rng(seed)
+    X = rng.normal(size=(n_rows, n_features))
+    X[rng.random(X.shape) < 0.02] = np.nan
+    y = (np.nan_to_num(X[:, 0]) + np.nan_to_num(X[:, 1] * X[:, 2]) + rng.normal(size=n_rows) > 0).astype(int)
+    model = RandomForestClassifier(n_estimators=100, max_depth=12, random_state=seed).fit(X, y)
+    return model, X
+
+
+def main(model_path=None, features_path=None):
+    if model_path is None:
+        model, X = synthetic_model()
+    else:
+        with open(model_path, 'rb') as f:
+            model = pickle.load(f)
+        X = pd.read_csv(features_path).drop(columns=['Study Status'], errors='ignore')
+
+    compiled = compile_model(model)
+    check = validate(model, compiled, X)
+    print(f"{type(model).__name__}: {compiled.n_trees} trees, depth {compiled.max_depth}, "
+          f"{compiled.nbytes / 1e6:.1f} MB compiled")
+    print(f"validation on {check['rows']:,} rows: identical={check['identical']} "
+          f"max_abs_diff={check['max_abs_diff']:.3g} max_ulp={check['max_ulp']:.0f}")
+
+    native = latency(model.predict_proba, X, BATCH_SIZES)
+    ours = latency(compiled.predict_proba, X, BATCH_SIZES)
+    print(f"{'batch':>8} {'native ms':>11} {'compiled ms':>12} {'speed-up':>9}")
+    for size in BATCH_SIZES:
+        print(f"{size:>8,} {native[size] * 1e3:>11.3f} {ours[size] * 1e3:>12.3f} {native[size] / ours[size]:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main(*sys.argv[1:3])
@@ -1,93 +1,66 @@
 import streamlit as st
-import os
-import streamlit as st
+from utils.bootstrap import bootstrap_page
 
-st.set_page_config(
+# Must be first Streamlit command
+bootstrap_page(
+    __file__,
     page_title="Clinical Trials Data Explorer",
     layout="wide",
     initial_sidebar_state="expanded"
 )
 
-
-# Must be first Streamlit command
 import pandas as pd
-import altair as alt
 from streamlit_lottie import st_lottie
-import requests
 import plotly.express as px
 
+from utils.dtypes import compact_dtypes, memory_report
+from utils.projections import load_page_table
+from utils.datasets import fetch_many, fingerprint
+from utils.frames import shared
+from utils.views import FrameView, describe_filter, is_numeric
+from utils.charts import cached as cached_chart, histogram, histogram_frame
+from utils.sketches import format_estimate, sketch_column, sketch_series
+from utils.profiles import (
+    describe_table, distinct_counts, dtype_counts, load_profile, memory_bytes, top_values,
+)
+from utils.assets import load_lottie
 
 
+# Load a dataset from its columnar copy (parsed from CSV/pipe text only once)
+# and convert it to compact dtypes; returns the frame and a before/after memory report.
+# Loaded once per process and shared read-only by all sessions.
+def load_data(file_name):
+    def load():
+        raw_df = load_page_table("explorer", file_name)
+        df = compact_dtypes(raw_df)
+        return df, memory_report(raw_df, df)
 
-# Function to load Lottie animations
-def load_lottieurl(url):
-    r = requests.get(url)
-    if r.status_code != 200:
-        return None
-    return r.json()
-
-# Load data function remains the same
-def load_data(file_path):
     try:
-        if file_path.endswith('.csv'):
-            df = pd.read_csv(file_path)
-        elif file_path.endswith('.txt'):
-            df = pd.read_csv(file_path, sep='|')
-        else:
-            return None
-        
-        for col in df.select_dtypes(include=['object']).columns:
-            df[col] = df[col].astype(str)
-        
-        return df
+        return shared(("explorer", file_name, fingerprint(file_name)), load)
     
     except Exception as e:
-        st.error(f"Error loading {file_path}: {e}")
-        return None
-
-# Predefined file paths
-import pandas as pd
-import gdown
-import os
-import streamlit as st
-
-# Define file IDs and local paths
-file_info = {
-    "usecase3_updated.csv": {
-        "file_id": "1uMG_FaqUEmZ9MbZ7DNxbW-2Cs7oLEPL3",
-        "output_path": "usecase3_updated.csv"  
-    },
-    "drop_withdrawals_drop.txt": {
-        "file_id": "1asYtLjN4n8ukK1P_A9wTiPiLiKBYXgmt",
-        "output_path": "drop_withdrawals_drop.txt"
-    },
-    "facilities_drop.txt": {
-        "file_id": "1FKLcD43Cx_d9YQiQ1Ey9m03LEqrBeGig",
-        "output_path": "facilities_drop.txt"
-    },
-    "reported_events_drop.txt": {
-        "file_id": "134HKNOrP8hlh43-atf6uKz0M5I4V97te",
-        "output_path": "reported_events_drop.txt"
-    },
-    "eligibilities_drop.txt": {
-        "file_id": "1AQ5At-_IkonBMhjte188cqbILRYQYz_E",
-        "output_path": "eligibilities_drop.txt"
-    }
-}
-
-# Download all files from Google Drive
-with st.spinner('Downloading files from Google Drive...'):
-    for file_name, info in file_info.items():
-        url = f"https://drive.google.com/uc?id={info['file_id']}"
-        gdown.download(url, info['output_path'], quiet=False)
-
-# Now you can use these local paths for your data processing
-file_paths = {
-    file_name: info["output_path"] for file_name, info in file_info.items()
-}
+        st.error(f"Error loading {file_name}: {e}")
+        return None, None
+
+# Datasets shown in the explorer; fetched once into the local dataset cache
+EXPLORER_DATASETS = [
+    "usecase3_updated.csv",
+    "drop_withdrawals_drop.txt",
+    "facilities_drop.txt",
+    "reported_events_drop.txt",
+    "eligibilities_drop.txt",
+]
+
+# Missing files are downloaded concurrently; interrupted downloads resume
+with st.spinner('Fetching datasets...'):
+    fetch_stats = fetch_many(EXPLORER_DATASETS)
+for stats in fetch_stats.values():
+    if not stats['cached'] and stats['seconds']:
+        st.caption(f"⬇️ {stats['name']}: {stats['bytes'] / 1e6:.1f} MB in {stats['seconds']:.1f} s "
+                   f"({stats['bytes_per_second'] / 1e6:.1f} MB/s)")
 
 # Load data animation
-lottie_data = load_lottieurl('https://assets5.lottiefiles.com/packages/lf20_qp1q7mct.json')
+lottie_data = load_lottie('data_analysis')
 
 # Custom CSS with modern styling
 st.markdown("""
@@ -184,7 +157,8 @@ col1, col2 = st.columns([3, 1])
 with col1:
     st.markdown('<h1 class="super-title">🔍 Clinical Trials Data Explorer</h1>', unsafe_allow_html=True)
 with col2:
-    st_lottie(lottie_data, height=150)
+    if lottie_data:
+        st_lottie(lottie_data, height=150)
 
 # Sidebar with gradient background
 st.sidebar.markdown("""
@@ -194,18 +168,18 @@ st.sidebar.markdown("""
 """, unsafe_allow_html=True)
 
 # Dataset Selection
-selected_file = st.sidebar.selectbox("📂 Select Dataset", list(file_paths.keys()))
+selected_file = st.sidebar.selectbox("📂 Select Dataset", EXPLORER_DATASETS)
 
 # Load selected dataset
-selected_df = load_data(file_paths[selected_file])
+selected_df, dtype_report = load_data(selected_file)
 
 if selected_df is not None:
-    # Create session state
-    if 'df' not in st.session_state or st.session_state.selected_file != selected_file:
-        st.session_state.df = selected_df.copy()
-        st.session_state.selected_file = selected_file
-
-    df = st.session_state.df
+    # The loaded frame is shared read-only by all sessions; this session only keeps
+    # a view of it (dropped columns and row filters), applied when rendering
+    if 'view' not in st.session_state or st.session_state.view.dataset != selected_file:
+        st.session_state.view = FrameView(selected_file)
+    view = st.session_state.view
+    n_rows, n_cols = view.shape(selected_df)
 
     # Dataset Overview Card
     st.markdown("""
@@ -220,7 +194,7 @@ if selected_df is not None:
                 <div class="metric-label">Columns</div>
             </div>
         </div>
-    """.format(df.shape[0], df.shape[1]), unsafe_allow_html=True)
+    """.format(n_rows, n_cols), unsafe_allow_html=True)
 
     # Column Management
     st.sidebar.markdown("""
@@ -229,19 +203,82 @@ if selected_df is not None:
         </div>
     """, unsafe_allow_html=True)
     
-    columns_to_drop = st.sidebar.multiselect("Select columns to drop", df.columns)
+    visible_columns = view.columns(selected_df)
+    columns_to_drop = st.sidebar.multiselect("Select columns to drop", visible_columns)
 
     if st.sidebar.button("🗑 Drop Selected Columns"):
         if columns_to_drop:
-            st.session_state.df = df.drop(columns=columns_to_drop)
-            st.success("✨ Columns successfully dropped!")
+            view.drop(columns_to_drop)
+            # st.rerun() stops this run, so the message is shown once on the next one
+            st.session_state.drop_message = "✨ Columns successfully dropped!"
+            st.rerun()
         else:
             st.warning("⚠ Please select columns to drop")
+    if 'drop_message' in st.session_state:
+        st.success(st.session_state.pop('drop_message'))
+
+    if st.sidebar.button("↩ Undo Last Drop", disabled=not view.can_undo):
+        view.undo()
         st.rerun()
 
+    # Row Filters
+    st.sidebar.markdown("""
+        <div style='background: rgba(255, 255, 255, 0.05); padding: 1rem; border-radius: 10px; margin-top: 1rem;'>
+            <h3 style='color: #00F5A0;'>🔎 Row Filters</h3>
+        </div>
+    """, unsafe_allow_html=True)
+
+    filter_col = st.sidebar.selectbox("Filter column", ["(none)"] + visible_columns)
+    if filter_col != "(none)":
+        values = selected_df[filter_col]
+        if is_numeric(values) and values.notna().any():
+            low, high = float(values.min()), float(values.max())
+            current = view.filters.get(filter_col, ('range', low, high))
+            if low < high:
+                chosen = st.sidebar.slider("Range", low, high, (float(current[1]), float(current[2])))
+                if st.sidebar.button("Apply Filter"):
+                    view.set_range_filter(filter_col, *chosen)
+                    st.rerun()
+        else:
+            options = values.value_counts().head(50).index.tolist()
+            chosen = st.sidebar.multiselect("Keep values (top 50)", options)
+            if st.sidebar.button("Apply Filter") and chosen:
+                view.set_isin_filter(filter_col, chosen)
+                st.rerun()
+
+    for column, spec in view.filters.items():
+        st.sidebar.caption(f"Active: {describe_filter(column, spec)}")
+    if view.filters and st.sidebar.button("Clear Filters"):
+        view.clear_filters()
+        st.rerun()
+
+    approximate = st.sidebar.checkbox(
+        "⚡ Approximate statistics",
+        help="Distinct counts, quantiles and top values from mergeable sketches instead of exact full "
+             "scans; for very large tables. Error bounds are shown next to each number.")
+
     # Data Preview
     st.markdown('<h2 class="section-header">📋 Data Preview</h2>', unsafe_allow_html=True)
-    st.dataframe(df.head(10), use_container_width=True)
+    st.dataframe(view.head(selected_df, 10), use_container_width=True)
+
+    # The view materialised for this render only; nothing is kept per session
+    df = view.frame(selected_df)
+
+    # Column statistics are precomputed once per dataset version; with row filters
+    # active they are computed from the filtered rows instead
+    profile = None
+    if not view.filters and not approximate:
+        try:
+            with st.spinner('Profiling columns...'):
+                profile = load_profile(selected_file)
+        except Exception as e:
+            st.warning(f"Column profile unavailable, computing statistics directly: {e}")
+
+    def column_sketch(column):
+        # Sketched from the columnar copy once per dataset version, or from the filtered rows
+        if view.filters:
+            return sketch_series(view.series(selected_df, column))
+        return sketch_column(selected_file, column)
 
     # Download Section
     if st.sidebar.button("💾 Export Processed Data"):
@@ -257,7 +294,7 @@ if selected_df is not None:
     st.markdown('<h2 class="section-header">🔍 Data Insights</h2>', unsafe_allow_html=True)
     
     # Memory Usage Card
-    memory_usage = df.memory_usage(deep=True).sum() / (1024 * 1024)
+    memory_usage = (memory_bytes(profile, visible_columns) if profile else df.memory_usage(deep=True).sum()) / (1024 * 1024)
     st.markdown(f"""
         <div class="card-container">
             <h4 style='color: #00F5A0;'>💾 Memory Usage</h4>
@@ -265,10 +302,21 @@ if selected_df is not None:
         </div>
     """, unsafe_allow_html=True)
 
+    with st.expander("🧮 Memory Before/After Compact Dtypes"):
+        before_mb = dtype_report['MB before'].sum()
+        after_mb = dtype_report['MB after'].sum()
+        col1, col2, col3 = st.columns(3)
+        col1.metric("As Parsed", f"{before_mb:.2f} MB")
+        col2.metric("Compact Dtypes", f"{after_mb:.2f} MB")
+        col3.metric("Saved", f"{before_mb - after_mb:.2f} MB",
+                    f"{(1 - after_mb / before_mb) * 100 if before_mb else 0:.1f}%")
+        st.dataframe(dtype_report.style.format({'MB before': '{:.3f}', 'MB after': '{:.3f}', 'saved %': '{:.1f}'}),
+                     use_container_width=True)
+
      # Data Types Visualization
     st.markdown('<h3 class="section-header">📊 Data Types Distribution</h3>', unsafe_allow_html=True)
     # Convert dtypes to strings to ensure JSON serialization
-    dtypes = df.dtypes.astype(str).value_counts()
+    dtypes = dtype_counts(profile, visible_columns) if profile else df.dtypes.astype(str).value_counts()
     fig = px.pie(values=dtypes.values, names=dtypes.index, 
                  title='Column Data Types',
                  color_discrete_sequence=px.colors.sequential.Viridis)
@@ -279,173 +327,63 @@ if selected_df is not None:
     selected_col = st.selectbox("Select a feature to analyze", df.columns)
 
     if pd.api.types.is_numeric_dtype(df[selected_col]):
-        fig = px.histogram(df, x=selected_col, title=f'Distribution of {selected_col}',color_discrete_sequence=['#00F5A0'])
+        # Bins are computed on the server (cached per dataset version and column), so
+        # the chart carries one bar per bin instead of every row
+        if view.filters:
+            hist = histogram(view.series(selected_df, selected_col))
+        else:
+            hist = cached_chart('histogram', selected_file, selected_col, 'compact',
+                                lambda: histogram(selected_df[selected_col]))
+        bins = histogram_frame(hist)
+        fig = px.bar(bins, x='centre', y='count', title=f'Distribution of {selected_col}',
+                     labels={'centre': selected_col}, hover_data=['start', 'end'],
+                     color_discrete_sequence=['#00F5A0'])
+        fig.update_traces(width=bins['width'])
+        fig.update_layout(bargap=0)
         st.plotly_chart(fig, use_container_width=True)
+        if approximate:
+            sketch = column_sketch(selected_col)
+            if sketch.quantiles is not None:
+                quantiles = [0.01, 0.25, 0.5, 0.75, 0.99]
+                st.caption("Approximate percentiles (each within ±{:.1%} in rank): ".format(sketch.quantiles.rank_error)
+                           + ", ".join(f"p{q * 100:g} ≈ {v:,.4g}"
+                                       for q, v in zip(quantiles, sketch.quantiles.quantile(quantiles))))
     else:
         # For categorical columns
-        value_counts = df[selected_col].value_counts().head(10)
-        fig = px.bar(x=value_counts.index, y=value_counts.values,
+        if approximate:
+            sketch = column_sketch(selected_col)
+            value_counts = sketch.frequent.top(10)
+            count_error = sketch.frequent.error
+        else:
+            value_counts = top_values(profile, selected_col) if profile else df[selected_col].value_counts().head(10)
+        fig = px.bar(x=value_counts.index.astype(str), y=value_counts.values,
                     title=f'Top 10 Values in {selected_col}',
                     color_discrete_sequence=['#00F5A0'])
         fig.update_layout(showlegend=False)
         st.plotly_chart(fig, use_container_width=True)
+        if approximate:
+            st.caption(f"Approximate counts: each is at most {count_error:,} below the true count.")
 
     # Expandable Insights
     with st.expander("📈 Numerical Summary"):
         st.markdown('<div class="card-container">', unsafe_allow_html=True)
-        st.write(df.describe())
+        st.write(describe_table(profile, visible_columns) if profile else df.describe())
         st.markdown('</div>', unsafe_allow_html=True)
 
     with st.expander("📊 Categorical Summary"):
         st.markdown('<div class="card-container">', unsafe_allow_html=True)
-        categorical_cols = df.select_dtypes(include=['object']).columns
-        if not categorical_cols.empty:
-            for col in categorical_cols:
-                st.write(f"{col}: {df[col].nunique()} unique values")
+        if profile:
+            unique_counts = distinct_counts(profile, visible_columns)
+        else:
+            categorical_cols = df.select_dtypes(include=['object', 'category', 'string']).columns
+            if approximate:
+                # HyperLogLog estimates, shown with their ~95% relative error
+                unique_counts = {col: format_estimate(*column_sketch(col).distinct_count()) for col in categorical_cols}
+            else:
+                unique_counts = {col: df[col].nunique() for col in categorical_cols}
+        if unique_counts:
+            for col, n_unique in unique_counts.items():
+                st.write(f"{col}: {n_unique} unique values")
         else:
             st.write("No categorical columns found")
         st.markdown('</div>', unsafe_allow_html=True)
-        
-# Define the navigation between pages
-def add_navigation_buttons():
-    st.markdown("""
-    <style>
-        .navigation-container {
-            display: flex;
-            justify-content: space-between;
-            margin-top: 2rem;
-            padding-top: 1rem;
-            border-top: 1px solid #eee;
-        }
-        .nav-button {
-            background: linear-gradient(90deg, #1e3c72, #2a5298);
-            color: white;
-            border: none;
-            padding: 0.6rem 1.2rem;
-            border-radius: 4px;
-            font-weight: 500;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            text-decoration: none;
-            display: inline-block;
-        }
-        .nav-button:hover {
-            opacity: 0.9;
-            transform: translateY(-2px);
-            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-        }
-        .nav-button.disabled {
-            background: #ccc;
-            cursor: not-allowed;
-        }
-        .nav-button.home {
-            background: #34495e;
-        }
-    </style>
-    """, unsafe_allow_html=True)
-    
-
-
-
-# Add this at the end of each subpage file (e.g., app1.py, app2.py, etc.)
-
-def add_navigation_buttons():
-    # Determine if we're in the pages directory or root
-    import os
-    
-    current_file = os.path.basename(__file__)
-    
-    # Define paths based on whether we're in the pages directory or not
-    in_pages_dir = os.path.dirname(__file__).endswith('pages')
-    
-    if in_pages_dir:
-        # We're in the pages directory
-        app_prefix = ""
-        home_path = "../Main_page.py"
-    else:
-        # We're in the root directory
-        app_prefix = "pages/"
-        home_path = "Main_page.py"
-    
-    # Map page filenames to their sequence
-    page_sequence = {
-        '1_Clinical Trials Data Explorer': 1,
-        '2_Pivot Handling.py': 2,
-        '3_Adverse Event Clustering.py': 3,
-        '4_Missing Value Analysis.py': 4,
-        '5_Outlier Detection & Skewness Correction.py': 5,
-        '7_Feature Engineering Pipeline.py': 6,
-        '8_Healthcare Data Feature Reduction Journey.py': 7,
-        '9_ML Models Showcase.py': 8,
-    }
-    
-    # Custom CSS for navigation buttons
-    st.markdown("""
-    <style>
-        .navigation-container {
-            display: flex;
-            justify-content: space-between;
-            margin-top: 2rem;
-            padding-top: 1rem;
-            border-top: 1px solid #eee;
-        }
-        .nav-button {
-            background: linear-gradient(90deg, #1e3c72, #2a5298);
-            color: white;
-            border: none;
-            padding: 0.6rem 1.2rem;
-            border-radius: 4px;
-            font-weight: 500;
-            cursor: pointer;
-            transition: all 0.3s ease;
-            text-decoration: none;
-            display: inline-block;
-        }
-        .nav-button:hover {
-            opacity: 0.9;
-            transform: translateY(-2px);
-            box-shadow: 0 4px 8px rgba(0,0,0,0.1);
-        }
-        .nav-button.disabled {
-            background: #ccc;
-            cursor: not-allowed;
-        }
-        .nav-button.home {
-            background: #34495e;
-        }
-    </style>
-    """, unsafe_allow_html=True)
-    
-    # Get current position in sequence
-    current_position = page_sequence.get(current_file, 0)
-    
-    # Create buttons container
-    st.markdown('<div class="navigation-container">', unsafe_allow_html=True)
-    
-    # Previous button
-    if current_position > 1:
-        prev_page = next((k for k, v in page_sequence.items() if v == current_position - 1), None)
-        if prev_page:
-            st.markdown(f'<a href="{app_prefix}{prev_page}" target="_blank" class="nav-button">← Previous Step</a>', unsafe_allow_html=True)
-        else:
-            st.markdown('<span class="nav-button disabled">← Previous Step</span>', unsafe_allow_html=True)
-    else:
-        st.markdown('<span></span>', unsafe_allow_html=True)  # Empty span for flexbox spacing
-    
-    # Home button
-    st.markdown(f'<a href="{home_path}" target="_blank" class="nav-button home">🏠 Home</a>', unsafe_allow_html=True)
-    
-    # Next button
-    if current_position < max(page_sequence.values()):
-        next_page = next((k for k, v in page_sequence.items() if v == current_position + 1), None)
-        if next_page:
-            st.markdown(f'<a href="{app_prefix}{next_page}" target="_blank" class="nav-button">Next Step →</a>', unsafe_allow_html=True)
-        else:
-            st.markdown('<span class="nav-button disabled">Next Step →</span>', unsafe_allow_html=True)
-    else:
-        st.markdown('<span></span>', unsafe_allow_html=True)  # Empty span for flexbox spacing
-    
-    st.markdown('</div>', unsafe_allow_html=True)
-
-# Call the function at the end of your page
-add_navigation_buttons()
\ No newline at end of file
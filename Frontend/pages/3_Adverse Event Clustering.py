@@ -1,60 +1,16 @@
 import streamlit as st
-import os
-st.set_page_config(page_title='Adverse Event Clustering', layout='wide')
+from utils.bootstrap import bootstrap_page
+bootstrap_page(__file__, page_title='Adverse Event Clustering', layout='wide')
 
-
-
-st.sidebar.title("🔄 Navigate")
-
-# List of pages in sequence
-pages = [
-    ("1_Clinical Trials Data Explorer.py", "📊 Clinical Trials Data Explorer"),
-    ("2_Pivot Handling.py", "🔍 Exploratory Data Analysis"),
-    ("3_Adverse Event Clustering.py", "🤖 Adverse Event Clustering"),
-    ("4_Missing Value Analysis.py", "📉 Missing Value Analysis"),
-    ("5_Outlier Detection & Skewness Correction.py", "⚡ Outlier Detection & Skewness Correction"),
-    ("7_Feature Engineering Pipeline.py", "🔬 Feature Engineering Pipeline"),
-    ("8_Healthcare Data Feature Reduction Journey.py", "📈 Healthcare Data Feature Reduction Journey"),
-    ("9_ML Models Showcase.py", "🚀 ML Models Showcase")
-]
-
-
-# Determine current page index
-current_page_index = next((i for i, (page, _) in enumerate(pages) if page in os.path.basename(__file__)), None)
-
-# Navigation buttons
-if current_page_index is not None:
-    col1, col2 = st.sidebar.columns(2)
-
-    if current_page_index > 0:
-        with col1:
-            if st.button("⬅ Previous"):
-                os.system(f"streamlit run {pages[current_page_index - 1][0]}")
-
-    if current_page_index < len(pages) - 1:
-        with col2:
-            if st.button("Next ➡"):
-                os.system(f"streamlit run {pages[current_page_index + 1][0]}")
-import streamlit as st
 import pandas as pd
 import altair as alt
-import matplotlib.pyplot as plt
-import seaborn as sns
-import numpy as np
 from streamlit_lottie import st_lottie
-import requests
+from utils.assets import image_bytes, load_lottie
 
 # Must be first Streamlit command
 
-# Function to load Lottie files
-def load_lottieurl(url):
-    r = requests.get(url)
-    if r.status_code != 200:
-        return None
-    return r.json()
-
-# Load animation
-lottie_medical = load_lottieurl('https://assets2.lottiefiles.com/packages/lf20_5njp3vgg.json')
+# Load animation from the local asset bundle
+lottie_medical = load_lottie('medical')
 
 # Custom CSS with more vibrant styling
 st.markdown("""
@@ -144,7 +100,8 @@ col1, col2 = st.columns([2, 1])
 with col1:
     st.markdown('<h1 class="super-title">🩺 Adverse Event Clustering & Insights</h1>', unsafe_allow_html=True)
 with col2:
-    st_lottie(lottie_medical, height=200)
+    if lottie_medical:
+        st_lottie(lottie_medical, height=200)
 
 # Step 1
 st.markdown('<h2 class="gradient-text">The Challenge of Clinical Trials</h2>', unsafe_allow_html=True)
@@ -216,12 +173,7 @@ st.markdown("""
     </div>
 """, unsafe_allow_html=True)
 
-BASE_URL = "https://raw.githubusercontent.com/Siddhant2107/Clinical_trials/refs/heads/master/Frontend/pages/"
-def get_image_url(file_name):
-        return f"{BASE_URL}{file_name}"  # Properly construct the full URL
-
-output_url = get_image_url("output.jpg")
-st.image(output_url, use_column_width=True)
+st.image(image_bytes("output.jpg"), use_column_width=True)
 
 #st.image(r"C:\Users\Siddhant Nijhawan\Downloads\git2\Frontend\pages\output.jpg", use_column_width=True)
 
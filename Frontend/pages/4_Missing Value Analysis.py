@@ -1,76 +1,35 @@
 import streamlit as st
-import os
-st.set_page_config(page_title='🔍 Missing Value Analysis', layout='wide')
+from utils.bootstrap import bootstrap_page
+bootstrap_page(__file__, page_title='🔍 Missing Value Analysis', layout='wide')
 
-
-st.sidebar.title("🔄 Navigate")
-
-pages = [
-    ("1_Clinical Trials Data Explorer.py", "📊 Clinical Trials Data Explorer"),
-    ("2_Pivot Handling.py", "🔍 Exploratory Data Analysis"),
-    ("3_Adverse Event Clustering.py", "🤖 Adverse Event Clustering"),
-    ("4_Missing Value Analysis.py", "📉 Missing Value Analysis"),
-    ("5_Outlier Detection & Skewness Correction.py", "⚡ Outlier Detection & Skewness Correction"),
-    ("7_Feature Engineering Pipeline.py", "🔬 Feature Engineering Pipeline"),
-    ("8_Healthcare Data Feature Reduction Journey.py", "📈 Healthcare Data Feature Reduction Journey"),
-    ("9_ML Models Showcase.py", "🚀 ML Models Showcase")
-]
-
-
-# Determine current page index
-current_page_index = next((i for i, (page, _) in enumerate(pages) if page in os.path.basename(__file__)), None)
-
-# Navigation buttons
-if current_page_index is not None:
-    col1, col2 = st.sidebar.columns(2)
-
-    if current_page_index > 0:
-        with col1:
-            if st.button("⬅ Previous"):
-                os.system(f"streamlit run {pages[current_page_index - 1][0]}")
-
-    if current_page_index < len(pages) - 1:
-        with col2:
-            if st.button("Next ➡"):
-                os.system(f"streamlit run {pages[current_page_index + 1][0]}")
 import pandas as pd
 import altair as alt
-import numpy as np
 import time
 from streamlit_lottie import st_lottie
-import json
-import gdown
-import os
+from utils.frames import shared_page_table
+from utils.charts import cached as cached_chart, missing_percentages
+from utils.assets import load_lottie
 
-# Load dataset
-file_id = '1aCdIUjkVVM0yYkfVLOHEGPpCaMCZIfc6'
-
-# Path to save the downloaded file
-output_path = 'final_result5.xlsx'
-
-# Download the file
-url = f'https://drive.google.com/uc?id={file_id}'
-gdown.download(url, output_path, quiet=False)
-
-# Now read the downloaded file
-final_result5 = pd.read_excel(output_path)
+# Load dataset from its columnar copy (the workbook is only parsed on first access);
+# shared read-only across sessions
+final_result5 = shared_page_table('missing_values', 'final_result5.xlsx')
 
 # Page Configuration
 st.title('✨ Handling Missing Values in Clinical Trials')
 st.markdown("---")
 
-# Load Lottie Animation
-def load_lottieurl(url):
-    return url
-
-lottie_data = load_lottieurl('https://assets5.lottiefiles.com/packages/lf20_qp1q7mct.json')
-st_lottie(lottie_data, speed=1, height=250, key="loading")
+# Load Lottie Animation from the local asset bundle
+lottie_data = load_lottie('data_analysis')
+if lottie_data:
+    st_lottie(lottie_data, speed=1, height=250, key="loading")
 
 # Step 1: Identifying Missing Values
 st.subheader("📊 Step 1: Identifying Missing Values")
 st.write("Missing values can significantly impact clinical trial data. Let's visualize their distribution.")
 
-missing_values = final_result5.isnull().sum() / len(final_result5) * 100
+# Computed once per dataset version from a single null mask
+missing_values = cached_chart('missing', 'final_result5.xlsx', None, 'all',
+                              lambda: missing_percentages(final_result5))
 missing_values = missing_values.sort_values()
 
 # Animated loading effect
@@ -106,14 +65,12 @@ st.markdown("---")
 st.subheader("📌 Step 3: Comparing Missing Values in Study Groups")
 st.write("We analyze the missing value distribution in *Completed vs Non-Completed Studies*.")
 
-def calculate_missing_values_by_group(group):
-    return group.isnull().sum() / len(group) * 100
-
-completed_group = final_result5[final_result5['Study Status'] == 'COMPLETED']
-non_completed_group = final_result5[final_result5['Study Status'] != 'COMPLETED']
-
-missing_completed = calculate_missing_values_by_group(completed_group)
-missing_non_completed = calculate_missing_values_by_group(non_completed_group)
+# Both groups from one null mask of the shared frame, without copying either group
+by_status = cached_chart('missing', 'final_result5.xlsx', 'Study Status', 'COMPLETED', lambda: missing_percentages(
+    shared_page_table('missing_values', 'final_result5.xlsx'), by='Study Status', value='COMPLETED'))
+by_status = by_status.loc[final_result5.columns]
+missing_completed = by_status['in']
+missing_non_completed = by_status['out']
 
 missing_comparison = pd.DataFrame({
     'Column': missing_completed.index,
@@ -1,66 +1,22 @@
 import streamlit as st
-import os
-st.set_page_config(page_title='Outlier Detection & Skewness Correction', layout='wide')
-
-
-st.sidebar.title("🔄 Navigate")
-
-# List of pages in sequence
-pages = [
-    ("1_Clinical Trials Data Explorer.py", "📊 Clinical Trials Data Explorer"),
-    ("2_Pivot Handling.py", "🔍 Exploratory Data Analysis"),
-    ("3_Adverse Event Clustering.py", "🤖 Adverse Event Clustering"),
-    ("4_Missing Value Analysis.py", "📉 Missing Value Analysis"),
-    ("5_Outlier Detection & Skewness Correction.py", "⚡ Outlier Detection & Skewness Correction"),
-    ("7_Feature Engineering Pipeline.py", "🔬 Feature Engineering Pipeline"),
-    ("8_Healthcare Data Feature Reduction Journey.py", "📈 Healthcare Data Feature Reduction Journey"),
-    ("9_ML Models Showcase.py", "🚀 ML Models Showcase")
-]
-
-# Determine current page index
-current_page_index = next((i for i, (page, _) in enumerate(pages) if page in os.path.basename(__file__)), None)
-
-# Navigation buttons
-if current_page_index is not None:
-    col1, col2 = st.sidebar.columns(2)
-
-    if current_page_index > 0:
-        with col1:
-            if st.button("⬅ Previous"):
-                os.system(f"streamlit run {pages[current_page_index - 1][0]}")
-
-    if current_page_index < len(pages) - 1:
-        with col2:
-            if st.button("Next ➡"):
-                os.system(f"streamlit run {pages[current_page_index + 1][0]}")
+from utils.bootstrap import bootstrap_page
+bootstrap_page(__file__, page_title='Outlier Detection & Skewness Correction', layout='wide')
 
 import pandas as pd
 import numpy as np
 import altair as alt
-import matplotlib.pyplot as plt
 
 
 
-import pandas as pd
-import gdown
-import os
-import streamlit as st
-
-# File ID from your Google Drive
-null_values_file_id = '1sQqtkvolIozbDTR9KJHG4Xvd_J7MvT7J'  # Replace with actual file ID
-null_values_output_path = 'null_values_dealt.csv'
+from utils.frames import shared_page_table
+from utils.projections import OUTLIER_COLUMNS
+from utils.charts import box_chart, box_stats, cached as cached_chart
+from utils.sketches import sketch_column
 
-# Download the file
-url = f'https://drive.google.com/uc?id={null_values_file_id}'
-
-
-# Show a loading spinner during download
+# Show a loading spinner while the analysed columns are loaded from the columnar cache
 with st.spinner('Loading dataset...'):
-    gdown.download(url, null_values_output_path, quiet=False)
-    
-    # Now read the downloaded file
-    sidd = pd.read_csv(null_values_output_path)
-    sidd.drop(["Unnamed: 0"], axis=1, inplace=True)
+    # The shared frame is read-only; this page caps and transforms its own copy
+    sidd = shared_page_table('outlier_detection', 'null_values_dealt.csv').copy()
 
 st.title('📊 Outlier Detection & Skewness Handling')
 
@@ -68,7 +24,7 @@ st.write("## Step 1: Understanding Skewness in Data")
 st.write("Skewed distributions can mislead models and affect predictions. Below is the skewness of selected numerical features before any transformation.")
 
 # Define selected numerical columns
-columns = ['Enrollment', 'subjects_at_risk', 'subjects_affected', 'duration', 'minimum_age', 'child', 'maximum_age', 'older_adult', 'adult']
+columns = OUTLIER_COLUMNS
 skewness = sidd[columns].skew().reset_index()
 skewness.columns = ['Feature', 'Skewness']
 
@@ -110,9 +66,20 @@ def cap_outliers_custom(df, column, lower_bound=None, upper_bound=None):
         df[column] = np.where(df[column] > upper_bound, upper_bound, df[column])
     return df
 
+approximate = st.sidebar.checkbox(
+    "⚡ Approximate percentiles",
+    help="Take the 1st/99th percentile caps from a mergeable quantile sketch instead of sorting the column.")
+
 for col in ['Enrollment', 'duration']:
-    lower = np.percentile(sidd[col], 1)
-    upper = np.percentile(sidd[col], 99)
+    if approximate:
+        # KLL sketch built once per dataset version; its rank error is shown with the caps
+        quantiles = sketch_column('null_values_dealt.csv', col).quantiles
+        lower, upper = quantiles.quantile([0.01, 0.99])
+        st.caption(f"{col}: capped at ≈{lower:,.4g} and ≈{upper:,.4g} "
+                   f"(within ±{quantiles.rank_error:.1%} in rank of the 1st/99th percentiles)")
+    else:
+        lower = np.percentile(sidd[col], 1)
+        upper = np.percentile(sidd[col], 99)
     sidd = cap_outliers_custom(sidd, col, lower, upper)
 for col in ['minimum_age', 'maximum_age']:
     if col == 'minimum_age':
@@ -122,10 +89,12 @@ for col in ['minimum_age', 'maximum_age']:
 
 # Boxplot visualization
 selected_col = st.selectbox("Select a column to visualize outlier treatment", columns)
-fig, ax = plt.subplots()
-sidd[selected_col].plot(kind='box', ax=ax)
-ax.set_title(f"After Outlier Processing: {selected_col}")
-st.pyplot(fig)
+# Quartiles, whiskers and an outlier sample computed once per dataset version and column
+box = cached_chart('box', 'null_values_dealt.csv', selected_col,
+                   'capped-approx' if approximate else 'capped', lambda: box_stats(sidd[selected_col]))
+if box is not None:
+    st.altair_chart(box_chart(box, selected_col).properties(title=f"After Outlier Processing: {selected_col}"),
+                    use_container_width=True)
 
 st.write("## Step 3: Log Transformation for Skewed Features")
 st.write("To correct skewness, we applied log transformation to numerical variables heavily affected by outliers.")
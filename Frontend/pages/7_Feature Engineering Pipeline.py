@@ -1,70 +1,22 @@
 import streamlit as st
-import os
-from sklearn.preprocessing import LabelEncoder
+from utils.bootstrap import bootstrap_page, ensure_nltk_resources
 import pickle
-import streamlit as st
 
 
-st.set_page_config(
+bootstrap_page(
+    __file__,
     page_title="Feature Engineering Pipeline",
     layout="wide",
     initial_sidebar_state="expanded"
 )
 
-
-st.sidebar.title("🔄 Navigate")
-
-pages = [
-    ("1_Clinical Trials Data Explorer.py", "📊 Clinical Trials Data Explorer"),
-    ("2_Pivot Handling.py", "🔍 Exploratory Data Analysis"),
-    ("3_Adverse Event Clustering.py", "🤖 Adverse Event Clustering"),
-    ("4_Missing Value Analysis.py", "📉 Missing Value Analysis"),
-    ("5_Outlier Detection & Skewness Correction.py", "⚡ Outlier Detection & Skewness Correction"),
-    ("7_Feature Engineering Pipeline.py", "🔬 Feature Engineering Pipeline"),
-    ("8_Healthcare Data Feature Reduction Journey.py", "📈 Healthcare Data Feature Reduction Journey"),
-    ("9_ML Models Showcase.py", "🚀 ML Models Showcase")
-]
-
-# Determine current page index
-current_page_index = next((i for i, (page, _) in enumerate(pages) if page in os.path.basename(__file__)), None)
-
-# Navigation buttons
-if current_page_index is not None:
-    col1, col2 = st.sidebar.columns(2)
-
-    if current_page_index > 0:
-        with col1:
-            if st.button("⬅ Previous"):
-                os.system(f"streamlit run {pages[current_page_index - 1][0]}")
-
-    if current_page_index < len(pages) - 1:
-        with col2:
-            if st.button("Next ➡"):
-                os.system(f"streamlit run {pages[current_page_index + 1][0]}")
 import pandas as pd
-import plotly.express as px
 from streamlit_lottie import st_lottie
+from utils.assets import load_lottie
 from streamlit_option_menu import option_menu
-import requests
-import time
-import nltk
-from sklearn.preprocessing import LabelEncoder, MultiLabelBinarizer
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.feature_selection import SelectKBest, chi2
-from scipy import sparse
-from nltk.corpus import stopwords
-from nltk.stem import WordNetLemmatizer
-import pickle
-import re
-import string
 
-# Download NLTK resources at app startup
-try:
-    nltk.download('omw-1.4', quiet=True)
-    nltk.download('stopwords', quiet=True)
-    nltk.download('wordnet', quiet=True)
-except:
-    pass
+# NLTK resources are checked once per process, not on every rerun
+ensure_nltk_resources('omw-1.4', 'stopwords', 'wordnet')
 
 # Initialize session state for data
 if 'data' not in st.session_state:
@@ -75,21 +27,15 @@ if 'encoded_data' not in st.session_state:
 # Load data directly (for large files)
 @st.cache_data
 def load_data():
-    import pandas as pd
-    import requests
-    import io
-
-    file_id = "1G1_teUIEGAoblrlm2aaXC3SaCz8sKrIM"
-    gdrive_url = f"https://drive.google.com/uc?export=download&id={file_id}"
+    from utils.datasets import fetch
 
-    response = requests.get(gdrive_url)
-    response.raise_for_status()
+    data_path = fetch("feature_engineering_data.csv")
 
     # Try different parsing parameters to handle the inconsistent CSV
     try:
         # First attempt with automatic quoting detection and error handling
         df = pd.read_csv(
-            io.StringIO(response.text),
+            data_path,
             engine='python',  # More flexible but slower engine
             on_bad_lines='warn',  # Warn about problematic lines instead of failing
             quoting=3,  # QUOTE_NONE - Disable quote detection
@@ -98,7 +44,7 @@ def load_data():
     except Exception as e:
         # Second attempt with more aggressive error handling
         df = pd.read_csv(
-            io.StringIO(response.text),
+            data_path,
             engine='python',
             on_bad_lines='skip',  # Skip problematic lines entirely
             quoting=3,
@@ -244,18 +190,11 @@ if uploaded_file is not None and st.session_state.data is None:
         st.session_state.data.drop(["Unnamed: 0"], axis=1, inplace=True)
 
 
-def load_lottie_url(url: str):
-    r = requests.get(url)
-    if r.status_code != 200:
-        return None
-    return r.json()
-
 if selected == "Overview":
     st.title('🎯 Feature Engineering Pipeline')
     
     # Animated intro
-    lottie_url = "https://assets9.lottiefiles.com/packages/lf20_xqbbchie.json"
-    lottie_json = load_lottie_url(lottie_url)
+    lottie_json = load_lottie("feature_engineering")
     if lottie_json:
         st_lottie(lottie_json, height=300)
     
@@ -326,6 +265,8 @@ if selected == "Low Cardinality":
                     st.error(f"Column '{feature}' not found in the dataset.")
                 else:
                     with st.spinner("Applying Label Encoding..."):
+                        from sklearn.preprocessing import LabelEncoder
+
                         label_encoder = LabelEncoder()
                         st.session_state.data[feature] = label_encoder.fit_transform(
                             st.session_state.data[feature].astype(str)
@@ -405,14 +346,12 @@ elif selected == "Medium Cardinality":
             
             with st.spinner("Applying Encoding..."):
                 if encoding_type == "Study Design (MultiLabel)":
-                    # MultiLabel Binarizer logic
-                    st.session_state.data["Study Design"] = st.session_state.data["Study Design"].fillna("")
-                    st.session_state.data["Study Design"] = st.session_state.data["Study Design"].apply(lambda x: x.split("|"))
-                    
-                    mlb = MultiLabelBinarizer()
-                    study_design_encoded = pd.DataFrame(
-                        mlb.fit_transform(st.session_state.data["Study Design"]),
-                        columns=[f"Study_Design_{col}" for col in mlb.classes_]
+                    # Multi-hot encoding: one split pass into a sparse matrix, densified to uint8 for display
+                    from utils.encoders import MultiHotEncoder
+
+                    mlb = MultiHotEncoder(sep="|", prefix="Study_Design", other=False)
+                    study_design_encoded = mlb.fit(st.session_state.data["Study Design"]).transform_dense(
+                        st.session_state.data["Study Design"], index=st.session_state.data.index
                     )
                     
                     st.session_state.data = pd.concat(
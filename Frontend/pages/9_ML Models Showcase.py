@@ -1,56 +1,25 @@
 import streamlit as st
-import os
-st.set_page_config(
+from utils.bootstrap import bootstrap_page
+bootstrap_page(
+    __file__,
     page_title="ML Models Showcase",
     page_icon="📊",
     layout="wide",
     initial_sidebar_state="expanded"
 )
 
-
-
-st.sidebar.title("🔄 Navigate")
-
-pages = [
-    ("1_Clinical Trials Data Explorer.py", "📊 Clinical Trials Data Explorer"),
-    ("2_Pivot Handling.py", "🔍 Exploratory Data Analysis"),
-    ("3_Adverse Event Clustering.py", "🤖 Adverse Event Clustering"),
-    ("4_Missing Value Analysis.py", "📉 Missing Value Analysis"),
-    ("5_Outlier Detection & Skewness Correction.py", "⚡ Outlier Detection & Skewness Correction"),
-    ("7_Feature Engineering Pipeline.py", "🔬 Feature Engineering Pipeline"),
-    ("8_Healthcare Data Feature Reduction Journey.py", "📈 Healthcare Data Feature Reduction Journey"),
-    ("9_ML Models Showcase.py", "🚀 ML Models Showcase")
-]
-
-
-# Determine current page index
-current_page_index = next((i for i, (page, _) in enumerate(pages) if page in os.path.basename(__file__)), None)
-
-# Navigation buttons
-if current_page_index is not None:
-    col1, col2 = st.sidebar.columns(2)
-
-    if current_page_index > 0:
-        with col1:
-            if st.button("⬅ Previous"):
-                os.system(f"streamlit run {pages[current_page_index - 1][0]}")
-
-    if current_page_index < len(pages) - 1:
-        with col2:
-            if st.button("Next ➡"):
-                os.system(f"streamlit run {pages[current_page_index + 1][0]}")
 import pandas as pd
 import numpy as np
-import pickle
 import time
-import pandas as pd
-import gdown
-import os
-from PIL import Image
-import matplotlib.pyplot as plt
 from streamlit_lottie import st_lottie
-import requests
-import json
+from utils.projections import load_page_table
+from utils.datasets import fingerprint
+from utils.frames import shared
+from utils.assets import image_bytes, load_lottie
+from utils.models import load_model, load_scaler
+from utils.evaluation import evaluate_splits, timing_table
+from utils import results as result_store
+from utils.jobs import JOBS, DONE as JOB_DONE, FAILED as JOB_FAILED
 
 # Page Configuration
 
@@ -157,37 +126,10 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-# Functions to load lottie animations
-# Function to load Lottie animations with error handling
-def load_lottieurl(url):
-    try:
-        r = requests.get(url)
-        if r.status_code != 200:
-            st.warning(f"Failed to load animation from {url}. Status Code: {r.status_code}")
-            return None
-        return r.json()
-    except Exception as e:
-        st.error(f"Error fetching animation from {url}: {e}")
-        return None
-
-# Load animations
-lottie_ml = load_lottieurl("https://assets1.lottiefiles.com/packages/lf20_qp1q7mct.json")
-lottie_data = load_lottieurl("https://assets1.lottiefiles.com/packages/lf20_qp1q7mct.json")
-lottie_loading = load_lottieurl("https://assets9.lottiefiles.com/packages/lf20_p8bfn5to.json")
-
-# Helper functions
-def load_image(image_path):
-    try:
-        return Image.open(image_path)
-    except:
-        st.error(f"Could not load image from {image_path}. Using placeholder instead.")
-        return None
-
-# Simulated data loading (replace with actual file paths)
-def get_image_path(file_name):
-    # Replace this with the correct path for your environment
-    base_path = r"https://raw.githubusercontent.com/Siddhant2107/Clinical_trials/main/Frontend/pages"
-    return os.path.join(base_path, file_name)
+# Animations and images come from the local asset bundle
+lottie_ml = load_lottie("data_analysis")
+lottie_data = load_lottie("data_analysis")
+lottie_loading = load_lottie("loading")
 
 # Main app structure
 def main():
@@ -195,8 +137,9 @@ def main():
     st.sidebar.title("Model Selection")
     
     # Display lottie animation in sidebar
-    with st.sidebar:
-        st_lottie(lottie_ml, height=200)
+    if lottie_ml:
+        with st.sidebar:
+            st_lottie(lottie_ml, height=200)
     
     # Model selection
     model_options = [
@@ -255,7 +198,8 @@ def display_home():
             
         
         with col2:
-            st_lottie(lottie_data, height=300)
+            if lottie_data:
+                st_lottie(lottie_data, height=300)
     
     # Dataset information
     st.markdown('<h2 class="sub-header animated-box" style="animation-delay: 1s;">About the Dataset</h2>', unsafe_allow_html=True)
@@ -428,26 +372,20 @@ def display_logistic_regression_results():
     st.markdown(table_html, unsafe_allow_html=True)
 
 
-    # Define the base URL
-    BASE_URL = "https://raw.githubusercontent.com/Siddhant2107/Clinical_trials/refs/heads/master/Frontend/pages/"
-
-    def get_image_url(file_name):
-        return f"{BASE_URL}{file_name}"  # Properly construct the full URL
-
     # Confusion Matrix
     st.markdown('<h4>Confusion Matrix:</h4>', unsafe_allow_html=True)
-    confusion_matrix_url = get_image_url("logistic_confusion.png")
-    st.image(confusion_matrix_url, caption="Confusion Matrix", use_column_width=True)
+    confusion_matrix_image = image_bytes("logistic_confusion.png")
+    st.image(confusion_matrix_image, caption="Confusion Matrix", use_column_width=True)
 
     # ROC Curve
     st.markdown('<h4>ROC Curve:</h4>', unsafe_allow_html=True)
-    roc_curve_url = get_image_url("logistic_roc.png")
-    st.image(roc_curve_url, caption="ROC Curve", use_column_width=True)
+    roc_curve_image = image_bytes("logistic_roc.png")
+    st.image(roc_curve_image, caption="ROC Curve", use_column_width=True)
 
     # LIME Explanation
     st.markdown('<h3 class="sub-header animated-box">Model Explainability (LIME)</h3>', unsafe_allow_html=True)
-    lime_image_url = get_image_url("lime_logistioc.png")
-    st.image(lime_image_url, caption="LIME Explanation", use_column_width=True)
+    lime_image = image_bytes("lime_logistioc.png")
+    st.image(lime_image, caption="LIME Explanation", use_column_width=True)
 
 
     # Interpretation
@@ -577,25 +515,20 @@ def display_random_forest_results():
     """
     st.markdown(table_html_rf, unsafe_allow_html=True)
 
-    BASE_URL = "https://raw.githubusercontent.com/Siddhant2107/Clinical_trials/refs/heads/master/Frontend/pages/"
-
-    def get_image_url(file_name):
-        return f"{BASE_URL}{file_name}"  # Properly construct the full URL
-
     # Confusion Matrix
     st.markdown('<h4>Confusion Matrix:</h4>', unsafe_allow_html=True)
-    confusion_matrix_url = get_image_url("random_confusion111.png")
-    st.image(confusion_matrix_url, caption="Confusion Matrix", use_column_width=True)
+    confusion_matrix_image = image_bytes("random_confusion111.png")
+    st.image(confusion_matrix_image, caption="Confusion Matrix", use_column_width=True)
 
     # ROC Curve
     st.markdown('<h4>ROC Curve:</h4>', unsafe_allow_html=True)
-    roc_curve_url = get_image_url("random_auc112.png")
-    st.image(roc_curve_url, caption="ROC Curve", use_column_width=True)
+    roc_curve_image = image_bytes("random_auc112.png")
+    st.image(roc_curve_image, caption="ROC Curve", use_column_width=True)
 
     # LIME Explanation
     st.markdown('<h3 class="sub-header animated-box">Model Explainability (LIME)</h3>', unsafe_allow_html=True)
-    lime_image_url = get_image_url("random_lime.png")
-    st.image(lime_image_url, caption="LIME Explanation", use_column_width=True)
+    lime_image = image_bytes("random_lime.png")
+    st.image(lime_image, caption="LIME Explanation", use_column_width=True)
 
     # Interpretation
     st.markdown("""
@@ -727,21 +660,15 @@ def display_lightgbm_results():
     st.markdown(table_html_lgbm, unsafe_allow_html=True)
 
 
-    # Define the base URL
-    BASE_URL = "https://raw.githubusercontent.com/Siddhant2107/Clinical_trials/refs/heads/master/Frontend/pages/"
-
-    def get_image_url(file_name):
-        return f"{BASE_URL}{file_name}"  # Properly construct the full URL
-
     # ROC Curve
     st.markdown('<h4>ROC Curve:</h4>', unsafe_allow_html=True)
-    roc_curve_url = get_image_url("light_roc.png")
-    st.image(roc_curve_url, caption="ROC Curve", use_column_width=True)
+    roc_curve_image = image_bytes("light_roc.png")
+    st.image(roc_curve_image, caption="ROC Curve", use_column_width=True)
 
     # LIME Explanation
     st.markdown('<h3 class="sub-header animated-box">Model Explainability (LIME)</h3>', unsafe_allow_html=True)
-    lime_image_url = get_image_url("light_lime.png")
-    st.image(lime_image_url, caption="LIME Explanation", use_column_width=True)
+    lime_image = image_bytes("light_lime.png")
+    st.image(lime_image, caption="LIME Explanation", use_column_width=True)
 
     # Interpretation
     st.markdown(""" 
@@ -817,37 +744,73 @@ def display_xgboost_optuna():
     # File uploader for model pickle
     uploaded_model = st.file_uploader("Upload XGBoost model (.pkl file)", type=["pkl"])
     
+    # Probability above which a trial is predicted as the positive class
+    threshold = st.slider("Decision threshold", min_value=0.05, max_value=0.95, value=0.5, step=0.05)
+
     start_button = st.button("Start Model Training/Evaluation")
     
     if start_button and uploaded_model is not None:
-        with st.spinner("Running XGBoost model on training, validation, and test datasets..."):
-            # Save the uploaded model to a temporary file
-            with open("temp_xgb_model.pkl", "wb") as f:
-                f.write(uploaded_model.getbuffer())
-
-            # Execute the XGBoost evaluation code
-            try:
-                with st.expander("Execution Log", expanded=True):
-                    st.markdown('<h5 style="color: #1e3a5c;">Training Dataset Evaluation:</h5>', unsafe_allow_html=True)
-                    train_results = run_xgboost_on_train_data()
-                    
-                    st.markdown('<h5 style="color: #1e3a5c;">Test Dataset Evaluation:</h5>', unsafe_allow_html=True)
-                    test_results = run_xgboost_on_test_data()
-                    
-                    # Store results in session state for display
-                    st.session_state.xgb_train_results = train_results
-                    st.session_state.xgb_test_results = test_results
-                
-                st.success("XGBoost model evaluation completed successfully!")
-                
-                # Display results automatically
-                display_xgboost_results(train_results, test_results)
-
-                # Display additional visuals (Top Features, SHAP Explanation)
-                display_xgboost_visuals()
-
-            except Exception as e:
-                st.error(f"An error occurred during model execution: {str(e)}")
+        try:
+            # Unpickled once per process and shared by sessions uploading the same bytes
+            model_key, xgb_model = load_model(uploaded_model.getvalue())
+        except Exception as e:
+            st.error(f"An error occurred while loading the model: {str(e)}")
+        else:
+            # Runs on the shared worker pool; sessions evaluating the same model and threshold share one job
+            job = JOBS.submit(('xgb_evaluation', model_key, round(threshold, 6)), run_xgboost_evaluation,
+                              xgb_model, threshold, model_key, description="XGBoost evaluation")
+            st.session_state.xgb_job = job.key
+
+    if st.session_state.get('xgb_job') is not None:
+        display_xgboost_job(st.session_state.xgb_job)
+
+
+def display_xgboost_job(job_key):
+    """Show the progress of a background evaluation, then its results."""
+    job = JOBS.get(job_key)
+    if job is None:
+        del st.session_state['xgb_job']
+        return
+
+    with st.expander("Execution Log", expanded=True):
+        st.markdown('<h5 style="color: #1e3a5c;">Train, Validation and Test Evaluation:</h5>', unsafe_allow_html=True)
+        for kind, message in list(job.log):
+            colours = ('#f2feeb', '#4caf50') if kind == 'success' else ('#f0f5ff', '#4361ee')
+            st.markdown(f'<div style="background-color: {colours[0]}; padding: 10px; border-radius: 5px; border-left: 5px solid {colours[1]};"><span style="color: #1e3a5c; font-weight: bold;">{message}</span></div>', unsafe_allow_html=True)
+        if job.state == JOB_DONE:
+            # Per-split timing (scoring and metrics run once per split, concurrently)
+            st.markdown('<h5 style="color: #1e3a5c;">Per-split timing (seconds):</h5>', unsafe_allow_html=True)
+            st.dataframe(timing_table(job.result[2]).round(4))
+
+    if not job.finished:
+        st.progress(job.progress, text=job.message)
+        if st.button("Cancel evaluation"):
+            JOBS.cancel(job_key)
+            del st.session_state['xgb_job']
+            st.rerun()
+        # Poll the job; the page stays interactive in between
+        time.sleep(0.5)
+        st.rerun()
+
+    if job.state == JOB_DONE:
+        train_results, test_results, _ = job.result
+        # Store results in session state for display
+        st.session_state.xgb_train_results = train_results
+        st.session_state.xgb_test_results = test_results
+
+        st.success("XGBoost model evaluation completed successfully!")
+
+        # Display results automatically
+        display_xgboost_results(train_results, test_results)
+
+        # Display additional visuals (Top Features, SHAP Explanation)
+        display_xgboost_visuals()
+    elif job.state == JOB_FAILED:
+        st.error(f"An error occurred during model execution: {str(job.error)}")
+        del st.session_state['xgb_job']
+    else:
+        st.warning("The evaluation was cancelled.")
+        del st.session_state['xgb_job']
 
 
 def display_xgboost_visuals():
@@ -859,282 +822,96 @@ def display_xgboost_visuals():
     
     with col1:
         st.markdown('<h4 style="color: #1e3a5c;">Top 20 Features in XGBoost</h4>', unsafe_allow_html=True)
-        BASE_URL = "https://raw.githubusercontent.com/Siddhant2107/Clinical_trials/refs/heads/master/Frontend/pages/"
-
-        def get_image_url(file_name):
-            return f"{BASE_URL}{file_name}"  # Properly construct the full URL
-        roc_curve_url = get_image_url("xgboost_top20.png")
-        st.image(roc_curve_url, caption="Top 20 Most Important Features", use_column_width=True)
+        roc_curve_image = image_bytes("xgboost_top20.png")
+        st.image(roc_curve_image, caption="Top 20 Most Important Features", use_column_width=True)
     
     with col2:
         st.markdown('<h4 style="color: #1e3a5c;">SHAP Explanation Summary</h4>', unsafe_allow_html=True)
-        BASE_URL = "https://raw.githubusercontent.com/Siddhant2107/Clinical_trials/refs/heads/master/Frontend/pages/"
-
-        def get_image_url(file_name):
-            return f"{BASE_URL}{file_name}"  # Properly construct the full URL
-        roc_curve_url = get_image_url("xgboost_shap.png")
-        st.image(roc_curve_url, caption="SHAP Summary Plot", use_column_width=True)
+        roc_curve_image = image_bytes("xgboost_shap.png")
+        st.image(roc_curve_image, caption="SHAP Summary Plot", use_column_width=True)
     
     st.markdown('<h4 style="color: #1e3a5c;">SHAP Dependence Plot</h4>', unsafe_allow_html=True)
-    BASE_URL = "https://raw.githubusercontent.com/Siddhant2107/Clinical_trials/refs/heads/master/Frontend/pages/"
-
-    def get_image_url(file_name):
-        return f"{BASE_URL}{file_name}"  # Properly construct the full URL
-    roc_curve_url = get_image_url("xgboost_shap2.png")
-    st.image(roc_curve_url, caption="SHAP Dependence Plot", use_column_width=True)
-
-def run_xgboost_on_train_data():
-    """Run XGBoost model on training and validation datasets"""
-    results = {}
-    
-    # Capture print outputs
-    import io
-    from contextlib import redirect_stdout
-
-    output = io.StringIO()
-    with redirect_stdout(output):
-        import pandas as pd
-        import numpy as np
-        import pickle
-        from sklearn.preprocessing import StandardScaler
-        from sklearn.metrics import classification_report, accuracy_score, roc_auc_score
-
-        st.markdown('<div style="background-color: #f0f5ff; padding: 10px; border-radius: 5px; border-left: 5px solid #4361ee;"><span style="color: #1e3a5c; font-weight: bold;"> Loading training and validation datasets...</span></div>', unsafe_allow_html=True)
-        
-    
-    
-
-
-        def download_and_load_csv(file_id, output_path):
-            """Download a CSV file from Google Drive and load it into a DataFrame."""
-            url = f"https://drive.google.com/uc?id={file_id}"
-            gdown.download(url, output_path, quiet=False)
-            return pd.read_csv(output_path)
-
-        # Google Drive file IDs
-        train_file_id = "1K-MSY0I33fRn2ghv7QNFYUlizuHE7XL3"
-        val_file_id = "1lJTDs41J3rJn2VaT9p8DK47P87eS3yBa"
-
-        # Download and load datasets
-        train_csv_path = "train_data_reduced.csv"
-        val_csv_path = "val_data_reduced.csv"
-
-        X_train_df = download_and_load_csv(train_file_id, train_csv_path)
-        X_val_df = download_and_load_csv(val_file_id, val_csv_path)
-
-        # Verify Column Names
-        print("Train Data Columns:", X_train_df.columns.tolist())
-        print("Validation Data Columns:", X_val_df.columns.tolist())
-
-        # Extract Target Variable
-        if 'Study Status' in X_train_df.columns and 'Study Status' in X_val_df.columns:
-            y_train = X_train_df['Study Status']
-            y_val = X_val_df['Study Status']
-
-            # Drop target column from features
-            X_train_reduced = X_train_df.drop(columns=['Study Status'])
-            X_val_reduced = X_val_df.drop(columns=['Study Status'])
-        else:
-            print("Error: 'Study Status' column not found in dataset!")
-
-
-        st.markdown('<div style="background-color: #f0f5ff; padding: 10px; border-radius: 5px; border-left: 5px solid #4361ee;"><span style="color: #1e3a5c; font-weight: bold;"> Handling missing data...</span></div>', unsafe_allow_html=True)
-        # Handle missing data (replace Inf and NaN values)
-        for df in [X_train_reduced, X_val_reduced]:
-            df.replace([np.inf, -np.inf], np.nan, inplace=True)
-            df.fillna(df.mean(), inplace=True)
+    roc_curve_image = image_bytes("xgboost_shap2.png")
+    st.image(roc_curve_image, caption="SHAP Dependence Plot", use_column_width=True)
 
-        st.markdown('<div style="background-color: #f2feeb; padding: 10px; border-radius: 5px; border-left: 5px solid #4caf50;"><span style="color: #1e3a5c; font-weight: bold;"> Replaced Inf values and handled missing data in training and validation sets.</span></div>', unsafe_allow_html=True)
+# Reduced datasets evaluated on this page, by split name
+EVALUATION_SPLITS = {
+    'train': "train_data_reduced.csv",
+    'val': "val_data_reduced.csv",
+    'test': "test_data_reduced.csv",
+}
 
-        st.markdown('<div style="background-color: #f0f5ff; padding: 10px; border-radius: 5px; border-left: 5px solid #4361ee;"><span style="color: #1e3a5c; font-weight: bold;"> Loading and applying scaler...</span></div>', unsafe_allow_html=True)
-        # Load the trained StandardScaler used during training
 
-        def download_pickle_from_drive(file_id, output_path):
-            url = f"https://drive.google.com/uc?export=download&id={file_id}"
-            gdown.download(url, output_path, quiet=False)
+def load_evaluation_split(name):
+    """Load a reduced split, replace Inf/NaN with column means and apply the fitted scaler.
 
-        # Replace with your actual Google Drive file ID
-        scaler_file_id = "15UQALIaGW2_ww8fe6hq3Dt-drxPbzzdU"
-        scaler_path = "scaler.pkl"  # Temporary local storage
-
-        # Download the scaler file
-        download_pickle_from_drive(scaler_file_id, scaler_path)
-
-        # Load the scaler
-        with open(scaler_path, 'rb') as f:
-            scaler = pickle.load(f)
-
-
-        # Apply the same Standard Scaling transformation
-        X_train_reduced = pd.DataFrame(scaler.transform(X_train_reduced), columns=X_train_reduced.columns)
-        X_val_reduced = pd.DataFrame(scaler.transform(X_val_reduced), columns=X_val_reduced.columns)
-
-        st.markdown('<div style="background-color: #f2feeb; padding: 10px; border-radius: 5px; border-left: 5px solid #4caf50;"><span style="color: #1e3a5c; font-weight: bold;"> Applied Standard Scaling to Training and Validation Features.</span></div>', unsafe_allow_html=True)
+    The scaled split is prepared once per process and shared read-only by all sessions.
+    """
+    def load():
+        df = load_page_table("ml_showcase", name)
+        y = df['Study Status']
+        X = df.drop(columns=['Study Status'])
+        X = X.replace([np.inf, -np.inf], np.nan)
+        X = X.fillna(X.mean())
+        X = pd.DataFrame(load_scaler().transform(X), columns=X.columns)
+        return X, y
 
-        st.markdown('<div style="background-color: #f0f5ff; padding: 10px; border-radius: 5px; border-left: 5px solid #4361ee;"><span style="color: #1e3a5c; font-weight: bold;"> Loading XGBoost model...</span></div>', unsafe_allow_html=True)
-        # Load the trained XGBoost model (using the uploaded model)
-        with open("temp_xgb_model.pkl", 'rb') as f:
-            xgb_model = pickle.load(f)
+    return shared(('evaluation_split', name, (fingerprint(name), fingerprint("scaler.pkl"))), load)
 
-        st.markdown('<div style="background-color: #f0f5ff; padding: 10px; border-radius: 5px; border-left: 5px solid #4361ee;"><span style="color: #1e3a5c; font-weight: bold;"> Making predictions...</span></div>', unsafe_allow_html=True)
-        # Predict on training data
-        y_train_pred = xgb_model.predict(X_train_reduced)  # Class labels
-        y_train_pred_proba = xgb_model.predict_proba(X_train_reduced)[:, 1]  # Probability scores
 
-        # Predict on validation data
-        y_val_pred = xgb_model.predict(X_val_reduced)  # Class labels
-        y_val_pred_proba = xgb_model.predict_proba(X_val_reduced)[:, 1]  # Probability scores
+def run_xgboost_evaluation(job, xgb_model, threshold=0.5, model_key=None):
+    """Score the train, validation and test splits once each, concurrently.
 
-        # Evaluate model performance on training data
-        train_accuracy = accuracy_score(y_train, y_train_pred)
-        train_roc_auc = roc_auc_score(y_train, y_train_pred_proba)
+    Runs as a background job (``utils.jobs``): progress and log messages are
+    reported on ``job`` and cancellation is honoured between steps.
 
-        # Evaluate model performance on validation data
-        val_accuracy = accuracy_score(y_val, y_val_pred)
-        val_roc_auc = roc_auc_score(y_val, y_val_pred_proba)
+    Splits already evaluated for (``model_key``, dataset, threshold) are read
+    from the persistent result store instead of being scored again.
 
-        st.markdown('<div style="background-color: #f0f5ff; padding: 10px; border-radius: 5px; border-left: 5px solid #4361ee;"><span style="color: #1e3a5c; font-weight: bold;"> Evaluating model performance...</span></div>', unsafe_allow_html=True)
-        
-        from sklearn.metrics import precision_score, recall_score, f1_score
-        
-        # Calculate additional metrics for training data
-        train_precision = precision_score(y_train, y_train_pred)
-        train_recall = recall_score(y_train, y_train_pred)
-        train_f1 = f1_score(y_train, y_train_pred)
-        
-        # Calculate additional metrics for validation data
-        val_precision = precision_score(y_val, y_val_pred)
-        val_recall = recall_score(y_val, y_val_pred)
-        val_f1 = f1_score(y_val, y_val_pred)
-        
-        # Create classification reports
-        train_report = classification_report(y_train, y_train_pred, output_dict=True)
-        val_report = classification_report(y_val, y_val_pred, output_dict=True)
-        
-        # Store results
-        results['train_accuracy'] = train_accuracy
-        results['train_precision'] = train_precision
-        results['train_recall'] = train_recall
-        results['train_f1'] = train_f1
-        results['train_roc_auc'] = train_roc_auc
-        results['train_report'] = train_report
-        
-        results['val_accuracy'] = val_accuracy
-        results['val_precision'] = val_precision
-        results['val_recall'] = val_recall
-        results['val_f1'] = val_f1
-        results['val_roc_auc'] = val_roc_auc
-        results['val_report'] = val_report
-        
-        # Save predictions to CSV files
-        train_predictions_df = pd.DataFrame({'True Label': y_train, 'Predicted': y_train_pred, 'Probability': y_train_pred_proba})
-        val_predictions_df = pd.DataFrame({'True Label': y_val, 'Predicted': y_val_pred, 'Probability': y_val_pred_proba})
-        
-        # Print prediction summary
-        st.markdown(f'<div style="background-color: #f2feeb; padding: 10px; border-radius: 5px; border-left: 5px solid #4caf50;"><span style="color: #1e3a5c; font-weight: bold;"> Generated predictions for {len(y_train)} training samples and {len(y_val)} validation samples.</span></div>', unsafe_allow_html=True)
-    
-    return results
+    Returns ``(train_results, test_results, evaluated)``: the first two use
+    the ``<split>_<metric>`` keys expected by ``display_xgboost_results``,
+    ``evaluated`` holds the per-split results including timings.
+    """
+    evaluated = {}
+    data_hashes = {split: result_store.dataset_hash(name, "scaler.pkl") for split, name in EVALUATION_SPLITS.items()}
+    if model_key is not None:
+        for split, data_hash in data_hashes.items():
+            stored = result_store.get(model_key, data_hash, threshold)
+            if stored is not None:
+                evaluated[split] = stored
+        if evaluated:
+            job.report(0.1, f"✅ Reused stored results for: {', '.join(evaluated)}.", 'success')
+    missing = [split for split in EVALUATION_SPLITS if split not in evaluated]
+
+    job.report(0.1, " Loading datasets, handling missing data and applying the scaler...")
+    splits = {}
+    for i, split in enumerate(missing, 1):
+        job.check_cancelled()
+        splits[split] = load_evaluation_split(EVALUATION_SPLITS[split])
+        job.report(0.1 + 0.4 * i / len(missing), f" Loaded the {split} split.")
+    job.report(0.5, " Replaced Inf values, handled missing data and applied Standard Scaling.", 'success')
+
+    job.check_cancelled()
+    job.report(0.55, f" Making predictions (one pass per split, threshold {threshold:.2f})...")
+    scored = evaluate_splits(xgb_model, splits, threshold) if splits else {}
+    job.check_cancelled()
+    for split, result in scored.items():
+        result['label'] = splits[split][1].to_numpy()
+        if model_key is not None:
+            result_store.put(model_key, data_hashes[split], threshold, result)
+    evaluated.update(scored)
+    evaluated = {split: evaluated[split] for split in EVALUATION_SPLITS}
 
-def run_xgboost_on_test_data():
-    """Run XGBoost model on test dataset"""
     results = {}
-    
-    # Capture print outputs
-    import io
-    from contextlib import redirect_stdout
-
-    output = io.StringIO()
-    with redirect_stdout(output):
-        import pandas as pd
-        import numpy as np
-        import pickle
-        from sklearn.preprocessing import StandardScaler
-        from sklearn.metrics import classification_report, accuracy_score, roc_auc_score
-
-        st.markdown('<div style="background-color: #f0f5ff; padding: 10px; border-radius: 5px; border-left: 5px solid #4361ee;"><span style="color: #1e3a5c; font-weight: bold;"> Loading test dataset...</span></div>', unsafe_allow_html=True)
-        # Load the X_test data (already preprocessed and reduced)
-        def get_drive_csv(file_id):
-            return f"https://drive.google.com/uc?id={file_id}"
-
-        # Replace with your actual file ID
-        test_file_id = "1bZDKTm-vtys5_dI0FJ8Hbd-4DqcZ5e0R"  # Replace with the actual file ID from Google Drive
-
-        # Load test dataset from Google Drive
-        x_test_val_df = pd.read_csv(get_drive_csv(test_file_id))
-
-        # Extract true labels
-        y_true_new_data = x_test_val_df['Study Status']
-        X_test_reduced = x_test_val_df.drop(columns=['Study Status'])  # Drop target column from features
+    for split, result in evaluated.items():
+        for metric in ('accuracy', 'precision', 'recall', 'f1', 'roc_auc'):
+            results[f'{split}_{metric}'] = result[metric]
+        results[f'{split}_report'] = result['report']
+    train_results = {key: value for key, value in results.items() if not key.startswith('test_')}
+    test_results = {key: value for key, value in results.items() if key.startswith('test_')}
 
-        st.markdown('<div style="background-color: #f0f5ff; padding: 10px; border-radius: 5px; border-left: 5px solid #4361ee;"><span style="color: #1e3a5c; font-weight: bold;"> Handling missing data...</span></div>', unsafe_allow_html=True)
-        # Handle missing data (replace Inf and NaN values)
-        X_test_reduced.replace([np.inf, -np.inf], np.nan, inplace=True)
-        X_test_reduced.fillna(X_test_reduced.mean(), inplace=True)
-
-        st.markdown('<div style="background-color: #f2feeb; padding: 10px; border-radius: 5px; border-left: 5px solid #4caf50;"><span style="color: #1e3a5c; font-weight: bold;"> Replaced Inf values and handled missing data.</span></div>', unsafe_allow_html=True)
-
-        st.markdown('<div style="background-color: #f0f5ff; padding: 10px; border-radius: 5px; border-left: 5px solid #4361ee;"><span style="color: #1e3a5c; font-weight: bold;"> Loading and applying scaler...</span></div>', unsafe_allow_html=True)
-        # Load the trained StandardScaler used during training
-        def download_pickle_from_drive(file_id, output_path):
-            url = f"https://drive.google.com/uc?export=download&id={file_id}"
-            gdown.download(url, output_path, quiet=False)
-
-        # Replace with your actual Google Drive file ID
-        scaler_file_id = "15UQALIaGW2_ww8fe6hq3Dt-drxPbzzdU"
-        scaler_path = "scaler.pkl"  # Temporary local storage
-
-        # Download the scaler file
-        download_pickle_from_drive(scaler_file_id, scaler_path)
-
-        # Load the scaler
-        with open(scaler_path, 'rb') as f:
-            scaler = pickle.load(f)
-
-
-        # Apply the same Standard Scaling transformation
-        X_test_reduced = pd.DataFrame(scaler.transform(X_test_reduced), columns=X_test_reduced.columns)
-
-        st.markdown('<div style="background-color: #f2feeb; padding: 10px; border-radius: 5px; border-left: 5px solid #4caf50;"><span style="color: #1e3a5c; font-weight: bold;"> Applied Standard Scaling to Features.</span></div>', unsafe_allow_html=True)
-
-        st.markdown('<div style="background-color: #f0f5ff; padding: 10px; border-radius: 5px; border-left: 5px solid #4361ee;"><span style="color: #1e3a5c; font-weight: bold;"> Loading XGBoost model...</span></div>', unsafe_allow_html=True)
-        # Load the trained XGBoost model (using the uploaded model)
-        with open("temp_xgb_model.pkl", 'rb') as f:
-            xgb_model = pickle.load(f)
-
-        st.markdown('<div style="background-color: #f0f5ff; padding: 10px; border-radius: 5px; border-left: 5px solid #4361ee;"><span style="color: #1e3a5c; font-weight: bold;"> Making predictions...</span></div>', unsafe_allow_html=True)
-        # Predict on the new data
-        y_pred_new_data = xgb_model.predict(X_test_reduced)  # Predict the class labels
-        y_pred_proba_new_data = xgb_model.predict_proba(X_test_reduced)[:, 1]  # Predict probabilities for AUC
-
-        # Evaluate model performance on the new data
-        from sklearn.metrics import precision_score, recall_score, f1_score
-        
-        test_accuracy = accuracy_score(y_true_new_data, y_pred_new_data)
-        test_roc_auc = roc_auc_score(y_true_new_data, y_pred_proba_new_data)
-        test_precision = precision_score(y_true_new_data, y_pred_new_data)
-        test_recall = recall_score(y_true_new_data, y_pred_new_data)
-        test_f1 = f1_score(y_true_new_data, y_pred_new_data)
-        
-        st.markdown('<div style="background-color: #f0f5ff; padding: 10px; border-radius: 5px; border-left: 5px solid #4361ee;"><span style="color: #1e3a5c; font-weight: bold;">⏳ Evaluating model performance...</span></div>', unsafe_allow_html=True)
-        
-        # Create classification report
-        test_report = classification_report(y_true_new_data, y_pred_new_data, output_dict=True)
-        
-        # Store results
-        results['test_accuracy'] = test_accuracy
-        results['test_precision'] = test_precision
-        results['test_recall'] = test_recall
-        results['test_f1'] = test_f1
-        results['test_roc_auc'] = test_roc_auc
-        results['test_report'] = test_report
-        
-        # Save predictions to a DataFrame
-        predictions_df = pd.DataFrame({'True Label': y_true_new_data, 'Predicted': y_pred_new_data, 'Probability': y_pred_proba_new_data})
-        
-        # Print prediction summary
-        st.markdown(f'<div style="background-color: #f2feeb; padding: 10px; border-radius: 5px; border-left: 5px solid #4caf50;"><span style="color: #1e3a5c; font-weight: bold;">✅ Generated predictions for {len(y_true_new_data)} test samples.</span></div>', unsafe_allow_html=True)
-    
-    return results
+    job.report(1.0, f"✅ Generated predictions for {len(evaluated['train']['proba'])} training, {len(evaluated['val']['proba'])} validation and {len(evaluated['test']['proba'])} test samples.", 'success')
+    return train_results, test_results, evaluated
 
 def display_xgboost_results(train_results, test_results):
     """Display XGBoost results in a professional format"""
@@ -1288,9 +1065,6 @@ def display_xgboost_results(train_results, test_results):
     </div>
     """, unsafe_allow_html=True)
 
-import pandas as pd
-import streamlit as st
-
 def create_classification_report_table(report_dict):
     """Create a well-formatted classification report table for Streamlit."""
     
@@ -0,0 +1,87 @@
+"""Vectorised aggregation of multi-valued columns per trial.
+
+The merge notebook builds per-trial strings with
+``groupby(...).agg(lambda s: "; ".join(s.dropna().unique()))``, which calls
+Python once per group. Here keys and values are factorised to integer codes
+and (key, value) pairs are deduplicated with a single ``np.unique``; the
+result is emitted either as the same joined strings or directly as a sparse
+multi-hot matrix, which is what the later one-hot steps need anyway.
+"""
+import numpy as np
+import pandas as pd
+
+
+def _factorize(values):
+    """Factorise in sorted order when the values are mutually comparable."""
+    values = np.asarray(values, dtype=object)
+    try:
+        return pd.factorize(values, sort=True)
+    except TypeError:
+        return pd.factorize(values)
+
+
+def unique_pairs(keys, values):
+    """Deduplicate (key, value) pairs with integer array operations.
+
+    Returns ``(key_codes, key_uniques, value_codes, value_uniques)``. Pairs are
+    ordered by key and, within a key, by first occurrence, i.e. the order
+    ``Series.unique`` gives. Keys and values are factorised in sorted order;
+    rows where either is missing are skipped.
+    """
+    key_codes, key_uniques = _factorize(keys)
+    value_codes, value_uniques = _factorize(values)
+    positions = np.flatnonzero((key_codes >= 0) & (value_codes >= 0))
+    width = max(len(value_uniques), 1)
+    combined = key_codes[positions].astype(np.int64) * width + value_codes[positions]
+    _, first = np.unique(combined, return_index=True)
+    kept = positions[np.sort(first)]
+    kept = kept[np.argsort(key_codes[kept], kind='stable')]
+    return key_codes[kept], key_uniques, value_codes[kept], value_uniques
+
+
+def join_unique(keys, values, sep="; "):
+    """Per-key ``sep.join`` of the unique non-null values (None when a key has none)."""
+    key_codes, key_uniques, value_codes, value_uniques = unique_pairs(keys, values)
+    strings = np.asarray(value_uniques, dtype=object).astype(str)[value_codes]
+    boundaries = np.flatnonzero(np.diff(key_codes)) + 1
+    joined = np.full(len(key_uniques), None, dtype=object)
+    if len(key_codes):
+        joined[key_codes[np.r_[0, boundaries]]] = [sep.join(group) for group in np.split(strings, boundaries)]
+    return pd.Series(joined, index=pd.Index(key_uniques, name=getattr(keys, 'name', None)),
+                     name=getattr(values, 'name', None))
+
+
+def multi_hot(keys, values, prefix=None):
+    """Per-key multi-hot encoding of a long (key, value) table as a CSR matrix.
+
+    Returns ``(matrix, key_uniques, column_names)`` where ``matrix`` has one
+    uint8 row per key and one column per distinct value.
+    """
+    from scipy import sparse
+
+    key_codes, key_uniques, value_codes, value_uniques = unique_pairs(keys, values)
+    matrix = sparse.csr_matrix(
+        (np.ones(len(key_codes), dtype=np.uint8), (key_codes, value_codes)),
+        shape=(len(key_uniques), len(value_uniques)),
+    )
+    prefix = prefix or getattr(values, 'name', None)
+    names = [f"{prefix}_{value}" if prefix else str(value) for value in value_uniques]
+    return matrix, key_uniques, names
+
+
+def aggregate_frame(df, key, sep="; "):
+    """Vectorised replacement for ``df.groupby(key).agg(aggregate_column)``.
+
+    Numeric columns take the per-key maximum, every other column the joined
+    unique values, exactly as ``aggregate_column`` in the merge notebook.
+    """
+    columns = [col for col in df.columns if col != key]
+    numeric = [col for col in columns if pd.api.types.is_numeric_dtype(df[col])]
+    if numeric:
+        result = df.groupby(key)[numeric].max()
+    else:
+        result = pd.DataFrame(index=pd.Index(pd.unique(df[key].dropna()), name=key).sort_values())
+    for col in columns:
+        if col not in numeric:
+            result[col] = join_unique(df[key], df[col], sep).reindex(result.index)
+    return result[columns].reset_index()
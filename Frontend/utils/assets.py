@@ -0,0 +1,146 @@
+"""Static assets served from a local bundle.
+
+Pages used to fetch their Lottie animations from lottiefiles.com with a
+timeout-less ``requests.get`` on every rerun, and pointed ``st.image`` at
+raw.githubusercontent.com for images that already sit in ``Frontend/pages``.
+Here every asset is resolved locally and its decoded content is kept in
+process memory, so a rerun never touches the network:
+
+* images are read from ``Frontend/pages``;
+* animations are read from ``Frontend/assets/lottie`` or, failing that,
+  from the dataset cache directory. A missing animation is fetched in a
+  background thread and the page renders without it until the download
+  lands.
+
+The bundle is vendored with ``python -m utils.assets`` (from ``Frontend/``).
+It downloads every animation into ``Frontend/assets/lottie`` and exits
+non-zero if any is missing. Commit the files, or run it as a deploy step, so
+a fresh deploy renders every animation on first load.
+"""
+import json
+import os
+import tempfile
+import threading
+from functools import lru_cache
+
+from utils.datasets import cache_dir, is_offline
+
+FRONTEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+IMAGE_DIR = os.path.join(FRONTEND_DIR, "pages")
+LOTTIE_DIR = os.path.join(FRONTEND_DIR, "assets", "lottie")
+
+# Animation name -> source URL; the bundle file is ``<name>.json``
+LOTTIE_SOURCES = {
+    "data_analysis": "https://assets5.lottiefiles.com/packages/lf20_qp1q7mct.json",
+    "medical": "https://assets2.lottiefiles.com/packages/lf20_5njp3vgg.json",
+    "feature_engineering": "https://assets9.lottiefiles.com/packages/lf20_xqbbchie.json",
+    "loading": "https://assets9.lottiefiles.com/packages/lf20_p8bfn5to.json",
+}
+
+FETCH_TIMEOUT = 10
+
+_lottie = {}
+_lottie_lock = threading.Lock()
+_in_flight = set()
+
+
+def _cached_lottie_path(name):
+    return os.path.join(cache_dir(), "assets", "lottie", f"{name}.json")
+
+
+def lottie_path(name):
+    """Local file holding animation ``name``, or None if it is not available yet."""
+    if name not in LOTTIE_SOURCES:
+        raise KeyError(f"Unknown animation: {name}")
+    for path in (os.path.join(LOTTIE_DIR, f"{name}.json"), _cached_lottie_path(name)):
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def _download_lottie(name, output_path):
+    import requests
+
+    response = requests.get(LOTTIE_SOURCES[name], timeout=FETCH_TIMEOUT)
+    response.raise_for_status()
+    data = response.json()
+    os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(output_path), suffix=".part")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, output_path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return data
+
+
+def _fetch_in_background(name):
+    def run():
+        try:
+            _download_lottie(name, _cached_lottie_path(name))
+        except Exception:
+            # The page keeps rendering without the animation
+            pass
+        finally:
+            with _lottie_lock:
+                _in_flight.discard(name)
+
+    with _lottie_lock:
+        if name in _in_flight:
+            return
+        _in_flight.add(name)
+    threading.Thread(target=run, name=f"lottie-{name}", daemon=True).start()
+
+
+def load_lottie(name):
+    """Decoded Lottie JSON for ``name``, or None while it is not available locally.
+
+    Never blocks on the network: a miss schedules a background download
+    (unless offline mode is on) and returns None immediately.
+    """
+    with _lottie_lock:
+        if name in _lottie:
+            return _lottie[name]
+    path = lottie_path(name)
+    if path is None:
+        if not is_offline():
+            _fetch_in_background(name)
+        return None
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    with _lottie_lock:
+        return _lottie.setdefault(name, data)
+
+
+@lru_cache(maxsize=None)
+def image_bytes(file_name):
+    """Raw bytes of an image shipped in ``Frontend/pages``, read once per process."""
+    with open(os.path.join(IMAGE_DIR, file_name), "rb") as f:
+        return f.read()
+
+
+def download_bundle(names=None):
+    """Fetch animations into ``Frontend/assets/lottie`` so the app runs fully offline.
+
+    Returns the names that could not be fetched.
+    """
+    failed = []
+    for name in names or LOTTIE_SOURCES:
+        path = os.path.join(LOTTIE_DIR, f"{name}.json")
+        if not os.path.exists(path):
+            try:
+                _download_lottie(name, path)
+            except Exception as exc:
+                print(f"{name}: failed ({exc})")
+                failed.append(name)
+                continue
+        print(f"{name}: {path}")
+    return failed
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(1 if download_bundle(sys.argv[1:]) else 0)
@@ -0,0 +1,60 @@
+"""Shared start-up for every page.
+
+``bootstrap_page`` is the first call on each page: it sets the page config
+and renders the shared navigation before any page-specific import runs, so
+the sidebar is on screen while the rest of the script is still loading.
+Heavy libraries (sklearn, lightgbm, xgboost, matplotlib, nltk) are imported
+inside the code path that needs them rather than at module top.
+
+External resources are checked once per process. Streamlit re-executes the
+page script on every interaction; ``ensure_nltk_resources`` remembers what it
+has already verified, so reruns and other sessions skip ``nltk.download``.
+"""
+import threading
+
+from utils.navigation import sidebar_navigation
+
+# nltk download id -> path probed with ``nltk.data.find``
+NLTK_RESOURCES = {
+    'omw-1.4': 'corpora/omw-1.4',
+    'stopwords': 'corpora/stopwords',
+    'wordnet': 'corpora/wordnet',
+}
+
+_checked = {}
+_checked_lock = threading.Lock()
+
+
+def bootstrap_page(current_file, **page_config):
+    """Set the page config and render the sidebar navigation for ``current_file``."""
+    import streamlit as st
+
+    st.set_page_config(**page_config)
+    sidebar_navigation(current_file)
+
+
+def _ensure_nltk_resource(name):
+    import nltk
+
+    try:
+        nltk.data.find(NLTK_RESOURCES.get(name, name))
+        return True
+    except LookupError:
+        pass
+    try:
+        return bool(nltk.download(name, quiet=True))
+    except Exception:
+        # Offline or blocked: the page must still render
+        return False
+
+
+def ensure_nltk_resources(*names):
+    """Make sure the nltk resources are available; checked at most once per process.
+
+    Returns a dict mapping each name to whether it is available.
+    """
+    with _checked_lock:
+        for name in names:
+            if name not in _checked:
+                _checked[name] = _ensure_nltk_resource(name)
+        return {name: _checked[name] for name in names}
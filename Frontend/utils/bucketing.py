@@ -0,0 +1,119 @@
+"""Cumulative-frequency bucketing of long-tailed categorical columns.
+
+The merge notebook collapses rare ``period``, ``reason`` and ``country``
+values by sorting categories by their ``COMPLETED`` count in the status
+pivot, taking the cumulative percentage of their totals and relabelling
+everything past a threshold (``classify_period``,
+``classif_reason``, ``classify_country``); Pivot Handling repeats the 91%
+rule inline. Those run row by row with ``apply(axis=1)`` and recompute the
+column maximum on every call. ``CumulativeFrequencyBucketer`` computes the
+value counts once, derives a category -> bucket mapping and applies it with
+a single categorical map. The mapping is saved as JSON so training and
+inference bucket identically.
+"""
+import json
+
+import numpy as np
+import pandas as pd
+
+
+def _plain(value):
+    """NumPy scalars as the matching Python type, so mappings round-trip through JSON."""
+    return value.item() if isinstance(value, np.generic) else value
+
+
+class CumulativeFrequencyBucketer:
+    """Collapse the long tail of a categorical column by cumulative frequency.
+
+    Categories are ranked, by default from most to least frequent, and each
+    gets the cumulative percentage of the counts up to and including itself.
+    A category keeps its own label when that percentage is at most
+    ``keep_upto`` (strictly below it with ``keep_inclusive=False``).
+    Otherwise it gets the label of the first closed ``(lower, upper, label)``
+    range containing the percentage, or ``tail_label`` when none does. This
+    mirrors the notebook's if/elif chains, including their gaps (71.5% falls
+    to the tail under the period rule). Categories unseen at fit time also
+    get ``tail_label``, since they are by definition rare.
+    """
+
+    def __init__(self, keep_upto, buckets, tail_label, keep_inclusive=True):
+        self.keep_upto = keep_upto
+        self.buckets = [(float(lower), float(upper), label) for lower, upper, label in buckets]
+        self.tail_label = tail_label
+        self.keep_inclusive = keep_inclusive
+
+    def fit(self, values):
+        """Fit from raw values (one per row)."""
+        return self.fit_counts(pd.Series(values).value_counts())
+
+    def fit_counts(self, counts, sort=True):
+        """Fit from precomputed per-category counts (e.g. a pivot table's total column).
+
+        With ``sort=False`` the categories are ranked in the order given, e.g. a
+        pivot table the merge notebook sorted by its ``COMPLETED`` column.
+        """
+        if sort:
+            counts = counts.sort_values(ascending=False, kind='stable')
+        cumulative = counts.cumsum() / counts.sum() * 100
+        self.cumulative_percentage_ = cumulative
+        percent = cumulative.to_numpy(dtype=np.float64)
+        labels = np.full(len(percent), self.tail_label, dtype=object)
+        # Assign in reverse so the first matching range wins
+        for lower, upper, label in reversed(self.buckets):
+            labels[(percent >= lower) & (percent <= upper)] = label
+        keep = percent <= self.keep_upto if self.keep_inclusive else percent < self.keep_upto
+        categories = cumulative.index.to_numpy(dtype=object)
+        labels[keep] = categories[keep]
+        self.mapping_ = {_plain(category): _plain(label) for category, label in zip(categories, labels)}
+        return self
+
+    def transform(self, values):
+        """Map values to their bucket; missing values stay missing."""
+        values = pd.Series(values)
+        bucketed = values.astype('category').map(self.mapping_).astype(object)
+        unseen = values.notna() & bucketed.isna()
+        return bucketed.mask(unseen, self.tail_label)
+
+    def fit_transform(self, values):
+        return self.fit(values).transform(values)
+
+    def to_dict(self):
+        # Mapping as [category, label] pairs: JSON object keys would turn
+        # numeric categories into strings that no longer match at transform time
+        return {
+            'keep_upto': self.keep_upto,
+            'keep_inclusive': self.keep_inclusive,
+            'buckets': [[lower, upper, label] for lower, upper, label in self.buckets],
+            'tail_label': self.tail_label,
+            'mapping': [[k, v] for k, v in self.mapping_.items()],
+        }
+
+    @classmethod
+    def from_dict(cls, state):
+        bucketer = cls(state['keep_upto'], state['buckets'], state['tail_label'], state['keep_inclusive'])
+        bucketer.mapping_ = {k: v for k, v in state['mapping']}
+        return bucketer
+
+    def save(self, path):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2, ensure_ascii=False)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, encoding='utf-8') as f:
+            return cls.from_dict(json.load(f))
+
+
+# The merge notebook's classify_period, classif_reason and classify_country
+# rules, also used on the Pivot Handling page
+BUCKET_PRESETS = {
+    'period': {'keep_upto': 71, 'buckets': [(72, 80, '72-80%'), (81, 90, '81-90%')], 'tail_label': '91-100%'},
+    'reason': {'keep_upto': 74, 'buckets': [(75, 85, '75-85%')], 'tail_label': '86-100%'},
+    'country': {'keep_upto': 91, 'keep_inclusive': False, 'buckets': [],
+                'tail_label': 'country with high cumsum value'},
+}
+
+
+def preset_bucketer(name):
+    """Return an unfitted bucketer configured with the thresholds for ``name``."""
+    return CumulativeFrequencyBucketer(**BUCKET_PRESETS[name])
@@ -0,0 +1,132 @@
+"""Server-side aggregation of chart data.
+
+Several charts used to ship or re-scan full columns:
+
+- ``px.histogram(df, x=col)`` in the Explorer sent every raw row to the
+  browser.
+- The Outlier page drew a matplotlib box plot over the whole column on each
+  selectbox change.
+- The Missing Value page scanned the full frame for nulls, and copied it per
+  study-status group, on every rerun.
+
+Here the aggregates are computed with NumPy on the server:
+
+- histogram bin edges and counts;
+- box-plot quartiles, whiskers and a bounded sample of outliers;
+- per-column missing percentages.
+
+They are cached per (dataset version, column, transform) in the process-wide
+cache of ``utils.frames``. Chart payloads and render time therefore depend
+on the number of bins, not the number of rows.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.datasets import fingerprint
+from utils.frames import shared
+
+MAX_BINS = 100
+MAX_OUTLIERS = 200
+
+
+def cached(kind, name, column, transform, compute):
+    """Run ``compute()`` once per (kind, dataset version, column, transform) and share the result."""
+    return shared(('chart', kind, name, column, transform, fingerprint(name)), compute)
+
+
+def _finite(values):
+    values = pd.to_numeric(pd.Series(values), errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+    return values[np.isfinite(values)]
+
+
+def histogram(values, bins='auto', max_bins=MAX_BINS):
+    """Bin edges and counts of the finite values: ``{'edges', 'counts', 'n', 'dropped'}``.
+
+    ``bins='auto'`` is NumPy's Sturges/Freedman-Diaconis choice, capped at
+    ``max_bins`` equal-width bins.
+    """
+    total = len(values)
+    values = _finite(values)
+    if not len(values):
+        return {'edges': np.array([0.0, 1.0]), 'counts': np.array([0]), 'n': 0, 'dropped': total}
+    edges = np.histogram_bin_edges(values, bins=bins)
+    if len(edges) - 1 > max_bins:
+        edges = np.histogram_bin_edges(values, bins=max_bins)
+    counts, edges = np.histogram(values, bins=edges)
+    return {'edges': edges, 'counts': counts, 'n': len(values), 'dropped': total - len(values)}
+
+
+def histogram_frame(hist):
+    """One row per bin (start, end, centre, width, count), for Plotly or Altair."""
+    edges = hist['edges']
+    return pd.DataFrame({
+        'start': edges[:-1],
+        'end': edges[1:],
+        'centre': (edges[:-1] + edges[1:]) / 2,
+        'width': np.diff(edges),
+        'count': hist['counts'],
+    })
+
+
+def box_stats(values, whisker=1.5, max_outliers=MAX_OUTLIERS):
+    """Box-plot statistics as drawn by matplotlib/pandas ``plot(kind='box')``.
+
+    Whiskers reach the most extreme values within ``whisker`` IQRs of the
+    quartiles. Values beyond the whiskers are outliers. At most
+    ``max_outliers`` of them are kept, evenly spaced in sorted order, so
+    the extremes are always included.
+    """
+    values = _finite(values)
+    if not len(values):
+        return None
+    q1, median, q3 = np.percentile(values, [25, 50, 75])
+    iqr = q3 - q1
+    inside = values[(values >= q1 - whisker * iqr) & (values <= q3 + whisker * iqr)]
+    low, high = (inside.min(), inside.max()) if len(inside) else (q1, q3)
+    outliers = np.sort(values[(values < low) | (values > high)])
+    if len(outliers) > max_outliers:
+        outliers = outliers[np.linspace(0, len(outliers) - 1, max_outliers).round().astype(int)]
+    return {
+        'q1': float(q1), 'median': float(median), 'q3': float(q3),
+        'whisker_low': float(low), 'whisker_high': float(high),
+        'mean': float(values.mean()), 'n': len(values),
+        'n_outliers': int(((values < low) | (values > high)).sum()),
+        'outliers': outliers,
+    }
+
+
+def box_chart(stats, column):
+    """Altair box plot of precomputed ``box_stats``: whiskers, IQR box, median and outlier sample."""
+    import altair as alt
+
+    summary = pd.DataFrame([{
+        'column': column, 'q1': stats['q1'], 'median': stats['median'], 'q3': stats['q3'],
+        'low': stats['whisker_low'], 'high': stats['whisker_high'],
+    }])
+    x = alt.X('column:N', title=None)
+    whiskers = alt.Chart(summary).mark_rule().encode(x=x, y=alt.Y('low:Q', title=column), y2='high:Q')
+    box = alt.Chart(summary).mark_bar(size=40, color='#4c78a8').encode(x=x, y='q1:Q', y2='q3:Q')
+    median = alt.Chart(summary).mark_tick(size=40, color='white', thickness=2).encode(x=x, y='median:Q')
+    layers = [whiskers, box, median]
+    if len(stats['outliers']):
+        points = pd.DataFrame({'column': column, 'value': stats['outliers']})
+        layers.append(alt.Chart(points).mark_point(color='#e45756').encode(x=x, y='value:Q', tooltip=['value:Q']))
+    return alt.layer(*layers)
+
+
+def missing_percentages(frame, by=None, value=None):
+    """Percentage of missing values per column, from one null mask.
+
+    With ``by`` and ``value``, returns a frame with one column for the rows
+    where ``frame[by] == value`` and one for the others. This replaces
+    filtering (and so copying) the whole frame once per group.
+    """
+    mask = frame.isna().to_numpy()
+    if by is None:
+        return pd.Series(mask.sum(axis=0) / len(frame) * 100, index=frame.columns)
+    in_group = (frame[by] == value).to_numpy(dtype=bool, na_value=False)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        return pd.DataFrame({
+            'in': mask[in_group].sum(axis=0) / in_group.sum() * 100,
+            'out': mask[~in_group].sum(axis=0) / (~in_group).sum() * 100,
+        }, index=frame.columns)
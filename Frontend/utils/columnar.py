@@ -0,0 +1,108 @@
+"""Convert-once columnar loading for the raw datasets.
+
+The AACT pipe files, CSVs and the XLSX export are parsed once and written as
+an uncompressed Arrow IPC (Feather v2) file next to the dataset cache. Every
+later load memory-maps that file instead of re-parsing text or XML, so the
+cost of a page rerun no longer depends on the source format.
+
+Columnar files are keyed by the SHA-256 of the source content, so a new
+upload on Drive produces a new file rather than serving stale data.
+"""
+import os
+import tempfile
+import threading
+
+import pandas as pd
+
+from utils.datasets import cache_dir, fetch, fingerprint
+
+# Bump when the conversion logic changes so old files are not reused.
+FORMAT_VERSION = 1
+
+_materialise_lock = threading.Lock()
+_materialise_locks = {}  # columnar path -> lock held while it is written
+
+
+def read_source(path):
+    """Parse a raw dataset file according to its extension."""
+    if path.endswith('.txt'):
+        return pd.read_csv(path, sep='|', low_memory=False)
+    if path.endswith('.csv'):
+        return pd.read_csv(path, low_memory=False)
+    if path.endswith('.xlsx'):
+        return pd.read_excel(path)
+    raise ValueError(f"Unsupported dataset format: {path}")
+
+
+def _normalise_for_arrow(df):
+    """Turn object columns holding mixed Python types into nullable strings.
+
+    Arrow needs one type per column; pandas happily keeps e.g. ints and strings
+    together in an object column when a pipe file has dirty values.
+    """
+    import pyarrow as pa
+
+    for col in df.select_dtypes(include=['object']).columns:
+        try:
+            pa.array(df[col], from_pandas=True)
+        except (pa.ArrowInvalid, pa.ArrowTypeError):
+            df[col] = df[col].astype('string')
+    # Column names must be strings in the Arrow schema
+    df.columns = [str(c) for c in df.columns]
+    return df
+
+
+def columnar_path(name):
+    """Location of the columnar copy of a registered dataset."""
+    return os.path.join(cache_dir(), "columnar", f"{fingerprint(name)}.v{FORMAT_VERSION}.arrow")
+
+
+def materialise(name):
+    """Write the columnar copy of a dataset if it does not exist yet and return its path.
+
+    Concurrent callers for the same dataset wait for a single conversion.
+    """
+    path = columnar_path(name)
+    if os.path.exists(path):
+        return path
+    with _materialise_lock:
+        lock = _materialise_locks.setdefault(path, threading.Lock())
+    with lock:
+        if os.path.exists(path):
+            return path
+        return _write_columnar(name, path)
+
+
+def _write_columnar(name, path):
+    import pyarrow as pa
+    import pyarrow.feather as feather
+
+    df = _normalise_for_arrow(read_source(fetch(name)))
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+    os.close(fd)
+    try:
+        # Uncompressed so the file can be memory-mapped without decoding
+        feather.write_feather(table, tmp_path, compression="uncompressed")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return path
+
+
+def read_table(name, columns=None):
+    """Return the dataset as a memory-mapped ``pyarrow.Table``.
+
+    With ``columns``, only those columns are read from the mapping, so the
+    cost of a load scales with the projection rather than the file width.
+    """
+    import pyarrow.feather as feather
+
+    return feather.read_table(materialise(name), columns=columns, memory_map=True)
+
+
+def load_table(name, columns=None):
+    """Return a registered dataset as a DataFrame, served from its columnar copy."""
+    return read_table(name, columns=columns).to_pandas()
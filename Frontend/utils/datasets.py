@@ -0,0 +1,318 @@
+"""Dataset fetching with a content-addressed local cache.
+
+Every dataset the app uses lives on Google Drive. ``fetch`` resolves a
+registered dataset name to a local file and downloads it at most once: files
+are stored under their SHA-256 in the cache directory and ``manifest.json``
+maps each Drive file ID to the checksum of its content, so later calls are a
+dictionary lookup and an ``os.path.exists``.
+
+Environment variables:
+
+- ``CLINICAL_TRIALS_CACHE_DIR``: cache location (default ``~/.cache/clinical_trials``).
+- ``CLINICAL_TRIALS_MIRROR``: directory holding the raw files under their
+  dataset names. When set, files are taken from it instead of Drive, which
+  lets the app run fully offline against a stand-in copy.
+- ``CLINICAL_TRIALS_BASE_URL``: HTTP(S) location serving the raw files
+  under their dataset names (an internal mirror, or a local stand-in in
+  tests). When set, it is used instead of Drive.
+- ``CLINICAL_TRIALS_OFFLINE``: set to ``1`` to never touch the network.
+
+Downloads go to a partial file named after the Drive file ID, so an
+interrupted transfer resumes where it stopped. Over HTTP this uses Range
+requests; for Drive it relies on gdown's ``resume``. ``fetch_many`` fetches
+several datasets concurrently and reports bytes, seconds and throughput per
+file. A file whose checksum does not match its pinned ``sha256`` is
+discarded, including its partial download.
+"""
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+CACHE_DIR_ENV = "CLINICAL_TRIALS_CACHE_DIR"
+MIRROR_DIR_ENV = "CLINICAL_TRIALS_MIRROR"
+OFFLINE_ENV = "CLINICAL_TRIALS_OFFLINE"
+BASE_URL_ENV = "CLINICAL_TRIALS_BASE_URL"
+
+FETCH_TIMEOUT = 30
+FETCH_RETRIES = 3
+
+# Registered datasets: name -> Google Drive file ID and optional pinned checksum.
+# When ``sha256`` is set, a downloaded or mirrored file must match it.
+DATASETS = {
+    # Explorer
+    "usecase3_updated.csv": {"file_id": "1uMG_FaqUEmZ9MbZ7DNxbW-2Cs7oLEPL3", "sha256": None},
+    "drop_withdrawals_drop.txt": {"file_id": "1asYtLjN4n8ukK1P_A9wTiPiLiKBYXgmt", "sha256": None},
+    "facilities_drop.txt": {"file_id": "1FKLcD43Cx_d9YQiQ1Ey9m03LEqrBeGig", "sha256": None},
+    "reported_events_drop.txt": {"file_id": "134HKNOrP8hlh43-atf6uKz0M5I4V97te", "sha256": None},
+    "eligibilities_drop.txt": {"file_id": "1AQ5At-_IkonBMhjte188cqbILRYQYz_E", "sha256": None},
+    # Pivot Handling uses its own export of the trial table
+    "usecase3_updated_pivot.csv": {"file_id": "1RMFbwjz62F_Ie6_5tKnfTzYRMONFH__p", "sha256": None},
+    # Missing Value Analysis
+    "final_result5.xlsx": {"file_id": "1aCdIUjkVVM0yYkfVLOHEGPpCaMCZIfc6", "sha256": None},
+    # Outlier Detection & Skewness Correction
+    "null_values_dealt.csv": {"file_id": "1sQqtkvolIozbDTR9KJHG4Xvd_J7MvT7J", "sha256": None},
+    # Feature Engineering Pipeline
+    "feature_engineering_data.csv": {"file_id": "1G1_teUIEGAoblrlm2aaXC3SaCz8sKrIM", "sha256": None},
+    # ML Models Showcase
+    "train_data_reduced.csv": {"file_id": "1K-MSY0I33fRn2ghv7QNFYUlizuHE7XL3", "sha256": None},
+    "val_data_reduced.csv": {"file_id": "1lJTDs41J3rJn2VaT9p8DK47P87eS3yBa", "sha256": None},
+    "test_data_reduced.csv": {"file_id": "1bZDKTm-vtys5_dI0FJ8Hbd-4DqcZ5e0R", "sha256": None},
+    "scaler.pkl": {"file_id": "15UQALIaGW2_ww8fe6hq3Dt-drxPbzzdU", "sha256": None},
+}
+
+_manifest_lock = threading.Lock()
+# One lock per dataset name, so concurrent sessions download a file only once
+_fetch_locks = {}
+
+
+def cache_dir():
+    """Return the cache directory, creating it if needed."""
+    path = os.environ.get(CACHE_DIR_ENV) or os.path.join(os.path.expanduser("~"), ".cache", "clinical_trials")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def mirror_dir():
+    """Return the configured local mirror directory, or None."""
+    return os.environ.get(MIRROR_DIR_ENV) or None
+
+
+def base_url():
+    """Return the configured HTTP base URL for raw files, or None."""
+    url = os.environ.get(BASE_URL_ENV)
+    return url.rstrip("/") if url else None
+
+
+def is_offline():
+    return os.environ.get(OFFLINE_ENV, "").lower() in ("1", "true", "yes")
+
+
+def file_sha256(path, chunk_size=1 << 20):
+    """Hash a file in fixed-size chunks."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _manifest_path():
+    return os.path.join(cache_dir(), "manifest.json")
+
+
+def load_manifest():
+    """Return the file ID -> checksum manifest."""
+    try:
+        with open(_manifest_path(), encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def _record(file_id, name, sha256, size):
+    with _manifest_lock:
+        manifest = load_manifest()
+        manifest[file_id] = {"name": name, "sha256": sha256, "size": size, "fetched_at": time.time()}
+        # A unique temporary file: a fixed name raced between processes sharing the cache
+        fd, tmp_path = tempfile.mkstemp(dir=cache_dir(), prefix="manifest.", suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(manifest, f, indent=2, sort_keys=True)
+            os.replace(tmp_path, _manifest_path())
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+
+
+def object_path(sha256, name):
+    """Location of a cached file; the dataset's extension is kept so readers can sniff the format."""
+    suffix = os.path.splitext(name)[1]
+    return os.path.join(cache_dir(), "objects", sha256[:2], sha256 + suffix)
+
+
+def _store(tmp_path, name, expected_sha256):
+    """Move a fully written file into the content-addressed store."""
+    sha256 = file_sha256(tmp_path)
+    if expected_sha256 and sha256 != expected_sha256:
+        os.remove(tmp_path)
+        raise ValueError(f"Checksum mismatch for {name}: expected {expected_sha256}, got {sha256}")
+    target = object_path(sha256, name)
+    os.makedirs(os.path.dirname(target), exist_ok=True)
+    os.replace(tmp_path, target)
+    return sha256, target
+
+
+def _download(file_id, output_path):
+    import gdown
+
+    url = f"https://drive.google.com/uc?id={file_id}"
+    try:
+        result = gdown.download(url, output_path, quiet=True, resume=True)
+    except TypeError:
+        # gdown releases without ``resume``
+        result = gdown.download(url, output_path, quiet=True)
+    if result is None:
+        raise RuntimeError(f"Failed to download Google Drive file {file_id}")
+
+
+class IncompleteDownload(IOError):
+    pass
+
+
+def _http_download(url, part_path, chunk_size=1 << 20, timeout=FETCH_TIMEOUT, retries=FETCH_RETRIES):
+    """Download ``url`` into ``part_path``, resuming from the bytes already there.
+
+    Dropped connections are retried (with a Range request from the current
+    size) up to ``retries`` times. Returns the number of bytes transferred.
+    """
+    import http.client
+    import urllib.error
+    import urllib.request
+
+    transferred = 0
+    for attempt in range(retries + 1):
+        offset = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+        request = urllib.request.Request(url, headers={"Range": f"bytes={offset}-"} if offset else {})
+        try:
+            try:
+                response = urllib.request.urlopen(request, timeout=timeout)
+            except urllib.error.HTTPError as exc:
+                if exc.code != 416:
+                    raise
+                # Nothing left to send: complete if the sizes agree, otherwise start over
+                total = exc.headers.get("Content-Range", "").rpartition("/")[2]
+                if total.isdigit() and int(total) == offset:
+                    return transferred
+                os.remove(part_path)
+                raise IncompleteDownload(f"{url}: partial file does not match the remote size")
+            with response:
+                if response.status != 206:
+                    # The server ignored the Range header and sent the whole file
+                    offset = 0
+                length = response.headers.get("Content-Length")
+                expected = offset + int(length) if length is not None else None
+                with open(part_path, "ab" if offset else "wb") as f:
+                    for chunk in iter(lambda: response.read(chunk_size), b""):
+                        f.write(chunk)
+                        transferred += len(chunk)
+            if expected is not None and os.path.getsize(part_path) != expected:
+                raise IncompleteDownload(f"{url}: got {os.path.getsize(part_path)} of {expected} bytes")
+            return transferred
+        except (urllib.error.URLError, http.client.HTTPException, ConnectionError, TimeoutError,
+                IncompleteDownload) as exc:
+            if isinstance(exc, urllib.error.HTTPError) or attempt == retries:
+                raise
+            time.sleep(min(2 ** attempt, 10))
+
+
+def fingerprint(name):
+    """Return the SHA-256 of a dataset's cached content, fetching it if needed."""
+    fetch(name)
+    return load_manifest()[DATASETS[name]["file_id"]]["sha256"]
+
+
+def cached_path(name):
+    """Return the cached path for a dataset, or None on a cache miss."""
+    entry = load_manifest().get(DATASETS[name]["file_id"])
+    if entry is None:
+        return None
+    path = object_path(entry["sha256"], name)
+    return path if os.path.exists(path) else None
+
+
+def fetch(name):
+    """Return a local path for a registered dataset, downloading it only on a cache miss."""
+    return fetch_with_stats(name)["path"]
+
+
+def fetch_with_stats(name):
+    """Fetch a dataset and report how: ``path``, ``cached``, ``source``, ``bytes``, ``resumed_from``, ``seconds``."""
+    if name not in DATASETS:
+        raise KeyError(f"Unknown dataset: {name}")
+    path = cached_path(name)
+    if path is not None:
+        return _stats(name, path, "cache")
+
+    with _manifest_lock:
+        lock = _fetch_locks.setdefault(name, threading.Lock())
+    with lock:
+        # Another thread may have fetched it while we waited
+        path = cached_path(name)
+        if path is not None:
+            return _stats(name, path, "cache")
+        return _fetch_uncached(name)
+
+
+def _stats(name, path, source, transferred=0, resumed_from=0, seconds=0.0):
+    return {
+        "name": name,
+        "path": path,
+        "cached": source == "cache",
+        "source": source,
+        "bytes": transferred,
+        "resumed_from": resumed_from,
+        "seconds": seconds,
+        "bytes_per_second": transferred / seconds if seconds else None,
+    }
+
+
+def _partial_path(name):
+    """Stable location of an in-progress download, so a later attempt can resume it."""
+    path = os.path.join(cache_dir(), "partial", DATASETS[name]["file_id"] + os.path.splitext(name)[1] + ".part")
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    return path
+
+
+def _fetch_uncached(name):
+    info = DATASETS[name]
+    part_path = _partial_path(name)
+    resumed_from = os.path.getsize(part_path) if os.path.exists(part_path) else 0
+    start = time.perf_counter()
+    mirror = mirror_dir()
+    if mirror and os.path.exists(os.path.join(mirror, name)):
+        source = "mirror"
+        shutil.copyfile(os.path.join(mirror, name), part_path)
+        transferred, resumed_from = os.path.getsize(part_path), 0
+    elif is_offline():
+        raise FileNotFoundError(f"{name} is not cached and not present in the local mirror")
+    elif base_url():
+        source = "http"
+        transferred = _http_download(f"{base_url()}/{name}", part_path)
+    else:
+        source = "drive"
+        _download(info["file_id"], part_path)
+        transferred = os.path.getsize(part_path) - resumed_from
+    seconds = time.perf_counter() - start
+    # Raises, and drops the partial file, on a checksum mismatch
+    sha256, path = _store(part_path, name, info.get("sha256"))
+    _record(info["file_id"], name, sha256, os.path.getsize(path))
+    return _stats(name, path, source, transferred, resumed_from, seconds)
+
+
+def fetch_many(names, workers=4, progress=None):
+    """Fetch several datasets concurrently; returns ``{name: stats}`` in input order.
+
+    ``progress(stats)`` is called on the calling thread as each file
+    completes. The first failure is raised once every fetch has finished.
+    """
+    names = list(dict.fromkeys(names))
+    results, error = {}, None
+    with ThreadPoolExecutor(max_workers=max(min(workers, len(names)), 1)) as pool:
+        futures = {pool.submit(fetch_with_stats, name): name for name in names}
+        for future in as_completed(futures):
+            try:
+                stats = future.result()
+            except Exception as exc:
+                error = error or exc
+                continue
+            results[futures[future]] = stats
+            if progress:
+                progress(stats)
+    if error is not None:
+        raise error
+    return {name: results[name] for name in names}
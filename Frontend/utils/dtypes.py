@@ -0,0 +1,71 @@
+"""Compact dtype inference for loaded datasets.
+
+Text columns load as ``object`` (pandas < 3) or as the ``str`` string dtype
+(pandas >= 3, and Arrow ``to_pandas()``); either way they hold one value per
+cell. Low-cardinality columns (statuses, phases, countries) are far smaller
+as categoricals, and free text is smaller as Arrow-backed strings, which
+also keep missing values as real nulls instead of the string ``'nan'``.
+"""
+import pandas as pd
+
+# Columns known to hold a small, fixed vocabulary
+CATEGORICAL_COLUMNS = {
+    'Study Status', 'Phases', 'Funder Type', 'Sex', 'Study Type', 'country',
+    'state', 'status', 'event_type', 'organ_system', 'period', 'reason',
+    'gender', 'sampling_method', 'healthy_volunteers',
+}
+
+# Columns known to hold free text
+TEXT_COLUMNS = {
+    'Brief Summary', 'criteria', 'Primary Outcome Measures',
+    'Secondary Outcome Measures', 'Other Outcome Measures', 'Conditions',
+    'Interventions', 'description', 'adverse_event_term', 'population',
+}
+
+ARROW_STRING = "string[pyarrow]"
+
+
+def is_text_dtype(dtype):
+    """True for ``object`` and string dtypes (``str``, ``string[python]``, ``string[pyarrow]``)."""
+    return dtype == object or isinstance(dtype, pd.StringDtype)
+
+
+def infer_compact_dtype(series, max_unique_ratio=0.5):
+    """Return the compact dtype for one column, or None to keep its dtype."""
+    if pd.api.types.is_integer_dtype(series.dtype):
+        return pd.to_numeric(series, downcast='integer').dtype
+    if not is_text_dtype(series.dtype):
+        return None
+    if series.name in TEXT_COLUMNS:
+        return ARROW_STRING
+    if series.name in CATEGORICAL_COLUMNS:
+        return 'category'
+    non_null = series.count()
+    if non_null and series.nunique() <= max_unique_ratio * non_null:
+        return 'category'
+    return ARROW_STRING
+
+
+def compact_dtypes(df, max_unique_ratio=0.5):
+    """Return a copy of ``df`` with every column converted to its compact dtype."""
+    converted = {}
+    for col in df.columns:
+        dtype = infer_compact_dtype(df[col], max_unique_ratio)
+        if dtype is None:
+            continue
+        # Mixed object columns (e.g. numbers and text) become text; nulls stay null
+        converted[col] = df[col].astype(dtype)
+    return df.assign(**converted) if converted else df.copy()
+
+
+def memory_report(before, after):
+    """Per-column deep memory usage (MB) of two versions of the same frame."""
+    mb = 1024 * 1024
+    report = pd.DataFrame({
+        'dtype before': before.dtypes.astype(str),
+        'dtype after': after.dtypes.astype(str),
+        'MB before': before.memory_usage(deep=True, index=False) / mb,
+        'MB after': after.memory_usage(deep=True, index=False) / mb,
+    })
+    report['saved %'] = (1 - report['MB after'] / report['MB before']) * 100
+    return report.sort_values('MB before', ascending=False)
@@ -0,0 +1,94 @@
+"""Sparse multi-hot encoding for multi-valued columns.
+
+Replaces ``one_hot_encode_column`` / ``one_hot_encode_countries`` in the
+merge notebook and the ``MultiLabelBinarizer`` used for ``Study Design``.
+Those loop over every distinct value and run a full ``apply`` per value,
+producing dense int64 columns. ``MultiHotEncoder`` splits the column once,
+maps values to integer codes against a vocabulary frozen at ``fit`` time and
+builds a CSR matrix in one pass. Values unseen at fit time (and, optionally,
+rare ones) go to an ``other`` bucket, so training and inference produce the
+same columns.
+"""
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+
+
+class MultiHotEncoder(BaseEstimator, TransformerMixin):
+    """Fitted multi-hot encoder for delimited multi-valued string columns.
+
+    Parameters
+    ----------
+    sep : str
+        Delimiter between values in a cell ("; " for the aggregated AACT
+        columns, "|" for ``Study Design``).
+    prefix : str or None
+        Column-name prefix; output columns are ``f"{prefix}_{value}"``.
+    min_frequency : int
+        Values present in fewer rows at fit time go to the ``other`` bucket.
+    max_categories : int or None
+        Keep at most this many of the most frequent values; the rest go to
+        ``other``.
+    other : bool
+        Whether to emit the ``other`` column. When False, rare and unseen
+        values are dropped.
+    """
+
+    OTHER = "other"
+
+    def __init__(self, sep="; ", prefix=None, min_frequency=1, max_categories=None, other=True):
+        self.sep = sep
+        self.prefix = prefix
+        self.min_frequency = min_frequency
+        self.max_categories = max_categories
+        self.other = other
+
+    def _explode(self, X):
+        """Split every cell once; return (row positions, values) for non-empty values."""
+        values = pd.Series(np.asarray(X, dtype=object).ravel())
+        exploded = values.where(values.notna(), "").astype(str).str.split(self.sep).explode()
+        mask = (exploded != "").to_numpy()
+        return exploded.index.to_numpy()[mask], exploded.to_numpy(dtype=object)[mask]
+
+    def fit(self, X, y=None):
+        rows, values = self._explode(X)
+        # Frequency is counted per row, so repeated values in one cell count once
+        pairs = pd.DataFrame({'row': rows, 'value': values}).drop_duplicates()
+        counts = pairs['value'].value_counts()
+        counts = counts[counts >= self.min_frequency]
+        if self.max_categories is not None:
+            counts = counts.head(self.max_categories)
+        self.categories_ = np.array(sorted(counts.index), dtype=object)
+        return self
+
+    def get_feature_names_out(self, input_features=None):
+        names = list(self.categories_) + ([self.OTHER] if self.other else [])
+        return np.array([f"{self.prefix}_{name}" if self.prefix else name for name in names], dtype=object)
+
+    def transform(self, X):
+        """Return a CSR matrix of uint8 flags, one row per input cell."""
+        from scipy import sparse
+
+        n_rows = len(np.asarray(X, dtype=object).ravel())
+        rows, values = self._explode(X)
+        codes = pd.Categorical(values, categories=self.categories_).codes.astype(np.int64)
+        n_known = len(self.categories_)
+        if self.other:
+            codes[codes < 0] = n_known
+        else:
+            rows, codes = rows[codes >= 0], codes[codes >= 0]
+        n_cols = n_known + (1 if self.other else 0)
+        pairs = np.unique(rows.astype(np.int64) * max(n_cols, 1) + codes)
+        return sparse.csr_matrix(
+            (np.ones(len(pairs), dtype=np.uint8), (pairs // max(n_cols, 1), pairs % max(n_cols, 1))),
+            shape=(n_rows, n_cols),
+        )
+
+    def transform_dense(self, X, index=None):
+        """Transform to a dense uint8 DataFrame for consumers that need one."""
+        return to_dense_frame(self.transform(X), self.get_feature_names_out(), index=index)
+
+
+def to_dense_frame(matrix, columns, index=None):
+    """Densify a multi-hot CSR matrix into a uint8 DataFrame."""
+    return pd.DataFrame(matrix.toarray().astype(np.uint8, copy=False), columns=list(columns), index=index)
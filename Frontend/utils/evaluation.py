@@ -0,0 +1,126 @@
+"""Single-pass evaluation of a binary classifier on the train/val/test splits.
+
+Page 9 called ``predict`` and then ``predict_proba`` on the same matrix (two
+full traversals of every tree) and computed each metric with its own sklearn
+call, split after split. Here each split is scored once with
+``predict_proba``; labels are derived from the probabilities at a
+configurable threshold, and accuracy, precision, recall, F1, ROC AUC and the
+classification report all come from one descending sort of the scores. The
+splits are scored concurrently in threads (the tree predictors release the
+GIL), and each result carries its own timings.
+"""
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+
+def _ratio(numerator, denominator):
+    # sklearn's zero_division=0 behaviour, without the warning
+    return float(numerator) / denominator if denominator else 0.0
+
+
+def _class_row(tp, fp, fn, support):
+    precision = _ratio(tp, tp + fp)
+    recall = _ratio(tp, tp + fn)
+    return {
+        'precision': precision,
+        'recall': recall,
+        'f1-score': _ratio(2 * tp, 2 * tp + fp + fn),
+        'support': int(support),
+    }
+
+
+def binary_metrics(y_true, proba, threshold=0.5, positive=1):
+    """All binary metrics from one sort of the scores.
+
+    A sample is predicted positive when its probability exceeds
+    ``threshold`` (``XGBClassifier.predict`` uses ``> 0.5``). ``report``
+    has the layout of ``classification_report(..., output_dict=True)``.
+    """
+    y_true = np.asarray(y_true)
+    proba = np.asarray(proba, dtype=np.float64)
+    is_positive = y_true == positive
+    labels = np.unique(y_true)
+    negative = next((label for label in labels if label != positive), 1 - positive)
+
+    order = np.argsort(-proba, kind='mergesort')
+    scores = proba[order]
+    tp_cum = np.cumsum(is_positive[order])
+    fp_cum = np.arange(1, len(scores) + 1) - tp_cum
+    n_pos = int(tp_cum[-1]) if len(scores) else 0
+    n_neg = len(scores) - n_pos
+
+    # ROC: one point per distinct score, trapezoidal area (ties handled like sklearn)
+    last_of_run = np.r_[np.flatnonzero(np.diff(scores)), len(scores) - 1] if len(scores) else np.array([], dtype=int)
+    tpr = np.r_[0, tp_cum[last_of_run]] / n_pos if n_pos else None
+    fpr = np.r_[0, fp_cum[last_of_run]] / n_neg if n_neg else None
+    roc_auc = float(np.sum(np.diff(fpr) * (tpr[1:] + tpr[:-1]) / 2)) if n_pos and n_neg else float('nan')
+
+    # Confusion counts at the threshold: the first k sorted scores are > threshold
+    k = int(np.searchsorted(-scores, -threshold, side='left'))
+    tp = int(tp_cum[k - 1]) if k else 0
+    fp = int(fp_cum[k - 1]) if k else 0
+    fn, tn = n_pos - tp, n_neg - fp
+
+    positive_row = _class_row(tp, fp, fn, n_pos)
+    negative_row = _class_row(tn, fn, fp, n_neg)
+    total = n_pos + n_neg
+    accuracy = _ratio(tp + tn, total)
+    report = {str(negative): negative_row, str(positive): positive_row, 'accuracy': accuracy}
+    rows = (negative_row, positive_row)
+    report['macro avg'] = {
+        metric: sum(row[metric] for row in rows) / 2 for metric in ('precision', 'recall', 'f1-score')
+    }
+    report['macro avg']['support'] = total
+    report['weighted avg'] = {
+        metric: _ratio(sum(row[metric] * row['support'] for row in rows), total)
+        for metric in ('precision', 'recall', 'f1-score')
+    }
+    report['weighted avg']['support'] = total
+
+    return {
+        'accuracy': accuracy,
+        'precision': positive_row['precision'],
+        'recall': positive_row['recall'],
+        'f1': positive_row['f1-score'],
+        'roc_auc': roc_auc,
+        'report': report,
+        'confusion': {'tn': tn, 'fp': fp, 'fn': fn, 'tp': tp},
+        'roc': (fpr, tpr),
+    }
+
+
+def positive_proba(model, X):
+    """Probability of the positive class from a single ``predict_proba`` call."""
+    return np.asarray(model.predict_proba(X))[:, 1]
+
+
+def evaluate_split(model, X, y, threshold=0.5):
+    """Score one split once and compute every metric; adds ``proba``, ``predicted`` and ``seconds``."""
+    start = time.perf_counter()
+    proba = positive_proba(model, X)
+    predicted_at = time.perf_counter()
+    result = binary_metrics(y, proba, threshold)
+    done = time.perf_counter()
+    result['proba'] = proba
+    result['predicted'] = (proba > threshold).astype(np.int8)
+    result['threshold'] = threshold
+    result['seconds'] = {'predict': predicted_at - start, 'metrics': done - predicted_at, 'total': done - start}
+    return result
+
+
+def evaluate_splits(model, splits, threshold=0.5, workers=None):
+    """Evaluate ``{name: (X, y)}`` concurrently; returns ``{name: result}`` in input order."""
+    with ThreadPoolExecutor(max_workers=workers or max(len(splits), 1)) as pool:
+        futures = {name: pool.submit(evaluate_split, model, X, y, threshold) for name, (X, y) in splits.items()}
+        return {name: future.result() for name, future in futures.items()}
+
+
+def timing_table(results):
+    """Per-split timings (seconds) as rows for display."""
+    import pandas as pd
+
+    return pd.DataFrame({
+        name: {'rows': len(result['proba']), **result['seconds']} for name, result in results.items()
+    }).T
@@ -0,0 +1,146 @@
+"""Out-of-core aggregation of ``reported_events`` into per-trial features.
+
+The merge notebook loads the whole events file, merges it against the trial
+table and runs a Python-level ``groupby().agg`` to build ``subjects_affected``,
+``subjects_at_risk``, ``organ_system_*`` and ``event_type_*``. Here the pipe
+file is read in fixed-size chunks; each chunk is reduced to per-``nct_id``
+partial aggregates (optionally in a process pool) and folded into compact
+NumPy accumulators, so memory is bounded by the number of trials and the
+vocabulary size rather than by the file size.
+"""
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Numeric column -> reduction ('max' or 'sum'); mirrors ``aggregate_column`` in the notebook
+EVENT_NUMERIC_AGGS = {
+    'subjects_affected': 'max',
+    'subjects_at_risk': 'max',
+    'event_count': 'max',
+    'frequency_threshold': 'max',
+}
+
+# Multi-valued column -> prefix of its multi-hot flag columns
+EVENT_MULTI_HOT = {
+    'event_type': 'event_type',
+    'organ_system': 'organ_system',
+    'assessment': 'assessment_type',
+}
+
+
+def _partial_aggregate(chunk, key, numeric, multi_hot):
+    """Reduce one chunk to per-key numeric partials and unique (key, value) pairs."""
+    chunk = chunk[chunk[key].notna()]
+    codes, keys = pd.factorize(chunk[key])
+    partial = {'keys': np.asarray(keys, dtype=object), 'numeric': {}, 'pairs': {}}
+    for col, how in numeric.items():
+        values = pd.to_numeric(chunk[col], errors='coerce')
+        grouped = values.groupby(codes)
+        reduced = grouped.max() if how == 'max' else grouped.sum(min_count=1)
+        partial['numeric'][col] = reduced.reindex(range(len(keys))).to_numpy(dtype=np.float64)
+    for col in multi_hot:
+        values = chunk[col]
+        mask = values.notna().to_numpy()
+        value_codes, vocab = pd.factorize(values[mask])
+        width = max(len(vocab), 1)
+        # Deduplicate (key, value) pairs with one integer sort
+        pair_codes = np.unique(codes[mask].astype(np.int64) * width + value_codes)
+        partial['pairs'][col] = (pair_codes // width, np.asarray(vocab, dtype=object)[pair_codes % width])
+    return partial
+
+
+class EventAggregator:
+    """Accumulates chunk partials into per-key arrays."""
+
+    def __init__(self, numeric=None, multi_hot=None):
+        self.numeric = dict(EVENT_NUMERIC_AGGS if numeric is None else numeric)
+        self.multi_hot = dict(EVENT_MULTI_HOT if multi_hot is None else multi_hot)
+        self._index = {}
+        self._values = {col: np.full(0, np.nan) for col in self.numeric}
+        self._vocab = {col: {} for col in self.multi_hot}
+        self._flags = {col: np.zeros((0, 0), dtype=np.uint8) for col in self.multi_hot}
+
+    def _positions(self, keys):
+        index = self._index
+        positions = np.fromiter((index.setdefault(k, len(index)) for k in keys), dtype=np.int64, count=len(keys))
+        self._grow(len(index))
+        return positions
+
+    def _grow(self, n_keys):
+        for col, values in self._values.items():
+            if len(values) < n_keys:
+                grown = np.full(max(n_keys, 2 * len(values)), np.nan)
+                grown[:len(values)] = values
+                self._values[col] = grown
+        for col, flags in self._flags.items():
+            if flags.shape[0] < n_keys:
+                grown = np.zeros((max(n_keys, 2 * flags.shape[0]), flags.shape[1]), dtype=np.uint8)
+                grown[:flags.shape[0]] = flags
+                self._flags[col] = grown
+
+    def update(self, partial):
+        """Fold one chunk's partial aggregate into the accumulators."""
+        positions = self._positions(partial['keys'])
+        for col, how in self.numeric.items():
+            incoming = partial['numeric'][col]
+            current = self._values[col][positions]
+            if how == 'max':
+                merged = np.fmax(current, incoming)
+            else:
+                merged = np.where(np.isnan(current), incoming,
+                                  np.where(np.isnan(incoming), current, current + incoming))
+            self._values[col][positions] = merged
+        for col, (key_codes, values) in partial['pairs'].items():
+            vocab = self._vocab[col]
+            value_idx = np.fromiter((vocab.setdefault(v, len(vocab)) for v in values), dtype=np.int64, count=len(values))
+            flags = self._flags[col]
+            if flags.shape[1] < len(vocab):
+                grown = np.zeros((flags.shape[0], len(vocab)), dtype=np.uint8)
+                grown[:, :flags.shape[1]] = flags
+                self._flags[col] = flags = grown
+            flags[positions[key_codes], value_idx] = 1
+
+    def result(self, key='nct_id'):
+        """Return one row per key with numeric aggregates and uint8 multi-hot flags."""
+        n = len(self._index)
+        columns = {key: np.array(list(self._index), dtype=object)}
+        for col in self.numeric:
+            columns[col] = self._values[col][:n]
+        for col, prefix in self.multi_hot.items():
+            flags = self._flags[col]
+            for value, idx in sorted(self._vocab[col].items(), key=lambda item: str(item[0])):
+                columns[f"{prefix}_{value}"] = flags[:n, idx]
+        return pd.DataFrame(columns)
+
+
+def iter_chunks(path, columns, chunksize=200_000, sep='|'):
+    """Yield fixed-size DataFrame chunks of a pipe-delimited file, reading only ``columns``."""
+    yield from pd.read_csv(path, sep=sep, usecols=columns, chunksize=chunksize, low_memory=False)
+
+
+def aggregate_reported_events(path, key='nct_id', numeric=None, multi_hot=None,
+                              chunksize=200_000, workers=1):
+    """Stream ``reported_events`` and return one feature row per trial.
+
+    With ``workers > 1`` chunk reductions run in a process pool; at most
+    ``2 * workers`` chunks are in flight so memory stays bounded.
+    """
+    aggregator = EventAggregator(numeric, multi_hot)
+    columns = [key] + list(aggregator.numeric) + list(aggregator.multi_hot)
+    chunks = iter_chunks(path, columns, chunksize)
+
+    if workers <= 1:
+        for chunk in chunks:
+            aggregator.update(_partial_aggregate(chunk, key, aggregator.numeric, aggregator.multi_hot))
+        return aggregator.result(key)
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        pending = []
+        for chunk in chunks:
+            pending.append(pool.submit(_partial_aggregate, chunk, key, aggregator.numeric, aggregator.multi_hot))
+            if len(pending) >= 2 * workers:
+                aggregator.update(pending.pop(0).result())
+        for future in pending:
+            aggregator.update(future.result())
+    return aggregator.result(key)
@@ -0,0 +1,86 @@
+"""Process-wide single-flight loading of DataFrames shared by all sessions.
+
+Every Streamlit session used to load and convert its own copy of each
+dataset on every rerun. When several users opened a page at once, they all
+did the same work at the same time. Loads now go through one cache per
+process, keyed by the dataset's content fingerprint:
+
+- the first caller runs the load;
+- callers arriving while it runs wait on the same future;
+- everyone after that gets the same frame object.
+
+A failed load is not cached, so the next caller retries. When a dataset's
+content changes, the frame for the old version is dropped.
+
+The shared frames must be treated as read-only. A page that modifies a frame
+takes a ``.copy()`` first. ``metrics()`` reports loads, hits and waits.
+"""
+import threading
+import time
+from concurrent.futures import Future
+
+from utils.datasets import fingerprint
+from utils.projections import load_page_table
+
+_futures = {}  # key -> Future of the loaded value
+_lock = threading.Lock()
+_stats = {'loads': 0, 'hits': 0, 'waits': 0, 'wait_seconds': 0.0, 'load_seconds': 0.0, 'failures': 0}
+
+
+def shared(key, load):
+    """Return ``load()`` for ``key``, running it at most once across threads.
+
+    ``key`` is a tuple whose last element is the content version. Entries
+    with the same leading elements but another version are dropped when the
+    new version is loaded.
+    """
+    with _lock:
+        future = _futures.get(key)
+        owner = future is None
+        if owner:
+            future = _futures[key] = Future()
+            for stale in [k for k in _futures if k[:-1] == key[:-1] and k != key]:
+                del _futures[stale]
+        elif future.done():
+            _stats['hits'] += 1
+            return future.result()
+
+    if not owner:
+        start = time.perf_counter()
+        try:
+            return future.result()
+        finally:
+            with _lock:
+                _stats['waits'] += 1
+                _stats['wait_seconds'] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    try:
+        value = load()
+    except BaseException as exc:
+        with _lock:
+            _futures.pop(key, None)
+            _stats['failures'] += 1
+        future.set_exception(exc)
+        raise
+    with _lock:
+        _stats['loads'] += 1
+        _stats['load_seconds'] += time.perf_counter() - start
+    future.set_result(value)
+    return value
+
+
+def shared_page_table(page, name):
+    """``load_page_table(page, name)``, loaded once per process and shared read-only."""
+    return shared(('page_table', page, name, fingerprint(name)), lambda: load_page_table(page, name))
+
+
+def metrics():
+    """Counters since start-up plus the number of cached entries."""
+    with _lock:
+        return {**_stats, 'entries': sum(1 for f in _futures.values() if f.done())}
+
+
+def clear():
+    with _lock:
+        _futures.clear()
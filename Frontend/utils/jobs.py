@@ -0,0 +1,158 @@
+"""Process-wide background job queue for long-running page work.
+
+Page 9 used to run the whole load/scale/predict cycle inside the Streamlit
+script thread. The page froze until it finished, and every session
+evaluating at once ran its own copy. Jobs now run on one bounded worker pool
+shared by all sessions, so total work is capped under concurrency.
+
+Jobs are keyed: submitting a key that is already queued or running returns
+the existing job instead of starting another. A job function receives its
+``Job``, reports progress through ``job.report`` and calls
+``job.check_cancelled()`` between steps. The page polls ``job.progress`` and
+``job.log`` and reads ``job.result`` once the job is done.
+
+Several sessions can wait on the same job. ``cancel`` only stops it when no
+other session is still waiting for it.
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+WORKERS_ENV = "CLINICAL_TRIALS_JOB_WORKERS"
+DEFAULT_WORKERS = 2
+# Finished jobs kept so that sessions can still pick up their results
+KEEP_FINISHED = 32
+
+QUEUED, RUNNING, DONE, FAILED, CANCELLED = 'queued', 'running', 'done', 'failed', 'cancelled'
+
+
+class JobCancelled(Exception):
+    pass
+
+
+class Job:
+    """State of one background job; read it from any thread."""
+
+    def __init__(self, key, description=""):
+        self.key = key
+        self.description = description
+        self.state = QUEUED
+        self.progress = 0.0
+        self.message = "Queued"
+        self.log = []  # (kind, message) in order, kind is 'info' or 'success'
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.finished_at = None
+        self.subscribers = 1
+        self._cancel = threading.Event()
+        self._future = None
+
+    @property
+    def finished(self):
+        return self.state in (DONE, FAILED, CANCELLED)
+
+    @property
+    def cancel_requested(self):
+        return self._cancel.is_set()
+
+    def report(self, progress, message, kind='info'):
+        """Record progress (0-1) and append ``message`` to the log."""
+        self.progress = min(max(float(progress), 0.0), 1.0)
+        self.message = message
+        self.log.append((kind, message))
+
+    def check_cancelled(self):
+        """Raise ``JobCancelled`` if cancellation was requested; call between steps."""
+        if self._cancel.is_set():
+            raise JobCancelled(self.key)
+
+
+class JobQueue:
+    """Bounded worker pool running keyed jobs; identical in-flight jobs are shared."""
+
+    def __init__(self, max_workers):
+        self.max_workers = max_workers
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="job")
+        self._jobs = OrderedDict()  # key -> Job
+        self._lock = threading.Lock()
+
+    def submit(self, key, fn, *args, description="", **kwargs):
+        """Run ``fn(job, *args, **kwargs)`` in the pool unless ``key`` is already queued or running.
+
+        Returns the ``Job``, either new or shared with the callers that
+        submitted the same key.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and not job.finished:
+                job.subscribers += 1
+                return job
+            job = Job(key, description)
+            self._jobs[key] = job
+            self._jobs.move_to_end(key)
+            self._prune()
+            job._future = self._pool.submit(self._run, job, fn, args, kwargs)
+            return job
+
+    def _run(self, job, fn, args, kwargs):
+        if job.cancel_requested:
+            self._finish(job, CANCELLED)
+            return
+        job.state = RUNNING
+        job.message = "Running"
+        try:
+            job.result = fn(job, *args, **kwargs)
+        except JobCancelled:
+            self._finish(job, CANCELLED)
+        except Exception as exc:
+            job.error = exc
+            self._finish(job, FAILED)
+        else:
+            job.progress = 1.0
+            self._finish(job, DONE)
+
+    def _finish(self, job, state):
+        job.state = state
+        job.message = {DONE: "Done", FAILED: f"Failed: {job.error}", CANCELLED: "Cancelled"}[state]
+        job.finished_at = time.time()
+
+    def _prune(self):
+        finished = [key for key, job in self._jobs.items() if job.finished]
+        for key in finished[:max(len(finished) - KEEP_FINISHED, 0)]:
+            del self._jobs[key]
+
+    def get(self, key):
+        with self._lock:
+            return self._jobs.get(key)
+
+    def cancel(self, key):
+        """Withdraw one caller's interest; the job stops once nobody else waits for it.
+
+        Returns True if cancellation of the job was requested.
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is None or job.finished:
+                return False
+            job.subscribers -= 1
+            if job.subscribers > 0:
+                return False
+            job._cancel.set()
+            if job._future.cancel():
+                self._finish(job, CANCELLED)
+            return True
+
+    def active(self):
+        """Jobs queued or running, oldest first."""
+        with self._lock:
+            return [job for job in self._jobs.values() if not job.finished]
+
+
+def _workers():
+    return max(int(os.environ.get(WORKERS_ENV, DEFAULT_WORKERS)), 1)
+
+
+JOBS = JobQueue(_workers())
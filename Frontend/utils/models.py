@@ -0,0 +1,134 @@
+"""Process-wide registry of deserialised models and scalers.
+
+Page 9 used to write every uploaded model to a fixed ``temp_xgb_model.pkl``
+(shared, and overwritten, by all concurrent sessions) and to unpickle the
+model and ``scaler.pkl`` again for every split on every click. Here objects
+are keyed by the SHA-256 of their pickled bytes and unpickled once per
+process. Concurrent sessions asking for the same key wait for a single load;
+least-recently-used entries are evicted once the cache exceeds its memory
+cap. Only load pickles from trusted sources.
+"""
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+
+from utils.datasets import fetch, file_sha256, fingerprint
+
+MODEL_CACHE_MB_ENV = "CLINICAL_TRIALS_MODEL_CACHE_MB"
+DEFAULT_MODEL_CACHE_MB = 512
+
+
+def sha256_bytes(data):
+    return hashlib.sha256(data).hexdigest()
+
+
+class ModelRegistry:
+    """Thread-safe LRU cache of unpickled objects keyed by content hash.
+
+    The size of an entry is estimated by the length of its pickle, which is
+    the dominant term for tree ensembles and scalers.
+    """
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # sha256 -> (object, size)
+        self._total = 0
+        self._lock = threading.Lock()
+        self._key_locks = {}
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        with self._lock:
+            return len(self._entries)
+
+    @property
+    def total_bytes(self):
+        return self._total
+
+    def _lookup(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry[0]
+            return None
+
+    def _insert(self, key, obj, size):
+        with self._lock:
+            if key in self._entries:
+                return self._entries[key][0]
+            self._entries[key] = (obj, size)
+            self._total += size
+            # Never evict the entry just added, even if it alone exceeds the cap
+            while self._total > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._total -= evicted_size
+            return obj
+
+    def get_or_load(self, key, load, size):
+        """Return the object for ``key``, calling ``load()`` at most once across threads.
+
+        ``size`` is a byte count, or a callable taking the loaded object.
+        """
+        obj = self._lookup(key)
+        if obj is not None:
+            return obj
+        with self._lock:
+            key_lock = self._key_locks.setdefault(key, threading.Lock())
+        with key_lock:
+            obj = self._lookup(key)
+            if obj is None:
+                obj = load()
+                obj = self._insert(key, obj, size(obj) if callable(size) else size)
+        with self._lock:
+            self._key_locks.pop(key, None)
+        return obj
+
+    def load_bytes(self, data):
+        """Unpickle ``data`` (e.g. an uploaded file's bytes); returns ``(sha256, object)``."""
+        key = sha256_bytes(data)
+        return key, self.get_or_load(key, lambda: pickle.loads(data), len(data))
+
+    def load_path(self, path, sha256=None):
+        """Unpickle the file at ``path``; returns ``(sha256, object)``."""
+        key = sha256 or file_sha256(path)
+
+        def load():
+            with open(path, 'rb') as f:
+                return pickle.load(f)
+
+        return key, self.get_or_load(key, load, os.path.getsize(path))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total = 0
+
+
+def _max_bytes():
+    return int(float(os.environ.get(MODEL_CACHE_MB_ENV, DEFAULT_MODEL_CACHE_MB)) * (1 << 20))
+
+
+MODELS = ModelRegistry(_max_bytes())
+
+
+def load_model(data):
+    """Deserialise uploaded model bytes through the shared registry; returns ``(sha256, model)``."""
+    return MODELS.load_bytes(data)
+
+
+def load_scaler(name="scaler.pkl"):
+    """The fitted scaler from the dataset cache, unpickled once per process."""
+    return MODELS.load_path(fetch(name), sha256=fingerprint(name))[1]
+
+
+def compiled_model(key, model):
+    """Array-based predictor for ``model`` (see ``utils.tree_predictor``), compiled once per model hash."""
+    from utils.tree_predictor import compile_model
+
+    return MODELS.get_or_load(f"{key}:compiled", lambda: compile_model(model), lambda c: c.nbytes)
@@ -0,0 +1,62 @@
+"""Page sequence and the shared Previous/Next navigation.
+
+Pages used to carry their own copy of the page list and navigate with
+``os.system("streamlit run ...")``, which blocked the script thread and
+started a second Streamlit server per click. ``sidebar_navigation`` switches
+pages inside the running app with ``st.switch_page``, so the session state
+and the ``st.cache_*`` caches carry over.
+"""
+import os
+
+MAIN_PAGE = "Main_page.py"
+
+# (file under pages/, sidebar label) in workflow order
+PAGES = [
+    ("1_Clinical Trials Data Explorer.py", "📊 Clinical Trials Data Explorer"),
+    ("2_Pivot Handling.py", "🔍 Exploratory Data Analysis"),
+    ("3_Adverse Event Clustering.py", "🤖 Adverse Event Clustering"),
+    ("4_Missing Value Analysis.py", "📉 Missing Value Analysis"),
+    ("5_Outlier Detection & Skewness Correction.py", "⚡ Outlier Detection & Skewness Correction"),
+    ("7_Feature Engineering Pipeline.py", "🔬 Feature Engineering Pipeline"),
+    ("8_Healthcare Data Feature Reduction Journey.py", "📈 Healthcare Data Feature Reduction Journey"),
+    ("9_ML Models Showcase.py", "🚀 ML Models Showcase"),
+]
+
+
+def page_path(filename):
+    """Path of a page relative to the main script, as ``st.switch_page`` expects."""
+    return f"pages/{filename}"
+
+
+def page_title(filename):
+    """Human title of a page file, e.g. ``"2_Pivot Handling.py"`` -> ``"Pivot Handling"``."""
+    return os.path.splitext(filename)[0].split('_', 1)[1]
+
+
+def page_index(current_file):
+    """Position of ``current_file`` (typically ``__file__``) in ``PAGES``, or None."""
+    name = os.path.basename(current_file)
+    return next((i for i, (page, _) in enumerate(PAGES) if page == name), None)
+
+
+def sidebar_navigation(current_file):
+    """Render the sidebar Home/Previous/Next controls for the page ``current_file``."""
+    import streamlit as st
+
+    st.sidebar.title("🔄 Navigate")
+    st.sidebar.page_link(MAIN_PAGE, label="🏠 Home")
+
+    index = page_index(current_file)
+    if index is None:
+        return
+    col1, col2 = st.sidebar.columns(2)
+
+    if index > 0:
+        with col1:
+            if st.button("⬅ Previous", key="nav_previous", help=PAGES[index - 1][1]):
+                st.switch_page(page_path(PAGES[index - 1][0]))
+
+    if index < len(PAGES) - 1:
+        with col2:
+            if st.button("Next ➡", key="nav_next", help=PAGES[index + 1][1]):
+                st.switch_page(page_path(PAGES[index + 1][0]))
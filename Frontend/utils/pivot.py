@@ -0,0 +1,89 @@
+"""Aggregate-before-join pivot cubes for the Pivot Handling page.
+
+The page used to inner-join the whole facilities table against the trial
+table and then run ``pd.pivot_table(..., aggfunc='size')`` on the joined
+frame, which materialises one row per (facility, trial-row) pair. Here the
+large table is first reduced to counts per ``(nct_id, dimension value)``;
+only those counts are joined against the small per-trial status table and
+summed into a ``dimension x Study Status`` cube. The result is identical to
+the old pivot. Every cube is built once per dataset version in the
+process-wide cache of ``utils.frames``, so switching dimension on the page
+is a lookup and sessions asking for the same cube at once wait for one
+build.
+"""
+
+from utils.columnar import load_table
+from utils.datasets import fingerprint
+from utils.frames import shared
+from utils.projections import load_page_table
+
+STATUS_DATASET = "usecase3_updated_pivot.csv"
+STATUS_KEY = 'NCT Number'
+STATUS_COLUMN = 'Study Status'
+
+# Page label -> (dataset, trial key, dimension column)
+PIVOT_DIMENSIONS = {
+    'country': ("facilities_drop.txt", 'nct_id', 'country'),
+    'state': ("facilities_drop.txt", 'nct_id', 'state'),
+    'facility status': ("facilities_drop.txt", 'nct_id', 'status'),
+    'withdrawal period': ("drop_withdrawals_drop.txt", 'nct_id', 'period'),
+    'withdrawal reason': ("drop_withdrawals_drop.txt", 'nct_id', 'reason'),
+}
+
+
+def count_pairs(df, key, column):
+    """Number of rows per (key, value), nulls included; ``build_cube`` drops them as ``pivot_table`` does."""
+    return df.groupby([key, column], observed=True, sort=False, dropna=False).size().rename('n').reset_index()
+
+
+def join_counts(pair_counts, status, key):
+    """Join per-trial pair counts to the status table.
+
+    Summing ``n`` over the result gives the row count of the full join: a
+    trial listed k times in ``status`` contributes k times.
+    """
+    return pair_counts.merge(status, how='inner', left_on=key, right_on=STATUS_KEY)
+
+
+def build_cube(joined, column):
+    """Pivot joined counts to ``column x status``; rows missing either value are dropped."""
+    cube = joined.groupby([column, STATUS_COLUMN], observed=True)['n'].sum().unstack(fill_value=0)
+    cube.columns.name = STATUS_COLUMN
+    return cube
+
+
+def with_cumulative(cube):
+    """Add ``total``, ``overall_cumulative`` and ``overall_cumulative_percentage``, largest first."""
+    cube = cube.copy()
+    cube['total'] = cube.sum(axis=1)
+    cube = cube.sort_values(by='total', ascending=False)
+    cube['overall_cumulative'] = cube['total'].cumsum()
+    cube['overall_cumulative_percentage'] = cube['overall_cumulative'] / cube['total'].sum() * 100
+    return cube
+
+
+def pivot_cube(dimension):
+    """Return ``(cube, joined_rows)`` for ``dimension``, cached.
+
+    ``cube`` is the ``dimension x Study Status`` cube with cumulative
+    columns. ``joined_rows`` is the number of rows in the full join, including
+    rows whose dimension value or status is missing, which the cube leaves
+    out.
+
+    Cubes are versioned by the fingerprints of both datasets: a new upload is
+    picked up without serving a stale cube, and the cube of the old version
+    is dropped.
+    """
+    try:
+        name, key, column = PIVOT_DIMENSIONS[dimension]
+    except KeyError:
+        raise KeyError(f"Unknown pivot dimension: {dimension}") from None
+
+    def build():
+        # Only the trial key and the dimension column are read from the large table
+        pair_counts = count_pairs(load_table(name, columns=[key, column]), key, column)
+        status = load_page_table("pivot_handling", STATUS_DATASET)
+        joined = join_counts(pair_counts, status, key)
+        return with_cumulative(build_cube(joined, column)), int(joined['n'].sum())
+
+    return shared(('pivot_cube', dimension, (fingerprint(name), fingerprint(STATUS_DATASET))), build)
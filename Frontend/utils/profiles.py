@@ -0,0 +1,171 @@
+"""Precomputed column profiles for the Explorer.
+
+Every Explorer rerun used to recompute several statistics over the full
+frame: ``df.describe()``, ``value_counts().head(10)`` for the selected
+column, ``nunique()`` for each categorical column and
+``memory_usage(deep=True)``. They only change when the dataset does.
+
+A profile holds, per column:
+
+- the compact dtype;
+- deep memory usage;
+- non-null and distinct counts;
+- ``describe()`` statistics for numeric columns;
+- the top values with their counts.
+
+A profile is computed once per dataset version. Columns are profiled in
+parallel processes, each reading only its own column from the memory-mapped
+columnar file and compacting it as the Explorer does. The result is stored
+as JSON next to the columnar file. The page reads its summaries, dtype pie
+and top-10 bars from the profile.
+"""
+import json
+import multiprocessing
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import pandas as pd
+
+from utils.columnar import load_table, materialise
+from utils.datasets import cache_dir, fingerprint
+from utils.dtypes import infer_compact_dtype
+
+# Bump when the profile contents change so old files are not reused.
+PROFILE_VERSION = 2
+TOP_K = 10
+
+
+def profile_path(name):
+    """Location of a dataset's profile, next to its columnar copy."""
+    return os.path.join(cache_dir(), "columnar", f"{fingerprint(name)}.profile.v{PROFILE_VERSION}.json")
+
+
+def is_numeric(dtype):
+    # DataFrame.describe() leaves booleans out of the numeric summary
+    return pd.api.types.is_numeric_dtype(dtype) and not pd.api.types.is_bool_dtype(dtype)
+
+
+def profile_series(series, top_k=TOP_K):
+    """Statistics of one (already compacted) column."""
+    numeric = is_numeric(series.dtype)
+    top = series.value_counts().head(top_k)
+    return {
+        'name': series.name,
+        'dtype': str(series.dtype),
+        'memory_bytes': int(series.memory_usage(deep=True, index=False)),
+        'count': int(series.count()),
+        'nunique': int(series.nunique()),
+        'numeric': numeric,
+        'describe': {stat: float(value) for stat, value in series.describe().items()} if numeric else None,
+        'top': [[str(value), int(count)] for value, count in top.items()],
+    }
+
+
+def _profile_column(name, column, top_k):
+    series = load_table(name, [column])[column]
+    dtype = infer_compact_dtype(series)
+    if dtype is not None:
+        series = series.astype(dtype)
+    return profile_series(series, top_k)
+
+
+def build_profile(name, workers=None, top_k=TOP_K):
+    """Profile every column of a dataset in parallel and store the result; returns the profile."""
+    import pyarrow.feather as feather
+
+    start = time.perf_counter()
+    columnar = materialise(name)
+    schema = feather.read_table(columnar, memory_map=True).schema
+    columns, rows = schema.names, feather.read_table(columnar, columns=[], memory_map=True).num_rows
+    workers = workers or min(os.cpu_count() or 1, len(columns), 8)
+    if workers <= 1:
+        profiles = [_profile_column(name, column, top_k) for column in columns]
+    else:
+        # Spawned workers: forking the multi-threaded app server is not safe
+        with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+            profiles = list(pool.map(_profile_column, [name] * len(columns), columns, [top_k] * len(columns)))
+
+    profile = {
+        'dataset': name,
+        'sha256': fingerprint(name),
+        'version': PROFILE_VERSION,
+        'rows': rows,
+        'index_bytes': int(pd.RangeIndex(rows).memory_usage(deep=True)),
+        'columns': profiles,
+        'seconds': time.perf_counter() - start,
+    }
+    path = profile_path(name)
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(profile, f)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+    return profile
+
+
+def load_profile(name, workers=None):
+    """Return the stored profile of a dataset, building it on first use (once per process)."""
+    from utils.frames import shared
+
+    def load():
+        try:
+            with open(profile_path(name), encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return build_profile(name, workers)
+
+    return shared(('profile', name, fingerprint(name)), load)
+
+
+def _by_name(profile, columns):
+    index = {col['name']: col for col in profile['columns']}
+    return [index[col] for col in columns if col in index]
+
+
+def describe_table(profile, columns):
+    """``df[columns].describe()`` from the profile."""
+    stats = {col['name']: col['describe'] for col in _by_name(profile, columns) if col['numeric']}
+    return pd.DataFrame(stats)
+
+
+def dtype_counts(profile, columns):
+    """``df[columns].dtypes.astype(str).value_counts()`` from the profile."""
+    return pd.Series([col['dtype'] for col in _by_name(profile, columns)]).value_counts()
+
+
+def memory_bytes(profile, columns):
+    """``df[columns].memory_usage(deep=True).sum()`` from the profile."""
+    return profile['index_bytes'] + sum(col['memory_bytes'] for col in _by_name(profile, columns))
+
+
+def distinct_counts(profile, columns, categorical_only=True):
+    """Distinct values per column; by default only for text and categorical columns."""
+    text_kinds = ('object', 'category', 'str', 'string')
+    return {
+        col['name']: col['nunique'] for col in _by_name(profile, columns)
+        if not categorical_only or col['dtype'].startswith(text_kinds)
+    }
+
+
+def top_values(profile, column):
+    """``df[column].value_counts().head(TOP_K)`` from the profile."""
+    (col,) = _by_name(profile, [column])
+    return pd.Series({value: count for value, count in col['top']}, name='count', dtype='int64')
+
+
+def column_profile(profile, column):
+    (col,) = _by_name(profile, [column])
+    return col
+
+
+if __name__ == "__main__":
+    import sys
+
+    for dataset in sys.argv[1:]:
+        result = build_profile(dataset)
+        print(f"{dataset}: {len(result['columns'])} columns, {result['rows']:,} rows in {result['seconds']:.1f} s")
@@ -0,0 +1,54 @@
+"""Per-page column manifest.
+
+Each page declares the columns it reads from every dataset it loads. The
+projection is pushed down into the columnar reader, so a page that only needs
+``nct_id`` and ``country`` never touches the other columns of a 281+ column
+table. ``None`` means the page genuinely needs every column.
+"""
+from utils.columnar import load_table
+
+OUTLIER_COLUMNS = [
+    'Enrollment', 'subjects_at_risk', 'subjects_affected', 'duration',
+    'minimum_age', 'child', 'maximum_age', 'older_adult', 'adult',
+]
+
+PAGE_COLUMNS = {
+    "explorer": {
+        # The explorer lets the user browse and drop any column
+        "usecase3_updated.csv": None,
+        "drop_withdrawals_drop.txt": None,
+        "facilities_drop.txt": None,
+        "reported_events_drop.txt": None,
+        "eligibilities_drop.txt": None,
+    },
+    "pivot_handling": {
+        # Facilities and withdrawals are projected per dimension in utils.pivot
+        "usecase3_updated_pivot.csv": ['NCT Number', 'Study Status'],
+    },
+    "missing_values": {
+        # Missing-value percentages are reported for every column
+        "final_result5.xlsx": None,
+    },
+    "outlier_detection": {
+        "null_values_dealt.csv": OUTLIER_COLUMNS,
+    },
+    "ml_showcase": {
+        # The reduced sets hold exactly the model features plus the target
+        "train_data_reduced.csv": None,
+        "val_data_reduced.csv": None,
+        "test_data_reduced.csv": None,
+    },
+}
+
+
+def page_columns(page, name):
+    """Return the columns ``page`` reads from dataset ``name`` (None for all)."""
+    try:
+        return PAGE_COLUMNS[page][name]
+    except KeyError:
+        raise KeyError(f"Dataset {name} is not declared for page {page}") from None
+
+
+def load_page_table(page, name):
+    """Load a dataset with the projection declared for ``page``."""
+    return load_table(name, columns=page_columns(page, name))
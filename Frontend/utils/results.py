@@ -0,0 +1,178 @@
+"""Persistent store of evaluation results.
+
+Every evaluation on page 9 used to recompute predictions and metrics, and
+the results lived only in one session's ``st.session_state``. Results are
+now stored next to the dataset cache, keyed by (model hash, dataset hash,
+threshold): metrics in a SQLite table, per-row probabilities and labels in an
+Arrow file. A repeat evaluation of the same model on the same data returns
+from the store across sessions and restarts.
+
+Entries not read for ``CLINICAL_TRIALS_RESULTS_MAX_AGE_DAYS`` days are
+dropped, and least-recently-read entries are evicted once the prediction
+files exceed ``CLINICAL_TRIALS_RESULTS_MAX_MB``.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import tempfile
+import time
+from contextlib import contextmanager
+
+import numpy as np
+
+from utils.datasets import cache_dir, fingerprint
+
+MAX_MB_ENV = "CLINICAL_TRIALS_RESULTS_MAX_MB"
+MAX_AGE_ENV = "CLINICAL_TRIALS_RESULTS_MAX_AGE_DAYS"
+DEFAULT_MAX_MB = 512
+DEFAULT_MAX_AGE_DAYS = 30
+
+# Per-row arrays kept in the prediction file rather than in SQLite
+ARRAY_FIELDS = ('proba', 'predicted', 'label')
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS results (
+    model_hash TEXT NOT NULL,
+    dataset_hash TEXT NOT NULL,
+    threshold REAL NOT NULL,
+    metrics TEXT NOT NULL,
+    predictions_path TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL,
+    PRIMARY KEY (model_hash, dataset_hash, threshold)
+)
+"""
+
+
+def results_dir():
+    path = os.path.join(cache_dir(), "results")
+    os.makedirs(os.path.join(path, "predictions"), exist_ok=True)
+    return path
+
+
+@contextmanager
+def _connect():
+    """A short-lived connection; commits on success and is always closed."""
+    conn = sqlite3.connect(os.path.join(results_dir(), "results.sqlite"), timeout=30)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(_SCHEMA)
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+
+def _threshold_key(threshold):
+    return round(float(threshold), 6)
+
+
+def dataset_hash(*names):
+    """Hash identifying the inputs of an evaluation, e.g. a split plus ``scaler.pkl``."""
+    digest = hashlib.sha256()
+    for name in names:
+        digest.update(f"{name}:{fingerprint(name)};".encode())
+    return digest.hexdigest()
+
+
+def _predictions_path(model_hash, data_hash, threshold):
+    key = hashlib.sha256(f"{model_hash}:{data_hash}:{_threshold_key(threshold)}".encode()).hexdigest()
+    return os.path.join(results_dir(), "predictions", f"{key}.arrow")
+
+
+def _to_json(value):
+    if isinstance(value, dict):
+        return {str(k): _to_json(v) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_json(v) for v in value]
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    return value
+
+
+def get(model_hash, data_hash, threshold):
+    """Stored result for the key (metrics plus per-row arrays), or None."""
+    threshold = _threshold_key(threshold)
+    with _connect() as conn:
+        row = conn.execute(
+            "SELECT metrics, predictions_path FROM results WHERE model_hash=? AND dataset_hash=? AND threshold=?",
+            (model_hash, data_hash, threshold),
+        ).fetchone()
+        if row is None:
+            return None
+        if not os.path.exists(row[1]):
+            conn.execute("DELETE FROM results WHERE model_hash=? AND dataset_hash=? AND threshold=?",
+                         (model_hash, data_hash, threshold))
+            return None
+        conn.execute("UPDATE results SET accessed_at=? WHERE model_hash=? AND dataset_hash=? AND threshold=?",
+                     (time.time(), model_hash, data_hash, threshold))
+
+    from pyarrow import feather
+
+    result = json.loads(row[0])
+    if result.get('roc') is not None:
+        result['roc'] = tuple(np.asarray(a, dtype=np.float64) if a is not None else None for a in result['roc'])
+    table = feather.read_table(row[1], memory_map=True)
+    for field in table.column_names:
+        result[field] = table.column(field).to_numpy()
+    return result
+
+
+def put(model_hash, data_hash, threshold, result):
+    """Store ``result`` (as returned by ``evaluate_split``, optionally with ``label``), then evict."""
+    import pyarrow as pa
+    from pyarrow import feather
+
+    threshold = _threshold_key(threshold)
+    path = _predictions_path(model_hash, data_hash, threshold)
+    arrays = {field: np.asarray(result[field]) for field in ARRAY_FIELDS if result.get(field) is not None}
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".part")
+    os.close(fd)
+    try:
+        feather.write_feather(pa.table(arrays), tmp_path, compression="uncompressed")
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    metrics = _to_json({k: v for k, v in result.items() if k not in ARRAY_FIELDS})
+    now = time.time()
+    with _connect() as conn:
+        conn.execute(
+            "INSERT OR REPLACE INTO results VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (model_hash, data_hash, threshold, json.dumps(metrics), path, os.path.getsize(path), now, now),
+        )
+    evict()
+
+
+def evict(max_age_days=None, max_bytes=None):
+    """Drop entries unread for ``max_age_days``, then least-recently-read ones above ``max_bytes``."""
+    if max_age_days is None:
+        max_age_days = float(os.environ.get(MAX_AGE_ENV, DEFAULT_MAX_AGE_DAYS))
+    if max_bytes is None:
+        max_bytes = float(os.environ.get(MAX_MB_ENV, DEFAULT_MAX_MB)) * (1 << 20)
+    removed = []
+    with _connect() as conn:
+        rows = conn.execute(
+            "SELECT model_hash, dataset_hash, threshold, predictions_path, size, accessed_at "
+            "FROM results ORDER BY accessed_at DESC"
+        ).fetchall()
+        cutoff = time.time() - max_age_days * 86400
+        total = 0
+        for model_hash, data_hash, threshold, path, size, accessed_at in rows:
+            if accessed_at >= cutoff and total + size <= max_bytes:
+                total += size
+            else:
+                conn.execute("DELETE FROM results WHERE model_hash=? AND dataset_hash=? AND threshold=?",
+                             (model_hash, data_hash, threshold))
+                removed.append(path)
+    for path in removed:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+    return len(removed)
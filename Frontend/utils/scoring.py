@@ -0,0 +1,186 @@
+"""Headless batch scoring of reduced-feature files.
+
+Scores an arbitrarily large CSV or Parquet file with a pickled XGBoost model
+and the fitted ``scaler.pkl``, without Streamlit and without holding the file
+in memory. The input is read in fixed-size chunks; chunks are scored in a
+process pool (each worker unpickles the model and scaler once) with a bounded
+number in flight, and predictions are appended to the output as they come
+back, in input order.
+
+    python -m utils.scoring model.pkl scaler.pkl trials.parquet predictions.csv \\
+        --chunksize 100000 --workers 4 --threshold 0.5 --id-column nct_id
+
+Missing and infinite feature values are filled with the training means
+stored in the scaler (``mean_``), so a chunk is scored exactly as it would be
+in a full-file run. This differs from the ML Models Showcase page, which
+fills each evaluation split with that split's own column means
+(``X.fillna(X.mean())``). Rows without missing values score identically;
+rows with missing values can score differently.
+"""
+import argparse
+import os
+import pickle
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+LABEL_COLUMN = 'Study Status'
+
+_worker = {}
+
+
+def iter_input_chunks(path, chunksize):
+    """Yield DataFrame chunks of a CSV or Parquet file."""
+    if path.endswith('.parquet'):
+        import pyarrow.parquet as pq
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunksize):
+            yield batch.to_pandas()
+    elif path.endswith('.csv'):
+        yield from pd.read_csv(path, chunksize=chunksize, low_memory=False)
+    else:
+        raise ValueError(f"Unsupported input format: {path}")
+
+
+def feature_columns(scaler, columns, id_column=None):
+    """Columns fed to the scaler: its ``feature_names_in_`` when known, else all but id/label."""
+    names = getattr(scaler, 'feature_names_in_', None)
+    if names is not None:
+        return list(names)
+    return [col for col in columns if col not in (id_column, LABEL_COLUMN)]
+
+
+def prepare_features(chunk, scaler, columns):
+    """Fill Inf/NaN with the scaler's training means (not the per-split means the page uses) and scale."""
+    X = chunk[columns].apply(pd.to_numeric, errors='coerce').to_numpy(dtype=np.float64, copy=True)
+    bad = ~np.isfinite(X)
+    if bad.any():
+        means = getattr(scaler, 'mean_', None)
+        fill = means if means is not None else np.zeros(X.shape[1])
+        X[bad] = np.broadcast_to(fill, X.shape)[bad]
+    return pd.DataFrame(scaler.transform(pd.DataFrame(X, columns=columns)), columns=columns)
+
+
+def score_chunk(chunk, model, scaler, columns, threshold=0.5, id_column=None):
+    """Return the output frame for one chunk: [id], probability, prediction[, label]."""
+    proba = np.asarray(model.predict_proba(prepare_features(chunk, scaler, columns)))[:, 1]
+    out = {}
+    if id_column:
+        out[id_column] = chunk[id_column].to_numpy()
+    out['probability'] = proba
+    out['prediction'] = (proba > threshold).astype(np.int8)
+    if LABEL_COLUMN in chunk.columns:
+        out[LABEL_COLUMN] = chunk[LABEL_COLUMN].to_numpy()
+    return pd.DataFrame(out)
+
+
+def _init_worker(model_path, scaler_path):
+    with open(model_path, 'rb') as f:
+        _worker['model'] = pickle.load(f)
+    with open(scaler_path, 'rb') as f:
+        _worker['scaler'] = pickle.load(f)
+
+
+def _score_in_worker(chunk, columns, threshold, id_column):
+    return score_chunk(chunk, _worker['model'], _worker['scaler'], columns, threshold, id_column)
+
+
+class _OutputWriter:
+    """Append scored chunks to a CSV or Parquet file."""
+
+    def __init__(self, path):
+        self.path = path
+        self._parquet = None
+        self._first = True
+
+    def write(self, frame):
+        if self.path.endswith('.parquet'):
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+
+            table = pa.Table.from_pandas(frame, preserve_index=False)
+            if self._parquet is None:
+                self._parquet = pq.ParquetWriter(self.path, table.schema)
+            self._parquet.write_table(table)
+        else:
+            frame.to_csv(self.path, mode='w' if self._first else 'a', header=self._first, index=False)
+        self._first = False
+
+    def close(self):
+        if self._parquet is not None:
+            self._parquet.close()
+
+
+def score_file(model_path, scaler_path, input_path, output_path, chunksize=100_000,
+               workers=1, threshold=0.5, id_column=None, progress=None):
+    """Score ``input_path`` chunk by chunk and stream the results to ``output_path``.
+
+    At most ``2 * workers`` chunks are in flight. ``progress(rows_done)`` is
+    called after each chunk is written. Returns the number of rows scored.
+    """
+    with open(scaler_path, 'rb') as f:
+        scaler = pickle.load(f)
+    chunks = iter_input_chunks(input_path, chunksize)
+    writer = _OutputWriter(output_path)
+    rows = 0
+    columns = None
+
+    def emit(frame):
+        nonlocal rows
+        writer.write(frame)
+        rows += len(frame)
+        if progress:
+            progress(rows)
+
+    try:
+        if workers <= 1:
+            with open(model_path, 'rb') as f:
+                model = pickle.load(f)
+            for chunk in chunks:
+                columns = columns or feature_columns(scaler, chunk.columns, id_column)
+                emit(score_chunk(chunk, model, scaler, columns, threshold, id_column))
+            return rows
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(model_path, scaler_path)) as pool:
+            pending = []
+            for chunk in chunks:
+                columns = columns or feature_columns(scaler, chunk.columns, id_column)
+                pending.append(pool.submit(_score_in_worker, chunk, columns, threshold, id_column))
+                if len(pending) >= 2 * workers:
+                    emit(pending.pop(0).result())
+            for future in pending:
+                emit(future.result())
+        return rows
+    finally:
+        writer.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Score a reduced-feature CSV/Parquet file with a pickled model.")
+    parser.add_argument('model', help="pickled XGBoost model (.pkl)")
+    parser.add_argument('scaler', help="fitted scaler (scaler.pkl)")
+    parser.add_argument('input', help="CSV or Parquet file with the reduced features")
+    parser.add_argument('output', help="CSV or Parquet file to write predictions to")
+    parser.add_argument('--chunksize', type=int, default=100_000)
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--threshold', type=float, default=0.5)
+    parser.add_argument('--id-column', default=None, help="column copied to the output, e.g. nct_id")
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+
+    def progress(rows):
+        elapsed = time.perf_counter() - start
+        print(f"\r{rows:,} rows scored ({rows / max(elapsed, 1e-9):,.0f} rows/s)", end='', file=sys.stderr)
+
+    rows = score_file(args.model, args.scaler, args.input, args.output, args.chunksize,
+                      args.workers, args.threshold, args.id_column, progress)
+    print(f"\n{rows:,} rows written to {args.output} in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
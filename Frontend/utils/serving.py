@@ -0,0 +1,258 @@
+"""Local HTTP scoring service for the completion model.
+
+Other tools can score trials without going through the Streamlit page.
+Requests arriving concurrently are queued and coalesced into one
+``predict_proba`` call per micro-batch. A batch is flushed when it reaches
+``--max-batch`` rows or when its oldest request has waited ``--budget-ms``
+milliseconds, whichever comes first. Features go through the same fill and
+scaling as ``utils.scoring``.
+
+    python -m utils.serving model.pkl [--scaler scaler.pkl] [--port 8502] [--budget-ms 5]
+
+Endpoints (JSON):
+
+- ``POST /predict``: body ``{"features": {name: value, ...}}`` or
+  ``{"instances": [{...}, ...]}``. Returns the probability and prediction
+  for each instance. Missing features are filled with the training means.
+  Values must be numbers or null; anything else is rejected with 400.
+- ``GET /metrics``: request and batch counts, p50/p99 latency, and the
+  current and maximum queue depth.
+- ``GET /health``
+"""
+import argparse
+import json
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+
+from utils.scoring import feature_columns, prepare_features
+
+DEFAULT_PORT = 8502
+DEFAULT_BUDGET_MS = 5.0
+DEFAULT_MAX_BATCH = 256
+# Latencies kept for the percentiles
+LATENCY_WINDOW = 10_000
+
+
+def check_instance(features):
+    """Raise ValueError unless ``features`` maps feature names to numbers (or null)."""
+    if not isinstance(features, dict):
+        raise ValueError("an instance must be an object of feature name to value")
+    for name, value in features.items():
+        if value is not None and not isinstance(value, (int, float)):
+            raise ValueError(f"feature {name!r} must be a number or null, got {type(value).__name__}")
+
+
+class MicroBatcher:
+    """Coalesce single-row requests into batches scored on one thread."""
+
+    def __init__(self, model, scaler, budget_ms=DEFAULT_BUDGET_MS, max_batch=DEFAULT_MAX_BATCH, threshold=0.5):
+        self.model = model
+        self.scaler = scaler
+        self.columns = feature_columns(scaler, [])
+        if not self.columns:
+            raise ValueError("The scaler has no feature_names_in_; fit it on a DataFrame")
+        self.budget = budget_ms / 1000.0
+        self.max_batch = max_batch
+        self.threshold = threshold
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+        self._batch_sizes = deque(maxlen=LATENCY_WINDOW)
+        self._requests = 0
+        self._batches = 0
+        self._max_depth = 0
+        self._closed = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="micro-batcher", daemon=True)
+        self._thread.start()
+
+    def submit(self, features):
+        """Queue one instance (a mapping of feature name to value); returns a Future of its result."""
+        future = Future()
+        with self._lock:
+            # Checked under the lock so close() cannot miss an item queued after it drained
+            if self._closed.is_set():
+                raise RuntimeError("the scoring service is shut down")
+            self._queue.put((features, future, time.perf_counter()))
+            self._max_depth = max(self._max_depth, self._queue.qsize())
+        return future
+
+    def predict(self, instances, timeout=30):
+        futures = [self.submit(features) for features in instances]
+        return [future.result(timeout) for future in futures]
+
+    def _collect(self):
+        """Block for the first item, then take more until the batch is full or the budget is spent."""
+        try:
+            first = self._queue.get(timeout=0.1)
+        except queue.Empty:
+            return []
+        batch = [first]
+        deadline = first[2] + self.budget
+        while len(batch) < self.max_batch:
+            remaining = deadline - time.perf_counter()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _score(self, rows):
+        frame = pd.DataFrame(rows).reindex(columns=self.columns)
+        return np.asarray(self.model.predict_proba(prepare_features(frame, self.scaler, self.columns)))[:, 1]
+
+    def _run(self):
+        while not self._closed.is_set():
+            batch = self._collect()
+            if not batch:
+                continue
+            try:
+                proba = self._score([features for features, _, _ in batch])
+            except Exception:
+                # Score one row at a time so a bad row fails only its own request
+                proba = []
+                for features, future, _ in batch:
+                    try:
+                        proba.append(self._score([features])[0])
+                    except Exception as exc:
+                        future.set_exception(exc)
+                        proba.append(None)
+            done = time.perf_counter()
+            for (_, future, queued_at), p in zip(batch, proba):
+                if p is not None:
+                    future.set_result({'probability': float(p), 'prediction': int(p > self.threshold)})
+            with self._lock:
+                self._latencies.extend(done - queued_at for _, _, queued_at in batch)
+                self._batch_sizes.append(len(batch))
+                self._requests += len(batch)
+                self._batches += 1
+
+    def metrics(self):
+        with self._lock:
+            latencies = np.array(self._latencies)
+            sizes = np.array(self._batch_sizes)
+            requests, batches, max_depth = self._requests, self._batches, self._max_depth
+        percentile = lambda q: float(np.percentile(latencies, q) * 1000) if len(latencies) else None  # noqa: E731
+        return {
+            'requests': requests,
+            'batches': batches,
+            'mean_batch_size': float(sizes.mean()) if len(sizes) else None,
+            'latency_ms_p50': percentile(50),
+            'latency_ms_p99': percentile(99),
+            'queue_depth': self._queue.qsize(),
+            'max_queue_depth': max_depth,
+            'budget_ms': self.budget * 1000,
+            'max_batch': self.max_batch,
+        }
+
+    def close(self):
+        """Stop the batching thread; requests still queued fail instead of waiting forever."""
+        with self._lock:
+            self._closed.set()
+        self._thread.join()
+        while True:
+            try:
+                _, future, _ = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            future.set_exception(RuntimeError("the scoring service is shut down"))
+
+
+class _Handler(BaseHTTPRequestHandler):
+    batcher = None
+
+    def _send(self, status, payload):
+        body = json.dumps(payload).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        if self.path == '/metrics':
+            self._send(200, self.batcher.metrics())
+        elif self.path == '/health':
+            self._send(200, {'status': 'ok'})
+        else:
+            self._send(404, {'error': 'not found'})
+
+    def do_POST(self):
+        if self.path != '/predict':
+            self._send(404, {'error': 'not found'})
+            return
+        try:
+            payload = json.loads(self.rfile.read(int(self.headers.get('Content-Length', 0))) or b'{}')
+            instances = payload['instances'] if 'instances' in payload else [payload['features']]
+            if not isinstance(instances, list):
+                raise TypeError
+        except (ValueError, KeyError, TypeError):
+            self._send(400, {'error': 'expected {"features": {...}} or {"instances": [...]}'})
+            return
+        try:
+            for instance in instances:
+                check_instance(instance)
+        except ValueError as exc:
+            self._send(400, {'error': str(exc)})
+            return
+        try:
+            self._send(200, {'predictions': self.batcher.predict(instances)})
+        except Exception as exc:
+            self._send(500, {'error': str(exc)})
+
+    def log_message(self, format, *args):
+        pass
+
+
+class _Server(ThreadingHTTPServer):
+    daemon_threads = True
+    # The default listen backlog of 5 resets connections under concurrent load
+    request_queue_size = 1024
+
+
+def make_server(batcher, host='127.0.0.1', port=DEFAULT_PORT):
+    """An HTTP server bound to ``batcher``; call ``serve_forever()`` on it. Port 0 picks a free port."""
+    handler = type('Handler', (_Handler,), {'batcher': batcher})
+    return _Server((host, port), handler)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Serve the completion model over local HTTP with micro-batching.")
+    parser.add_argument('model', help="pickled model (.pkl)")
+    parser.add_argument('--scaler', default=None, help="fitted scaler; defaults to scaler.pkl from the dataset cache")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--budget-ms', type=float, default=DEFAULT_BUDGET_MS,
+                        help="longest a request waits for others to join its batch")
+    parser.add_argument('--max-batch', type=int, default=DEFAULT_MAX_BATCH)
+    parser.add_argument('--threshold', type=float, default=0.5)
+    parser.add_argument('--compiled', action='store_true',
+                        help="score with the array-based predictor (utils.tree_predictor)")
+    args = parser.parse_args(argv)
+
+    from utils.models import MODELS, compiled_model, load_scaler
+
+    key, model = MODELS.load_path(args.model)
+    if args.compiled:
+        model = compiled_model(key, model)
+    scaler = MODELS.load_path(args.scaler)[1] if args.scaler else load_scaler()
+    batcher = MicroBatcher(model, scaler, args.budget_ms, args.max_batch, args.threshold)
+    server = make_server(batcher, args.host, args.port)
+    print(f"Serving on http://{args.host}:{server.server_address[1]} (budget {args.budget_ms} ms)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        batcher.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,359 @@
+"""Array-based inference for the showcase tree ensembles.
+
+For single-trial scoring, the XGBoost sklearn wrapper spends most of its time
+converting the DataFrame and building a DMatrix rather than walking 112
+features through the trees. ``compile_model`` flattens a trained XGBoost,
+LightGBM or scikit-learn forest into contiguous NumPy node arrays. Then
+``CompiledTrees.predict_proba`` walks all trees at once, one level per
+step, over blocks of rows.
+
+The compiled predictor mirrors each library's arithmetic. Inputs are cast
+like the library does: float32 for XGBoost and sklearn, float64 for
+LightGBM. Each library's comparison and missing-value rules are kept. Leaf
+values are accumulated tree by tree in the library's precision. Boosters
+are trimmed to their best iteration, as their own ``predict`` does. Use
+``validate`` to compare against the native predictor on real data.
+"""
+import json
+import time
+
+import numpy as np
+
+# LightGBM's kZeroThreshold
+_LGB_ZERO = 1e-35
+
+
+class CompiledTrees:
+    """A tree ensemble as flat node arrays.
+
+    Node ``i`` is a leaf when ``feature[i] < 0``. An internal node sends a row
+    left when ``x < threshold`` (``strict``) or ``x <= threshold``. A missing
+    value goes the ``default_left`` way. For LightGBM-style nodes, NaN is
+    first replaced by zero (``nan_to_zero``), and values within 1e-35 of zero
+    count as missing (``zero_missing``).
+    """
+
+    def __init__(self, feature, threshold, left, right, default_left, value, roots, *,
+                 strict, input_dtype, accumulate_dtype, base=0.0, link='identity',
+                 sigmoid_scale=1.0, average=False, nan_to_zero=None, zero_missing=None,
+                 feature_names=None):
+        self.feature = np.ascontiguousarray(feature, dtype=np.int32)
+        self.threshold = np.ascontiguousarray(threshold, dtype=np.float64)
+        self.left = np.ascontiguousarray(left, dtype=np.int32)
+        self.right = np.ascontiguousarray(right, dtype=np.int32)
+        self.default_left = np.ascontiguousarray(default_left, dtype=bool)
+        value = np.asarray(value, dtype=accumulate_dtype)
+        self.value = np.ascontiguousarray(value.reshape(len(self.feature), -1))
+        self.roots = np.ascontiguousarray(roots, dtype=np.int32)
+        self.strict = strict
+        self.input_dtype = np.dtype(input_dtype)
+        self.accumulate_dtype = np.dtype(accumulate_dtype)
+        self.base = base
+        self.link = link
+        self.sigmoid_scale = sigmoid_scale
+        self.average = average
+        n_nodes = len(self.feature)
+        self.nan_to_zero = np.zeros(n_nodes, bool) if nan_to_zero is None else np.asarray(nan_to_zero, bool)
+        self.zero_missing = np.zeros(n_nodes, bool) if zero_missing is None else np.asarray(zero_missing, bool)
+        self.feature_names = list(feature_names) if feature_names is not None else None
+        self.max_depth = _max_depth(self.left, self.right, self.feature, self.roots)
+
+    @property
+    def nbytes(self):
+        return sum(a.nbytes for a in (self.feature, self.threshold, self.left, self.right, self.default_left,
+                                      self.value, self.roots, self.nan_to_zero, self.zero_missing))
+
+    @property
+    def n_trees(self):
+        return len(self.roots)
+
+    def _as_array(self, X):
+        if self.feature_names is not None and hasattr(X, 'columns'):
+            X = X[self.feature_names]
+        X = np.asarray(X, dtype=self.input_dtype)
+        # Exact upcast, so float32 inputs are compared exactly as float32
+        return np.ascontiguousarray(X, dtype=np.float64)
+
+    def leaf_indices(self, X):
+        """Leaf reached in every tree, shape ``(n_rows, n_trees)``."""
+        n = len(X)
+        n_features = X.shape[1]
+        X = X.ravel()
+        node = np.repeat(self.roots[None, :], n, axis=0).ravel()
+        row_offset = np.repeat(np.arange(n, dtype=np.int64) * n_features, len(self.roots))
+        # Only (row, tree) pairs still at an internal node are advanced each level
+        active = np.flatnonzero(self.feature[node] >= 0)
+        any_nan_to_zero = self.nan_to_zero.any()
+        any_zero_missing = self.zero_missing.any()
+        while len(active):
+            current = node[active]
+            x = X[row_offset[active] + self.feature[current]]
+            nan = np.isnan(x)
+            if any_nan_to_zero:
+                to_zero = nan & self.nan_to_zero[current]
+                x = np.where(to_zero, 0.0, x)
+                nan &= ~to_zero
+            missing = nan
+            if any_zero_missing:
+                missing = missing | (self.zero_missing[current] & (np.abs(x) <= _LGB_ZERO))
+            threshold = self.threshold[current]
+            with np.errstate(invalid='ignore'):
+                go_left = x < threshold if self.strict else x <= threshold
+            go_left = np.where(missing, self.default_left[current], go_left)
+            current = np.where(go_left, self.left[current], self.right[current])
+            node[active] = current
+            active = active[self.feature[current] >= 0]
+        return node.reshape(n, len(self.roots))
+
+    def _raw_block(self, X):
+        leaves = self.leaf_indices(X)
+        acc = np.full((len(X), self.value.shape[1]), self.base, dtype=self.accumulate_dtype)
+        # Tree by tree, in order, so rounding matches the native accumulation
+        for t in range(self.n_trees):
+            acc += self.value[leaves[:, t]]
+        if self.average:
+            acc /= self.n_trees
+        return acc
+
+    def predict_raw(self, X, block_size=4096):
+        """Summed leaf values (margin for boosters, class fractions for forests)."""
+        X = self._as_array(X)
+        if len(X) <= block_size:
+            return self._raw_block(X)
+        return np.concatenate([self._raw_block(X[i:i + block_size]) for i in range(0, len(X), block_size)])
+
+    def predict_proba(self, X, block_size=4096):
+        """Class probabilities, shape ``(n_rows, 2)``, like the sklearn wrappers."""
+        raw = self.predict_raw(X, block_size)
+        if self.link == 'identity':
+            return raw
+        margin = raw[:, 0]
+        if self.link == 'xgb_logistic':
+            # xgboost::common::Sigmoid in float32
+            one = np.float32(1.0)
+            p = one / (np.exp(np.minimum(-margin, np.float32(88.7))) + one)
+        else:
+            p = 1.0 / (1.0 + np.exp(-self.sigmoid_scale * margin))
+        return np.vstack((1.0 - p, p)).T
+
+    def predict(self, X, threshold=0.5):
+        return (self.predict_proba(X)[:, 1] > threshold).astype(np.int64)
+
+
+def _max_depth(left, right, feature, roots):
+    depth = 0
+    frontier = np.asarray(roots)
+    while len(frontier):
+        frontier = frontier[feature[frontier] >= 0]
+        if not len(frontier):
+            break
+        depth += 1
+        frontier = np.concatenate([left[frontier], right[frontier]])
+    return depth
+
+
+def _concatenate(trees):
+    """Stack per-tree node dicts into global arrays with offset child indices."""
+    columns = {key: [] for key in trees[0]}
+    roots = []
+    offset = 0
+    for tree in trees:
+        n = len(tree['feature'])
+        roots.append(offset)
+        for key, values in tree.items():
+            values = np.asarray(values)
+            if key in ('left', 'right'):
+                values = np.where(values >= 0, values + offset, -1)
+            columns[key].append(values)
+        offset += n
+    arrays = {key: np.concatenate(values) for key, values in columns.items()}
+    arrays['roots'] = np.array(roots, dtype=np.int32)
+    return arrays
+
+
+def compile_xgboost(model):
+    """Flatten an ``XGBClassifier`` or binary-logistic ``Booster`` (gbtree)."""
+    booster = model.get_booster() if hasattr(model, 'get_booster') else model
+    raw = json.loads(booster.save_raw(raw_format='json'))
+    learner = raw['learner']
+    gbm = learner['gradient_booster']
+    if gbm['name'] != 'gbtree':
+        raise ValueError(f"Only gbtree boosters can be compiled, got {gbm['name']}")
+    objective = learner['objective']['name']
+    if objective not in ('binary:logistic', 'reg:logistic', 'binary:logitraw'):
+        raise ValueError(f"Unsupported objective: {objective}")
+    tree_models = gbm['model']['trees']
+
+    best = booster.attr('best_iteration')
+    if best is not None:
+        per_iteration = int(gbm['model']['gbtree_model_param'].get('num_parallel_tree', 1))
+        tree_models = tree_models[:(int(best) + 1) * per_iteration]
+
+    trees = []
+    for tree in tree_models:
+        if any(int(t) != 0 for t in tree.get('split_type', [])):
+            raise ValueError("Categorical splits are not supported")
+        left = np.asarray(tree['left_children'], dtype=np.int64)
+        leaf = left < 0
+        conditions = np.asarray(tree['split_conditions'], dtype=np.float32)
+        trees.append({
+            'feature': np.where(leaf, -1, np.asarray(tree['split_indices'])),
+            'threshold': conditions,
+            'left': left,
+            'right': np.asarray(tree['right_children'], dtype=np.int64),
+            'default_left': np.asarray(tree['default_left'], dtype=bool),
+            'value': np.where(leaf, conditions, np.float32(0)),
+        })
+    arrays = _concatenate(trees)
+
+    base_score = learner['learner_model_param']['base_score'].strip('[]')
+    base_score = np.float32(float(base_score))
+    if objective == 'binary:logitraw':
+        base, link = base_score, 'identity'
+    else:
+        # ObjFunction::ProbToMargin, in float32
+        one = np.float32(1.0)
+        base, link = np.float32(-np.log(one / base_score - one)), 'xgb_logistic'
+    return CompiledTrees(
+        arrays['feature'], arrays['threshold'], arrays['left'], arrays['right'],
+        arrays['default_left'], arrays['value'], arrays['roots'],
+        strict=True, input_dtype=np.float32, accumulate_dtype=np.float32,
+        base=base, link=link, feature_names=booster.feature_names,
+    )
+
+
+def compile_lightgbm(model):
+    """Flatten an ``LGBMClassifier`` or binary ``Booster`` with numerical splits."""
+    booster = model.booster_ if hasattr(model, 'booster_') else model
+    best = booster.best_iteration if booster.best_iteration > 0 else None
+    dump = booster.dump_model(num_iteration=best)
+    objective = dump.get('objective', '')
+    if not objective.startswith('binary'):
+        raise ValueError(f"Unsupported objective: {objective}")
+    sigmoid = next((float(part.split(':')[1]) for part in objective.split() if part.startswith('sigmoid:')), 1.0)
+
+    trees = []
+    for info in dump['tree_info']:
+        nodes = {key: [] for key in ('feature', 'threshold', 'left', 'right', 'default_left',
+                                     'value', 'nan_to_zero', 'zero_missing')}
+
+        def add(node):
+            index = len(nodes['feature'])
+            for values in nodes.values():
+                values.append(0)
+            if 'leaf_value' in node:
+                nodes['feature'][index] = -1
+                nodes['left'][index] = nodes['right'][index] = -1
+                nodes['value'][index] = node['leaf_value']
+                return index
+            if node.get('decision_type', '<=') != '<=':
+                raise ValueError("Categorical splits are not supported")
+            missing_type = node.get('missing_type', 'None')
+            nodes['feature'][index] = node['split_feature']
+            nodes['threshold'][index] = node['threshold']
+            nodes['default_left'][index] = bool(node.get('default_left', True))
+            nodes['nan_to_zero'][index] = missing_type != 'NaN'
+            nodes['zero_missing'][index] = missing_type == 'Zero'
+            nodes['left'][index] = add(node['left_child'])
+            nodes['right'][index] = add(node['right_child'])
+            return index
+
+        add(info['tree_structure'])
+        trees.append(nodes)
+    arrays = _concatenate(trees)
+    return CompiledTrees(
+        arrays['feature'], arrays['threshold'], arrays['left'], arrays['right'],
+        arrays['default_left'], arrays['value'], arrays['roots'],
+        strict=False, input_dtype=np.float64, accumulate_dtype=np.float64,
+        link='sigmoid', sigmoid_scale=sigmoid,
+        nan_to_zero=arrays['nan_to_zero'], zero_missing=arrays['zero_missing'],
+        feature_names=dump.get('feature_names'),
+    )
+
+
+def compile_sklearn_forest(model):
+    """Flatten a binary ``RandomForestClassifier``/``ExtraTreesClassifier``/``DecisionTreeClassifier``."""
+    estimators = getattr(model, 'estimators_', [model])
+    if len(model.classes_) != 2:
+        raise ValueError("Only binary classifiers are supported")
+    trees = []
+    for estimator in estimators:
+        tree = estimator.tree_
+        value = tree.value[:, 0, :]
+        # DecisionTreeClassifier.predict_proba normalises each leaf's class weights
+        normalizer = value.sum(axis=1, keepdims=True)
+        normalizer[normalizer == 0.0] = 1.0
+        leaf = tree.children_left < 0
+        missing_left = getattr(tree, 'missing_go_to_left', np.zeros(tree.node_count, dtype=np.uint8))
+        trees.append({
+            'feature': np.where(leaf, -1, tree.feature),
+            'threshold': tree.threshold,
+            'left': tree.children_left,
+            'right': tree.children_right,
+            'default_left': np.asarray(missing_left, dtype=bool),
+            'value': np.where(leaf[:, None], value / normalizer, 0.0),
+        })
+    arrays = _concatenate(trees)
+    return CompiledTrees(
+        arrays['feature'], arrays['threshold'], arrays['left'], arrays['right'],
+        arrays['default_left'], arrays['value'], arrays['roots'],
+        strict=False, input_dtype=np.float32, accumulate_dtype=np.float64,
+        average=hasattr(model, 'estimators_'),
+        feature_names=getattr(model, 'feature_names_in_', None),
+    )
+
+
+def compile_model(model):
+    """Compile a supported tree model; raises TypeError for anything else."""
+    module = type(model).__module__
+    if module.startswith('xgboost'):
+        return compile_xgboost(model)
+    if module.startswith('lightgbm'):
+        return compile_lightgbm(model)
+    if module.startswith('sklearn') and (hasattr(model, 'tree_') or hasattr(model, 'estimators_')):
+        return compile_sklearn_forest(model)
+    raise TypeError(f"Cannot compile {type(model).__name__}")
+
+
+def native_proba(model, X):
+    """Positive-class probabilities from the library's own predictor."""
+    if hasattr(model, 'predict_proba'):
+        return np.asarray(model.predict_proba(X))[:, 1]
+    module = type(model).__module__
+    if module.startswith('xgboost'):
+        import xgboost as xgb
+
+        return model.predict(xgb.DMatrix(X))
+    return np.asarray(model.predict(X))
+
+
+def validate(model, compiled, X):
+    """Compare compiled and native probabilities on ``X``.
+
+    Returns ``{'rows', 'identical', 'max_abs_diff', 'max_ulp'}``. ``identical``
+    means bit-for-bit equal.
+    """
+    native = np.asarray(native_proba(model, X))
+    ours = compiled.predict_proba(X)[:, 1].astype(native.dtype, copy=False)
+    diff = np.abs(native.astype(np.float64) - ours.astype(np.float64))
+    ulp = np.spacing(np.abs(native)).astype(np.float64)
+    return {
+        'rows': len(native),
+        'identical': bool(np.array_equal(native, ours)),
+        'max_abs_diff': float(diff.max()) if len(diff) else 0.0,
+        'max_ulp': float((diff / ulp).max()) if len(diff) else 0.0,
+    }
+
+
+def latency(predict, X, batch_sizes=(1, 10, 100, 1_000, 10_000, 100_000), repeat=5):
+    """Median seconds per call of ``predict`` for each batch size (rows drawn cyclically from ``X``)."""
+    timings = {}
+    for size in batch_sizes:
+        batch = X[np.arange(size) % len(X)] if not hasattr(X, 'iloc') else X.iloc[np.arange(size) % len(X)]
+        runs = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            predict(batch)
+            runs.append(time.perf_counter() - start)
+        timings[size] = float(np.median(runs))
+    return timings
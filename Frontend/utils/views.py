@@ -0,0 +1,108 @@
+"""Per-session views over shared, read-only base frames.
+
+The Explorer used to keep ``selected_df.copy()`` in every session, and each
+"Drop Selected Columns" stored another full copy. Memory therefore grew with
+the number of users and the number of clicks. The base frames are now held
+once per process (``utils.frames``), and a session keeps only a
+``FrameView``. A view records:
+
+- the columns dropped, with one undo entry per drop;
+- the active row filters.
+
+The view is applied when a page renders. Dropping and undoing only touch
+column names, so neither copies data.
+"""
+import numpy as np
+import pandas as pd
+
+
+class FrameView:
+    """Dropped columns and row filters for one session over one dataset."""
+
+    def __init__(self, dataset):
+        self.dataset = dataset
+        self._drops = []  # undo stack: one tuple of column names per drop
+        self.filters = {}  # column -> ('range', low, high) or ('isin', values)
+
+    @property
+    def dropped(self):
+        return [col for drop in self._drops for col in drop]
+
+    @property
+    def can_undo(self):
+        return bool(self._drops)
+
+    def drop(self, columns):
+        """Hide ``columns``; returns False if none of them was visible."""
+        already = set(self.dropped)
+        columns = tuple(col for col in columns if col not in already)
+        if not columns:
+            return False
+        self._drops.append(columns)
+        for col in columns:
+            self.filters.pop(col, None)
+        return True
+
+    def undo(self):
+        """Restore the columns of the last drop; returns them."""
+        return self._drops.pop() if self._drops else ()
+
+    def set_range_filter(self, column, low, high):
+        self.filters[column] = ('range', low, high)
+
+    def set_isin_filter(self, column, values):
+        self.filters[column] = ('isin', tuple(values))
+
+    def clear_filters(self):
+        self.filters.clear()
+
+    def columns(self, base):
+        dropped = set(self.dropped)
+        return [col for col in base.columns if col not in dropped]
+
+    def mask(self, base):
+        """Boolean row mask of the active filters, or None when no filter is set."""
+        mask = None
+        for column, (kind, *args) in self.filters.items():
+            if column not in base.columns:
+                continue
+            values = base[column]
+            if kind == 'range':
+                keep = values.between(args[0], args[1]).to_numpy(dtype=bool, na_value=False)
+            else:
+                keep = values.isin(args[0]).to_numpy(dtype=bool)
+            mask = keep if mask is None else mask & keep
+        return mask
+
+    def shape(self, base):
+        mask = self.mask(base)
+        return (len(base) if mask is None else int(mask.sum()), len(self.columns(base)))
+
+    def frame(self, base, columns=None):
+        """Materialise the view (optionally only ``columns``) for rendering; never modifies ``base``."""
+        columns = self.columns(base) if columns is None else list(columns)
+        selected = base if columns == list(base.columns) else base[columns]
+        mask = self.mask(base)
+        return selected if mask is None else selected[mask]
+
+    def head(self, base, n=10):
+        """First ``n`` rows of the view, touching only those rows."""
+        columns = self.columns(base)
+        mask = self.mask(base)
+        rows = base.iloc[:n] if mask is None else base.iloc[np.flatnonzero(mask)[:n]]
+        return rows[columns]
+
+    def series(self, base, column):
+        mask = self.mask(base)
+        return base[column] if mask is None else base[column][mask]
+
+
+def describe_filter(column, spec):
+    kind, *args = spec
+    if kind == 'range':
+        return f"{args[0]} ≤ {column} ≤ {args[1]}"
+    return f"{column} in {', '.join(map(str, args[0][:5]))}{'…' if len(args[0]) > 5 else ''}"
+
+
+def is_numeric(series):
+    return pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series)